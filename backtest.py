@@ -0,0 +1,317 @@
+import json
+import os
+import time
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from nba_analyzer import FATIGUE_WEIGHTS, INJURY_WEIGHTS, calculate_penalties
+from utils.helpers import find_best_lines
+from utils.ratings import EloRatings, games_from_results, result_home_won
+from utils.schedule_index import build_schedule_indexes, date_ordinal
+from utils.sports import get_sport
+from utils.streaming import iter_records
+
+# A season to replay:
+#   sport      a registered sport (utils.sports), e.g. 'NBA' or 'NFL'
+#   stats      team stats (same shape as the analyzer input files)
+#   schedule   NBA team schedules (used for as-of fatigue penalties)
+#   snapshots  odds snapshots: {'timestamp', 'game_date', 'home_team', 'away_team', 'odds': {book: {...}}}
+#   results    outcomes: {'game_date', 'home_team', 'away_team', 'winner'} where winner is a team name
+#              or 'home'/'away' (or give 'home_score'/'away_score' instead)
+#   injuries   optional dated NBA injury reports: {team: [{'date', 'injuries': [...]}]}. A game uses each
+#              team's latest report dated on or before the game; without reports no injury penalty is
+#              applied (the stats file's injuries are today's, not the game's).
+# Each value may be the loaded data or a path to a JSON (or JSON Lines) file.
+
+
+SEASON_FILES = ('stats', 'schedule', 'snapshots', 'results', 'injuries')
+
+
+# Function to load any file-path fields of a season spec
+def load_season(season):
+    season = dict(season)
+    season['sport'] = season['sport'].strip().upper()
+    for key in SEASON_FILES:
+        value = season.get(key)
+        if isinstance(value, str):
+            if key in ('snapshots', 'results'):
+                season[key] = list(iter_records(value))
+            else:
+                with open(value, 'r') as file:
+                    season[key] = json.load(file)
+    plugin = get_sport(season['sport'])
+    if plugin is None:
+        raise ValueError(f"{season['sport']} not yet supported.")
+    if season.get('stats') is not None:
+        season['stats'] = plugin.team_data(season['stats'])
+    return season
+
+
+# Function to index dated injury reports per team: {team: (report days, injury lists)}
+def build_injury_index(injury_reports):
+    index = {}
+    for team, reports in (injury_reports or {}).items():
+        reports = sorted(reports, key=lambda report: date_ordinal(report['date']))
+        index[team] = (array('l', [date_ordinal(report['date']) for report in reports]),
+                       [report.get('injuries', []) for report in reports])
+    return index
+
+
+# Function to get a team's injury list from its latest report on or before game_day ([] without one)
+def injuries_as_of(injury_index, team, game_day):
+    days, injuries = injury_index.get(team, ((), ()))
+    position = bisect_right(days, game_day)
+    return injuries[position - 1] if position else []
+
+
+def _game_key(entry):
+    return (str(entry['game_date'])[:10], entry['home_team'], entry['away_team'])
+
+
+# Function to group snapshots per game, ordered by timestamp (first = opening, last = closing)
+def group_snapshots(snapshots):
+    games = {}
+    for snapshot in snapshots:
+        games.setdefault(_game_key(snapshot), []).append(snapshot)
+    for game_snapshots in games.values():
+        game_snapshots.sort(key=lambda snapshot: str(snapshot.get('timestamp', '')))
+    return games
+
+
+# Function to convert a moneyline array to decimal odds, same rounding as helpers.moneyline_to_decimal
+def moneyline_to_decimal_array(moneylines):
+    moneylines = np.asarray(moneylines, dtype=float)
+    return np.where(moneylines > 0,
+                    np.round(moneylines / 100 + 1, 4),
+                    np.round(100 / np.abs(moneylines) + 1, 4))
+
+
+# Function to round probabilities the way helpers.win_probability does: Python round() is exact on the
+# float's decimal value, np.round scales first and can land the other way on a half
+def round_probabilities(values, digits=4):
+    return np.array([round(value, digits) for value in values.tolist()], dtype=float)
+
+
+# Function to build the per-game arrays for one season: model probabilities, bet and closing prices, outcomes
+# elo_weight > 0 blends in Elo ratings streamed from the season's results, each game using only
+# the ratings from before its date
+def evaluate_season(season, bet_at='open', fatigue_weights=None, injury_weights=None, elo_weight=0.0):
+    plugin = get_sport(season['sport'])
+    team_stats = season['stats']
+    fatigue_weights = fatigue_weights or FATIGUE_WEIGHTS
+    injury_weights = injury_weights or INJURY_WEIGHTS
+
+    # Team scores come from the sport's batch engine, one lookup per game side
+    team_scores = plugin.score_teams(team_stats)
+
+    outcomes = {_game_key(result): result_home_won(result) for result in season.get('results', [])}
+    games = [(key, snaps) for key, snaps in sorted(group_snapshots(season['snapshots']).items()) if key in outcomes]
+    # Games with a team missing from the stats file can't be scored, they are counted and left out
+    scored = [(key, snaps) for key, snaps in games if key[1] in team_scores and key[2] in team_scores]
+    skipped = len(games) - len(scored)
+    games = scored
+    count = len(games)
+
+    dates = np.empty(count, dtype='datetime64[D]')
+    bet_ml = np.empty((count, 2), dtype=float)
+    close_ml = np.empty((count, 2), dtype=float)
+    home_won = np.empty(count, dtype=bool)
+    for row, (key, snaps) in enumerate(games):
+        dates[row] = key[0]
+        bet_lines = find_best_lines(snaps[0] if bet_at == 'open' else snaps[-1])
+        close_lines = find_best_lines(snaps[-1])
+        bet_ml[row] = (bet_lines['home_moneyline']['value'], bet_lines['away_moneyline']['value'])
+        close_ml[row] = (close_lines['home_moneyline']['value'], close_lines['away_moneyline']['value'])
+        home_won[row] = outcomes[key]
+
+    home_score = np.array([team_scores[key[1]] for key, _ in games], dtype=float)
+    away_score = np.array([team_scores[key[2]] for key, _ in games], dtype=float)
+
+    if plugin.penalties:
+        # Fatigue/injury penalties as of each game date. A team plays once per date, so each
+        # (team, date) is computed once anyway and there is nothing for a TeamCache to reuse
+        indexes = build_schedule_indexes(season.get('schedule', {}))
+        injury_index = build_injury_index(season.get('injuries'))
+        penalties = np.zeros((count, 2), dtype=float)
+        for row, (key, _) in enumerate(games):
+            game_day = date_ordinal(key[0])
+            for col, team in enumerate(key[1:]):
+                schedule = season.get('schedule', {}).get(team, [])
+                injuries = injuries_as_of(injury_index, team, game_day)
+                penalties[row, col] = calculate_penalties(schedule, injuries, fatigue_weights, injury_weights,
+                                                          game_day, indexes.get(team))['total']
+        home_adj = home_score * (1 - penalties[:, 0])
+        away_adj = away_score * (1 - penalties[:, 1])
+        total = home_adj + away_adj
+        home_prob = np.where(total > 0, round_probabilities(home_adj / np.where(total > 0, total, 1)), 0.5)
+        away_prob = 1 - home_prob
+    else:
+        total = home_score + away_score
+        safe_total = np.where(total > 0, total, 1)
+        home_prob = np.where(total > 0, round_probabilities(home_score / safe_total), 0.5)
+        away_prob = np.where(total > 0, round_probabilities(away_score / safe_total), 0.5)
+
+    if elo_weight:
+        ratings = EloRatings()
+        ratings.process(games_from_results(season.get('results', [])))
+        elo_prob = np.array([ratings.win_probability(key[1], key[2], key[0]) for key, _ in games], dtype=float)
+        home_prob = round_probabilities((1 - elo_weight) * home_prob + elo_weight * elo_prob)
+        away_prob = round_probabilities((1 - elo_weight) * away_prob + elo_weight * (1 - elo_prob))
+
+    return {
+        'dates': dates,
+        'model_prob': np.column_stack([home_prob, away_prob]),
+        'bet_ml': bet_ml,
+        'close_ml': close_ml,
+        'home_won': home_won,
+        'skipped': skipped
+    }
+
+
+# Function to simulate bet selection and bankroll day by day, all games of a day evaluated at once
+# staking: 'flat' bets stake_fraction of the bankroll, 'kelly' bets kelly_fraction * Kelly (capped at max_fraction)
+def simulate_bets(evaluated, min_edge=0.02, staking='flat', stake_fraction=0.01,
+                  kelly_fraction=0.25, max_fraction=0.05, bankroll=1000.0):
+    bet_decimal = moneyline_to_decimal_array(evaluated['bet_ml'])
+    close_decimal = moneyline_to_decimal_array(evaluated['close_ml'])
+    market_prob = np.round(1 / bet_decimal, 4)
+    close_prob = np.round(1 / close_decimal, 4)
+    model_prob = evaluated['model_prob']
+    edges = np.round(model_prob - market_prob, 4)
+
+    # Take the side with the larger edge, only when it clears min_edge
+    side = np.argmax(edges, axis=1)
+    rows = np.arange(len(side))
+    edge = edges[rows, side]
+    selected = edge > min_edge
+    won = np.where(side == 0, evaluated['home_won'], ~evaluated['home_won'])
+    decimal = bet_decimal[rows, side]
+    prob = model_prob[rows, side]
+    # Closing-line value: how much more likely the market made our side by close (positive = beat the close)
+    clv = close_prob[rows, side] - market_prob[rows, side]
+
+    if staking == 'kelly':
+        odds = decimal - 1
+        fraction = np.clip(kelly_fraction * (odds * prob - (1 - prob)) / odds, 0, max_fraction)
+    else:
+        fraction = np.full(len(side), stake_fraction)
+
+    start_bankroll = bankroll
+    peak = bankroll
+    max_drawdown = 0.0
+    staked = 0.0
+    dates = evaluated['dates']
+    # Games are sorted by date, so each day is one contiguous slice
+    day_starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]]) if len(dates) else np.array([], dtype=int)
+    day_ends = np.r_[day_starts[1:], len(dates)]
+    for start, end in zip(day_starts, day_ends):
+        day = slice(start, end)
+        mask = selected[day]
+        if not mask.any():
+            continue
+        # Every bet of the day is sized off the bankroll at the start of the day
+        stakes = bankroll * fraction[day][mask]
+        profit = np.where(won[day][mask], stakes * (decimal[day][mask] - 1), -stakes)
+        staked += stakes.sum()
+        bankroll += profit.sum()
+        peak = max(peak, bankroll)
+        max_drawdown = max(max_drawdown, (peak - bankroll) / peak if peak > 0 else 0.0)
+
+    bets = int(selected.sum())
+    wins = int((won & selected).sum())
+    profit = bankroll - start_bankroll
+    return {
+        'games': int(len(side)),
+        'bets': bets,
+        'wins': wins,
+        'hit_rate': round(wins / bets, 4) if bets else 0.0,
+        'staked': round(staked, 2),
+        'profit': round(profit, 2),
+        'roi': round(profit / staked, 4) if staked else 0.0,
+        'final_bankroll': round(bankroll, 2),
+        'max_drawdown': round(max_drawdown, 4),
+        'avg_edge': round(float(edge[selected].mean()), 4) if bets else 0.0,
+        'avg_clv': round(float(clv[selected].mean()), 4) if bets else 0.0,
+        'beat_close_rate': round(float((clv[selected] > 0).mean()), 4) if bets else 0.0
+    }
+
+
+# Function to replay one season end to end, runs inside a worker process for run_backtests
+def run_season(season, options=None):
+    start = time.perf_counter()
+    options = options or {}
+    season = load_season(season)
+    evaluated = evaluate_season(season, options.get('bet_at', 'open'), elo_weight=options.get('elo_weight') or 0.0)
+    report = simulate_bets(evaluated, **{key: value for key, value in options.items()
+                                         if key not in ('bet_at', 'elo_weight')})
+    report['skipped'] = evaluated['skipped']
+    report['season'] = season.get('name', season['sport'])
+    report['seconds'] = round(time.perf_counter() - start, 4)
+    return report
+
+
+# Function to backtest many seasons in parallel and add an all-seasons total
+def run_backtests(seasons, workers=None, **options):
+    start = time.perf_counter()
+    if workers == 1 or len(seasons) == 1:
+        reports = [run_season(season, options) for season in seasons]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            reports = list(pool.map(run_season, seasons, [options] * len(seasons)))
+
+    bets = sum(report['bets'] for report in reports)
+    staked = sum(report['staked'] for report in reports)
+    profit = sum(report['profit'] for report in reports)
+    totals = {
+        'seasons': len(reports),
+        'games': sum(report['games'] for report in reports),
+        'skipped': sum(report['skipped'] for report in reports),
+        'bets': bets,
+        'hit_rate': round(sum(report['wins'] for report in reports) / bets, 4) if bets else 0.0,
+        'profit': round(profit, 2),
+        'roi': round(profit / staked, 4) if staked else 0.0,
+        'avg_clv': round(sum(report['avg_clv'] * report['bets'] for report in reports) / bets, 4) if bets else 0.0,
+        'seconds': round(time.perf_counter() - start, 4)
+    }
+    return reports, totals
+
+
+def print_report(reports, totals):
+    for report in reports:
+        print(f"{report['season']}: {report['bets']} bets / {report['games']} games, "
+              f"hit rate {report['hit_rate'] * 100:.1f}%, ROI {report['roi'] * 100:.1f}%, "
+              f"CLV {report['avg_clv'] * 100:+.2f}%, bankroll {report['final_bankroll']:.2f}")
+        if report['skipped']:
+            print(f"    {report['skipped']} games skipped: a team is missing from the stats file")
+    print(f"-------------------------------------------------")
+    print(f"{totals['seasons']} seasons, {totals['games']} games, {totals['bets']} bets in {totals['seconds']:.2f}s: "
+          f"hit rate {totals['hit_rate'] * 100:.1f}%, ROI {totals['roi'] * 100:.1f}%, CLV {totals['avg_clv'] * 100:+.2f}%")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay historical odds snapshots through the models.")
+    parser.add_argument('manifest', help="JSON list of seasons: {name, sport, stats, schedule, snapshots, results}")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--min-edge', type=float, default=0.02)
+    parser.add_argument('--staking', choices=['flat', 'kelly'], default='flat')
+    parser.add_argument('--bet-at', choices=['open', 'close'], default='open')
+    parser.add_argument('--bankroll', type=float, default=1000.0)
+    parser.add_argument('--elo-weight', type=float, default=0.0,
+                        help="Blend this share of Elo win probability (from earlier results) into the model's")
+    args = parser.parse_args()
+
+    with open(args.manifest, 'r') as file:
+        seasons = json.load(file)
+    base_dir = os.path.dirname(os.path.abspath(args.manifest))
+    for season in seasons:
+        for key in SEASON_FILES:
+            if isinstance(season.get(key), str):
+                season[key] = os.path.join(base_dir, season[key])
+
+    print_report(*run_backtests(seasons, args.workers, min_edge=args.min_edge, staking=args.staking,
+                                bet_at=args.bet_at, bankroll=args.bankroll, elo_weight=args.elo_weight))
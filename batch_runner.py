@@ -0,0 +1,112 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.sports import get_sport
+from utils.writers import JSONWriter, write_results
+
+# Team-level data loaded in this process (utils.sports.shared_value), keyed by (kind, path, mtime) so each
+# worker parses, scores and indexes a stats or schedule file once no matter how many slates use it
+_team_data_cache = {}
+
+# Manifest flags passed to the sport as options; the plugin rejects the ones it doesn't support
+SLATE_OPTIONS = ('lineup', 'simulate')
+
+# ColumnarCache shared by the process when the batch runs with a cache_dir
+_input_cache = None
+
+
+# Function to read a manifest: a JSON list of slates, or {"slates": [...]}
+# Each slate: {"sport", its input files (NBA: "stats", "schedule", "odds"; NFL: "stats", "odds"),
+# optional "as_of", "output", "lineup" and "simulate" (NBA only)}
+def load_manifest(manifest_file):
+    with open(manifest_file, 'r') as file:
+        manifest = json.load(file)
+    slates = manifest.get('slates', []) if isinstance(manifest, dict) else manifest
+    base_dir = os.path.dirname(os.path.abspath(manifest_file))
+    for slate in slates:
+        slate['sport'] = slate['sport'].strip().upper()
+        plugin = get_sport(slate['sport'])
+        # Paths in the manifest are relative to the manifest itself
+        for key, _, _ in (plugin.inputs if plugin is not None else ()):
+            if slate.get(key):
+                slate[key] = os.path.join(base_dir, slate[key])
+    return slates
+
+
+def _init_worker(cache_dir):
+    global _input_cache
+    if cache_dir:
+        from utils.columnar_cache import ColumnarCache
+        _input_cache = ColumnarCache(cache_dir)
+    else:
+        _input_cache = None
+
+
+# Function to analyze one slate and write its results, runs inside a worker process
+def run_slate(slate, output_file):
+    start = time.perf_counter()
+    sport = slate['sport']
+    try:
+        matchups = _run_slate(slate, output_file)
+    except Exception as error:
+        return {'sport': sport, 'output': None, 'matchups': 0, 'seconds': time.perf_counter() - start,
+                'error': f"{type(error).__name__}: {error}"}
+    return {'sport': sport, 'output': output_file, 'matchups': matchups, 'seconds': time.perf_counter() - start}
+
+
+def _run_slate(slate, output_file):
+    plugin = get_sport(slate['sport'])
+    if plugin is None:
+        raise ValueError(f"{slate['sport']} not yet supported.")
+    # No defaults or prompts in a batch: a missing input is an error, so the slate is reported as failed
+    files = {name: slate.get(name) for name, _, _ in plugin.inputs}
+    missing = [name for name, path in files.items() if not path]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)} file")
+    for path in files.values():
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found")
+    options = {name: True for name in SLATE_OPTIONS if slate.get(name)}
+    results = plugin.run(files, slate.get('as_of'), _input_cache, writers=[], shared=_team_data_cache, **options)
+    # Written once the analysis succeeded, so a failed slate leaves no output file
+    return write_results(results, [JSONWriter(output_file)])
+
+
+# Function to pick the output filename for a slate
+def output_path(slate, index, output_dir):
+    if slate.get('output'):
+        return os.path.join(output_dir, slate['output'])
+    return os.path.join(output_dir, f"{index:04d}_{slate['sport'].lower()}_results.json")
+
+
+# Function to fan slates out over a process pool and report throughput
+# cache_dir loads every input through a ColumnarCache there (built on first use, memory-mapped after)
+def run_batch(slates, workers=None, output_dir='results', cache_dir=None):
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = [output_path(slate, index, output_dir) for index, slate in enumerate(slates)]
+
+    start = time.perf_counter()
+    if workers == 1:
+        _init_worker(cache_dir)
+        summaries = [run_slate(slate, output) for slate, output in zip(slates, outputs)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache_dir,)) as pool:
+            # Chunking keeps slates that share team files on the same worker more often
+            chunksize = max(1, len(slates) // ((workers or os.cpu_count() or 1) * 4))
+            summaries = list(pool.map(run_slate, slates, outputs, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    for slate, summary in zip(slates, summaries):
+        if summary.get('error'):
+            print(f"Slate {slate['sport']} {slate.get('odds')} failed: {summary['error']}")
+
+    rate = len(slates) / elapsed if elapsed > 0 else float('inf')
+    print(f"Ran {len(slates)} slates ({sum(s['matchups'] for s in summaries)} matchups) "
+          f"in {elapsed:.2f}s: {rate:.1f} slates/sec")
+    return summaries
+
+
+def run_manifest(manifest_file, workers=None, output_dir='results', cache_dir=None):
+    return run_batch(load_manifest(manifest_file), workers, output_dir, cache_dir)
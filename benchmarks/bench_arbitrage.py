@@ -0,0 +1,86 @@
+# Benchmark: full arbitrage/middle scans and single-book updates
+# Run from the repo root: python -m benchmarks.bench_arbitrage [--games 50000 --books 8 --updates 200000]
+import argparse
+import random
+import time
+
+from benchmarks.synthetic import book_names, make_lines, make_odds, moneyline, team_names
+from utils.arbitrage import SIDES, ArbitrageScanner
+from utils.helpers import find_best_lines, implied_probability, moneyline_to_decimal
+
+
+# Function to move a book's lines around the game's current market like a live feed;
+# now and then one side is mispriced far enough to open an arbitrage
+def moved_lines(current, rng):
+    fair_prob = implied_probability(moneyline_to_decimal(current['home_moneyline'])) - 0.02
+    lines = make_lines(fair_prob, rng, total=current['over_under'])
+    if rng.random() < 0.02:
+        side = rng.choice(['home', 'away'])
+        prob = fair_prob if side == 'home' else 1 - fair_prob
+        lines[f"{side}_moneyline"] = moneyline(max(0.03, prob - 0.04))
+    return lines
+
+
+# The index must match a scan from scratch and find_best_lines
+def check_against_rescan(scanner, game_ids):
+    for game_id in game_ids:
+        books = scanner.books[game_id]
+        best_lines = find_best_lines({'odds': books})
+        for side, key, higher in SIDES:
+            values = [lines[key] for lines in books.values() if lines.get(key) is not None]
+            values.sort(reverse=higher)
+            entries = scanner.top_quotes(game_id, side)
+            assert [value for value, _ in entries] == values[:2], (game_id, side, entries, values[:2])
+            assert all(books[book][key] == value for value, book in entries)
+            # find_best_lines takes the lowest away spread, the scanner the bettor's best (highest)
+            if side in best_lines and side != 'away_spread':
+                assert entries[0][0] == best_lines[side]['value']
+        home_team, away_team = scanner.games[game_id]
+        fresh = ArbitrageScanner([{'home_team': home_team, 'away_team': away_team, 'odds': books}])
+        assert len(fresh.found[game_id]) == len(scanner.found[game_id])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=50000)
+    parser.add_argument('--books', type=int, default=8)
+    parser.add_argument('--updates', type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    teams = 2
+    while teams * (teams - 1) < args.games:
+        teams *= 2
+    books = book_names(args.books)
+    team_odds = make_odds(team_names(teams), args.games, books, rng)
+
+    start = time.perf_counter()
+    scanner = ArbitrageScanner(team_odds)
+    scan_time = time.perf_counter() - start
+    counts = {kind: len(scanner.opportunities(kind)) for kind in ('arbitrage', 'middle')}
+    print(f"{args.games} games x {args.books} books: full scan {scan_time:.2f}s "
+          f"({args.games / scan_time:,.0f} games/sec), {counts['arbitrage']} arbitrage, {counts['middle']} middles")
+
+    game_ids = list(scanner.games)
+    updates = []
+    for _ in range(args.updates):
+        game_id = rng.choice(game_ids)
+        updates.append((game_id, rng.choice(books), moved_lines(scanner.books[game_id][books[0]], rng)))
+    start = time.perf_counter()
+    for game_id, book, lines in updates:
+        scanner.update_book(game_id, book, lines)
+    update_time = time.perf_counter() - start
+    counts = {kind: len(scanner.opportunities(kind)) for kind in ('arbitrage', 'middle')}
+    print(f"{args.updates} single-book updates: {update_time:.2f}s ({args.updates / update_time:,.0f} updates/sec, "
+          f"{scanner.rescans / (args.updates * len(SIDES)) * 100:.1f}% of side updates rescanned), "
+          f"{counts['arbitrage']} arbitrage, {counts['middle']} middles")
+
+    check_against_rescan(scanner, rng.sample(game_ids, min(2000, len(game_ids))))
+    best = scanner.opportunities('arbitrage')[:1]
+    if best:
+        print(f"best arbitrage: {best[0]['away_team']} @ {best[0]['home_team']} margin {best[0]['margin'] * 100:.2f}% "
+              f"stakes {[leg['stake'] for leg in best[0]['legs']]}")
+
+
+if __name__ == "__main__":
+    main()
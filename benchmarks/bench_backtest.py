@@ -0,0 +1,107 @@
+# Benchmark: multi-season backtest over synthetic odds snapshots
+# Run from the repo root: python -m benchmarks.bench_backtest [--seasons 10 --workers 4]
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from backtest import SEASON_FILES, evaluate_season, load_season, run_backtests
+from benchmarks.synthetic import make_nba_stats, moneyline, team_names
+from nba_analyzer import all_penalties, merge_data, run_analysis
+from utils.helpers import find_best_lines, game_result
+
+
+def make_season(year, team_count=30, days=165, books=5, snapshots_per_game=6, seed=0):
+    rng = random.Random(seed * 7919 + year)
+    teams = team_names(team_count)
+    stats = make_nba_stats(teams, rng, players_per_team=5, injury_rate=0.12)
+    schedule = {team: [] for team in teams}
+    snapshots = []
+    results = []
+    opening = date(year, 10, 20)
+    for day in range(days):
+        game_date = (opening + timedelta(days=day)).isoformat()
+        playing = rng.sample(teams, team_count // 2 if rng.random() < 0.5 else team_count)
+        for home, away in zip(playing[::2], playing[1::2]):
+            home_won = rng.random() < 0.55
+            schedule[home].append({'date': game_date, 'opponent': away, 'home_or_away': 'home',
+                                   'result': 'W' if home_won else 'L'})
+            schedule[away].append({'date': game_date, 'opponent': home, 'home_or_away': 'away',
+                                   'result': 'L' if home_won else 'W'})
+            results.append({'game_date': game_date, 'home_team': home, 'away_team': away,
+                            'winner': home if home_won else away})
+            fair = rng.uniform(0.25, 0.75)
+            for tick in range(snapshots_per_game):
+                fair = min(0.9, max(0.1, fair + rng.gauss(0, 0.01)))
+                odds = {}
+                for book in range(books):
+                    home_prob = min(0.95, max(0.05, fair + rng.gauss(0, 0.01)))
+                    odds[f"Book{book}"] = {
+                        'home_moneyline': moneyline(home_prob + 0.02),
+                        'away_moneyline': moneyline(1 - home_prob + 0.02),
+                        'home_spread': -5.5, 'away_spread': 5.5, 'over_under': 225.5
+                    }
+                snapshots.append({'timestamp': f"{game_date}T{10 + tick:02d}:00:00", 'game_date': game_date,
+                                  'home_team': home, 'away_team': away, 'odds': odds})
+    # One injury report per team on opening day, kept for the whole season
+    injuries = {team: [{'date': opening.isoformat(), 'injuries': stats[team]['injuries']}] for team in teams}
+    return {'name': f"NBA {year}", 'sport': 'NBA', 'stats': stats, 'schedule': schedule,
+            'snapshots': snapshots, 'results': results, 'injuries': injuries}
+
+
+# The vectorized path must agree with the analyzers for the same as-of date
+def check_against_analyzer(season):
+    evaluated = evaluate_season(load_season(season), bet_at='open')
+    first_day = str(evaluated['dates'][0])
+    day_snapshots = {}
+    for snapshot in season['snapshots']:
+        if snapshot['game_date'] == first_day:
+            day_snapshots.setdefault((snapshot['home_team'], snapshot['away_team']), snapshot)
+    games = sorted(day_snapshots.values(), key=lambda s: (s['home_team'], s['away_team']))
+    merged = merge_data(season['stats'], games, season['schedule'])
+    all_penalties(merged, as_of=first_day)
+    fields = ('home_chance', 'away_chance', 'home_edge', 'away_edge')
+    expected = [tuple(result[field] for field in fields) for result in run_analysis(merged)]
+    # The evaluated probabilities through the analyzers' own result builder, so every field must match exactly
+    got = [tuple(game_result(game, find_best_lines(game), home_prob, away_prob)[field] for field in fields)
+           for game, (home_prob, away_prob) in zip(merged.values(), evaluated['model_prob'].tolist())]
+    assert got == expected, (got, expected)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seasons', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    seasons = [make_season(2000 + i) for i in range(args.seasons)]
+    snapshots = sum(len(season['snapshots']) for season in seasons)
+    print(f"Generated {args.seasons} seasons, {snapshots} snapshots in {time.perf_counter() - start:.2f}s")
+
+    check_against_analyzer(seasons[0])
+
+    # Workers load their own season files, like a real run over stored history
+    workdir = tempfile.mkdtemp()
+    season_files = []
+    for season in seasons:
+        files = {'name': season['name'], 'sport': season['sport']}
+        for key in SEASON_FILES:
+            path = os.path.join(workdir, f"{season['name'].replace(' ', '_')}_{key}.json")
+            with open(path, 'w') as file:
+                json.dump(season[key], file)
+            files[key] = path
+        season_files.append(files)
+
+    for staking in ('flat', 'kelly'):
+        reports, totals = run_backtests(season_files, args.workers, staking=staking, min_edge=0.02)
+        print(f"{staking:>5}: {totals['games']} games, {totals['bets']} bets, ROI {totals['roi'] * 100:.1f}%, "
+              f"hit rate {totals['hit_rate'] * 100:.1f}%, CLV {totals['avg_clv'] * 100:+.2f}% "
+              f"in {totals['seconds']:.2f}s ({snapshots / totals['seconds']:.0f} snapshots/sec)")
+
+
+if __name__ == "__main__":
+    main()
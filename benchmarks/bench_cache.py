@@ -0,0 +1,74 @@
+# Benchmark: cold vs warm loads of JSON inputs through the columnar cache
+# Run from the repo root: python -m benchmarks.bench_cache [--matchups 200000 --books 8]
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.bench_memory import make_inputs
+from utils.columnar_cache import ColumnarCache
+from utils.scoring import NBA_FEATURES, NBA_DEFAULT_WEIGHTS, normalize_columns, score_matrix, weight_matrix
+
+LINE_COLUMNS = ['home_moneyline', 'away_moneyline', 'home_spread', 'away_spread', 'over_under']
+
+
+def timed(function):
+    start = time.perf_counter()
+    value = function()
+    return value, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--matchups', type=int, default=200000)
+    parser.add_argument('--books', type=int, default=8)
+    parser.add_argument('--teams', type=int, default=30)
+    args = parser.parse_args()
+
+    team_stats, team_schedule, team_odds = make_inputs(args.matchups, args.books, args.teams)
+    work_dir = tempfile.mkdtemp(prefix='bench_cache_')
+    files = {}
+    # A dotted key next to the nested field it spells must round-trip unchanged
+    dotted = [{'a.b': index, 'a': {'b': -index}} for index in range(1000)]
+    for name, data in (('stats', team_stats), ('schedule', team_schedule), ('odds', team_odds), ('dotted', dotted)):
+        files[name] = os.path.join(work_dir, f"{name}.json")
+        with open(files[name], 'w') as file:
+            json.dump(data, file, indent=4)
+
+    cache = ColumnarCache(os.path.join(work_dir, 'cache'))
+    print(f"{args.matchups} matchups x {args.books} books, {args.teams} teams")
+    for name, path in files.items():
+        def load_json():
+            with open(path, 'r') as file:
+                return json.load(file)
+        original, parse_time = timed(load_json)
+        _, cold_time = timed(lambda: cache.open(path))
+        columnar, open_time = timed(lambda: cache.open(path))
+        rebuilt, rebuild_time = timed(columnar.to_python)
+        assert rebuilt == original
+
+        print(f"  {name:<8} {os.path.getsize(path) / 1e6:8.1f} MB  json.load {parse_time:7.3f}s  "
+              f"cold build {cold_time:7.3f}s  warm open {open_time * 1000:7.2f}ms  "
+              f"warm to_python {rebuild_time:7.3f}s")
+
+    # Columnar consumers skip the dicts entirely: the quote matrix and team scores come straight off the mmap
+    odds = cache.open(files['odds'])
+    quotes_table = 'root/data/odds'
+    quotes, quote_time = timed(lambda: odds.matrix(quotes_table, LINE_COLUMNS))
+    print(f"  odds quote matrix {quotes.shape} from mmap: {quote_time * 1000:.1f}ms")
+
+    def columnar_scores():
+        stats = cache.open(files['stats'])
+        features = stats.matrix('root/data', [f"team_stats.{feature[1]}" for feature in NBA_FEATURES])
+        normalized = normalize_columns(features, [feature[2] for feature in NBA_FEATURES],
+                                       [feature[3] for feature in NBA_FEATURES])
+        return score_matrix(normalized, weight_matrix(NBA_DEFAULT_WEIGHTS, [feature[0] for feature in NBA_FEATURES]))
+    scores, score_time = timed(columnar_scores)
+    print(f"  team scores from mmap ({len(scores)} teams): {score_time * 1000:.2f}ms")
+    print(f"  cache {cache.stats()}")
+    cache.clear()
+
+
+if __name__ == '__main__':
+    main()
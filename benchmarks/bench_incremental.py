@@ -0,0 +1,60 @@
+# Benchmark: per-tick incremental updates vs re-running the full NBA slate
+# Run from the repo root: python -m benchmarks.bench_incremental
+import random
+import time
+
+from benchmarks.synthetic import AS_OF, book_names, make_lines, make_nba_schedule, make_nba_stats, make_odds, team_names
+from incremental import IncrementalSlate
+from nba_analyzer import analyze_nba_slate
+
+
+def make_league(team_count, book_count, rng):
+    teams = team_names(team_count)
+    team_stats = make_nba_stats(teams, rng)
+    team_schedule = make_nba_schedule(teams, rng, AS_OF, days_before=90, days_after=80)
+    books = book_names(book_count)
+    team_odds = make_odds(teams, team_count // 2, books, rng)
+    return team_stats, team_schedule, team_odds, books
+
+
+def random_lines(rng):
+    return make_lines(rng.uniform(0.2, 0.8), rng)
+
+
+def main():
+    rng = random.Random(3)
+    print(f"{'teams':>7}{'books':>7}{'full slate (ms)':>17}{'odds tick (us)':>16}{'injury tick (us)':>18}{'speedup':>10}")
+    for team_count, book_count in [(30, 8), (1000, 8), (10000, 8)]:
+        team_stats, team_schedule, team_odds, books = make_league(team_count, book_count, rng)
+
+        start = time.perf_counter()
+        full = analyze_nba_slate(team_stats, team_schedule, team_odds, AS_OF)
+        full_time = time.perf_counter() - start
+
+        slate = IncrementalSlate(team_stats, team_schedule, team_odds, AS_OF)
+        assert slate.ranked() == full
+
+        matchup_ids = list(slate.matchups)
+        ticks = 2000
+        odds_total = 0.0
+        for _ in range(ticks):
+            slate.update_odds(rng.choice(matchup_ids), rng.choice(books), random_lines(rng))
+            odds_total += slate.last_update_seconds
+        injury_total = 0.0
+        for _ in range(200):
+            team = f"Team{rng.randrange(team_count)}"
+            slate.update_injuries(team, ['Player'] * rng.randint(0, 3))
+            injury_total += slate.last_update_seconds
+
+        # Incremental state must still match a full recompute of the updated inputs
+        odds_now = [{'home_team': m['home_team'], 'away_team': m['away_team'], 'odds': m['odds']}
+                    for m in slate.matchups.values()]
+        assert slate.ranked() == analyze_nba_slate(slate.team_stats, team_schedule, odds_now, AS_OF)
+
+        odds_tick = odds_total / ticks
+        print(f"{team_count:>7}{book_count:>7}{full_time * 1000:>17.2f}{odds_tick * 1e6:>16.1f}"
+              f"{injury_total / 200 * 1e6:>18.1f}{full_time / odds_tick:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
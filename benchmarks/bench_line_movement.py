@@ -0,0 +1,157 @@
+# Benchmark: line-movement store ingest rate, storage per tick, range/as-of queries and detectors
+# Run from the repo root: python -m benchmarks.bench_line_movement [--ticks 2000000 --games 2000 --books 10]
+import argparse
+import random
+import time
+import tracemalloc
+
+from benchmarks.synthetic import book_names, team_names
+from utils.line_movement import LINE_TYPES, TIME_SCALE, VALUE_SCALE, LineMovementStore
+
+# Starting line per type and the size of one move
+OPENING = {
+    'home_moneyline': (-150, 5),
+    'away_moneyline': (130, 5),
+    'home_spread': (-3.5, 0.5),
+    'away_spread': (3.5, 0.5),
+    'over_under': (220.5, 0.5)
+}
+
+
+# Function to move a moneyline by step without landing between -100 and +100
+def _move(line_type, value, step):
+    value += step
+    if 'moneyline' in line_type and -100 < value < 100:
+        value += 200 if step > 0 else -200
+    return value
+
+
+# Function to yield (game_id, book, line_type, value, timestamp) ticks in time order. Most ticks are
+# one book nudging one line; now and then several books move one line the same way within seconds (steam).
+def iter_ticks(count, games, books, rng, start=1.7e9, steam_rate=0.002):
+    quotes = {}
+    now = start
+    emitted = 0
+    while emitted < count:
+        now += rng.expovariate(200)
+        game_id = rng.choice(games)
+        line_type = rng.choice(LINE_TYPES)
+        movers = rng.sample(books, 4) if rng.random() < steam_rate else [rng.choice(books)]
+        step = OPENING[line_type][1] * rng.choice((-1, 1))
+        for book in movers:
+            key = (game_id, book, line_type)
+            value = quotes.get(key)
+            value = OPENING[line_type][0] if value is None else _move(line_type, value, step)
+            quotes[key] = value
+            now += rng.uniform(0, 2)
+            yield game_id, book, line_type, value, now
+            emitted += 1
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ticks', type=int, default=2000000)
+    parser.add_argument('--games', type=int, default=2000)
+    parser.add_argument('--books', type=int, default=10)
+    parser.add_argument('--max-ticks', type=int, default=128, help="Ring-buffer limit per game and line type")
+    parser.add_argument('--queries', type=int, default=20000)
+    args = parser.parse_args()
+    rng = random.Random(21)
+
+    teams = team_names(args.games * 2)
+    games = [f"{home}_vs_{away}" for home, away in zip(teams[::2], teams[1::2])]
+    books = book_names(args.books)
+    store = LineMovementStore(max_ticks=args.max_ticks)
+    # Public money on the home side of a tenth of the games, for reverse line movement
+    for game_id in games[::10]:
+        store.record_public(game_id, 0.75)
+    # Every tick of a few games kept as plain tuples, to check the queries against
+    watched = set(games[:20])
+    plain = {}
+
+    chunk = []
+    ingest = 0.0
+    signals = 0
+    record = store.record
+    for tick in iter_ticks(args.ticks, games, books, rng):
+        chunk.append(tick)
+        if len(chunk) == 100000:
+            start = time.perf_counter()
+            for game_id, book, line_type, value, timestamp in chunk:
+                signals += len(record(game_id, book, line_type, value, timestamp))
+            ingest += time.perf_counter() - start
+            for game_id, book, line_type, value, timestamp in chunk:
+                if game_id in watched:
+                    plain.setdefault((game_id, line_type), []).append((timestamp, book, value))
+            chunk = []
+    start = time.perf_counter()
+    for game_id, book, line_type, value, timestamp in chunk:
+        signals += len(record(game_id, book, line_type, value, timestamp))
+    ingest += time.perf_counter() - start
+    for game_id, book, line_type, value, timestamp in chunk:
+        if game_id in watched:
+            plain.setdefault((game_id, line_type), []).append((timestamp, book, value))
+
+    stored = store.stored_ticks()
+    print(f"{store.ticks:,} ticks over {len(games)} games x {args.books} books ingested in {ingest:.2f}s "
+          f"({store.ticks / ingest:,.0f} ticks/sec), signals: {store.signal_counts}")
+    dropped = sum(series.trimmed for game in store.games.values() for series in game.values())
+    print(f"Stored after the {args.max_ticks}-tick ring buffers: {stored:,} ticks ({dropped:,} dropped), "
+          f"{store.nbytes() / 1e6:.1f} MB ({store.nbytes() / stored:.1f} bytes/tick)")
+
+    # The same ticks as a list of (timestamp, book, value) tuples, for comparison
+    sample = [(tick[4], tick[1], tick[3]) for tick in iter_ticks(200000, games, books, random.Random(1))]
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    copy = [(float(timestamp), str(book), float(value)) for timestamp, book, value in sample]
+    tuple_bytes = (tracemalloc.get_traced_memory()[0] - baseline) / len(copy)
+    tracemalloc.stop()
+    del copy
+    print(f"Same ticks as a list of tuples: {tuple_bytes:.1f} bytes/tick")
+
+    # Queries must match the plain ticks kept by the ring buffer
+    for (game_id, line_type), ticks in plain.items():
+        series = store.series(game_id, line_type)
+        kept = ticks[len(ticks) - len(series):]
+        got = store.range(game_id, line_type)
+        assert len(got) == len(kept) and all(
+            abs(a[0] - b[0]) < 1e-3 and a[1] == b[1] and abs(a[2] - b[2]) < 1e-9 for a, b in zip(got, kept))
+        for _ in range(20):
+            at = rng.choice(kept)[0]
+            expected = {}
+            for timestamp, book, value in ticks:
+                if round(timestamp * TIME_SCALE) > round(at * TIME_SCALE):
+                    break
+                expected[book] = round(value * VALUE_SCALE) / VALUE_SCALE
+            quotes = {book: lines[line_type] for book, lines in store.as_of(game_id, at)['odds'].items()
+                      if line_type in lines}
+            assert quotes == expected, (game_id, line_type, at, quotes, expected)
+
+    spans = []
+    for _ in range(args.queries):
+        game_id = rng.choice(games)
+        line_type = rng.choice(LINE_TYPES)
+        series = store.series(game_id, line_type)
+        first = series.block_times[0] / TIME_SCALE
+        last = series.last_time / TIME_SCALE
+        start_at = rng.uniform(first, last)
+        spans.append((game_id, line_type, start_at, start_at + (last - first) / 20))
+    start = time.perf_counter()
+    returned = sum(len(store.range(game_id, line_type, start_at, end_at)) for game_id, line_type, start_at, end_at in spans)
+    range_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for game_id, _, at, _ in spans:
+        store.as_of(game_id, at)
+    as_of_seconds = time.perf_counter() - start
+    print(f"Range queries (5% of a game's window): {args.queries / range_seconds:,.0f}/sec, "
+          f"{returned / args.queries:.1f} ticks each; whole-game as-of odds: {args.queries / as_of_seconds:,.0f}/sec")
+
+    game_id = games[0]
+    store.track_bet(game_id, 'home_moneyline', OPENING['home_moneyline'][0])
+    store.track_bet(game_id, 'over_under', OPENING['over_under'][0], side='under')
+    for bet in store.bet_report():
+        print(f"CLV {bet['game_id']} {bet['line_type']} {bet['side'] or ''} at {bet['value']}: {bet['clv']:+.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Benchmark: player-level lineup engine (build, incremental injury updates, whole-slate re-runs)
+# Run from the repo root: python -m benchmarks.bench_lineup
+import random
+import time
+
+from benchmarks.synthetic import AS_OF, make_nba_schedule, make_nba_stats, make_odds, team_names
+from incremental import IncrementalSlate
+from nba_analyzer import analyze_nba_slate
+from utils.lineup import LineupEngine
+
+
+def timed(function):
+    start = time.perf_counter()
+    value = function()
+    return value, time.perf_counter() - start
+
+
+# Function to draw an injury report for one team: each player out with probability rate
+def injury_report(team_stats, team, rng, rate=0.15):
+    return [player['name'] for player in team_stats[team]['players'] if rng.random() < rate]
+
+
+def main():
+    rng = random.Random(19)
+    print(f"{'teams':>7}{'players':>9}{'build (ms)':>12}{'update (us)':>13}{'from scratch (us)':>21}"
+          f"{'rebuild (ms)':>14}{'slate counts (ms)':>19}{'slate lineup (ms)':>19}{'live tick (us)':>16}")
+    for team_count in (30, 1000, 10000):
+        teams = team_names(team_count)
+        team_stats = make_nba_stats(teams, rng, players_per_team=13, injury_rate=0.1)
+        players = team_count * 13
+
+        engine, build_time = timed(lambda: LineupEngine(team_stats))
+
+        reports = [(team, injury_report(team_stats, team, rng)) for team in rng.choices(teams, k=20000)]
+        start = time.perf_counter()
+        for team, injuries in reports:
+            engine.set_injuries(team, injuries)
+        update_time = (time.perf_counter() - start) / len(reports)
+
+        # The running totals must match a from-scratch sum after thousands of reports
+        for team in teams:
+            expected = engine.recompute(team)
+            actual = engine.adjustments(team)
+            assert all(abs(a - b) < 1e-9 for a, b in zip(actual, expected)), (team, actual, expected)
+
+        start = time.perf_counter()
+        for team, _ in reports[:2000]:
+            engine.recompute(team)
+        recompute_time = (time.perf_counter() - start) / 2000
+
+        for team, injuries in reports:
+            team_stats[team]['injuries'] = injuries
+        _, rebuild_time = timed(lambda: LineupEngine(team_stats))
+
+        # Whole slate: every team plays once, injury-count buckets vs lineup impact
+        schedule = make_nba_schedule(teams, rng, AS_OF)
+        odds = make_odds(teams, team_count // 2, 5, rng)
+        _, counts_time = timed(lambda: analyze_nba_slate(team_stats, schedule, odds, AS_OF))
+        full, lineup_time = timed(lambda: analyze_nba_slate(team_stats, schedule, odds, AS_OF, lineup=True))
+
+        # Live slate: one team's injury report re-analyzes only that team's matchups
+        live = IncrementalSlate(team_stats, schedule, odds, AS_OF, lineup=True)
+        assert live.ranked() == full
+        ticks = 500
+        tick_total = 0.0
+        for team in rng.choices(teams, k=ticks):
+            live.update_injuries(team, injury_report(team_stats, team, rng))
+            tick_total += live.last_update_seconds
+        assert live.ranked() == analyze_nba_slate(live.team_stats, schedule, odds, AS_OF, lineup=True)
+
+        print(f"{team_count:>7}{players:>9}{build_time * 1000:>12.2f}{update_time * 1e6:>13.2f}"
+              f"{recompute_time * 1e6:>21.2f}{rebuild_time * 1000:>14.2f}{counts_time * 1000:>19.2f}"
+              f"{lineup_time * 1000:>19.2f}{tick_total / ticks * 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
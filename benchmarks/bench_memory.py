@@ -0,0 +1,75 @@
+# Benchmark: memory of the dict pipeline vs the compact slotted model
+# Run from the repo root: python -m benchmarks.bench_memory [--matchups 100000 --books 5]
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from benchmarks.synthetic import AS_OF, make_nba_schedule, make_nba_stats, make_odds, team_names
+from nba_analyzer import analyze_game, iter_merge_data, iter_penalties
+from utils.models import analyze_matchup, matchups_from_dicts, results_from_dicts
+from utils.scoring import nba_team_scores, scores_by_team
+
+
+# Repeated pairings are kept: the memory comparison runs over a list, not merge_data's dict
+def make_inputs(matchup_count, book_count, team_count=30, seed=0):
+    rng = random.Random(seed)
+    teams = team_names(team_count)
+    team_stats = make_nba_stats(teams, rng)
+    team_schedule = make_nba_schedule(teams, rng)
+    team_odds = make_odds(teams, matchup_count, book_count, rng, distinct=False)
+    return team_stats, team_schedule, team_odds
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--matchups', type=int, default=100000)
+    parser.add_argument('--books', type=int, default=5)
+    args = parser.parse_args()
+
+    team_stats, team_schedule, team_odds = make_inputs(args.matchups, args.books)
+    team_scores = scores_by_team(*nba_team_scores(team_stats))
+
+    # A list rather than merge_data's dict so repeated pairings (a backtest, many slates) are all kept
+    def build_dicts():
+        merged = [matchup for _, matchup in
+                  iter_penalties(iter_merge_data(team_stats, team_odds, team_schedule), as_of=AS_OF)]
+        return merged, [analyze_game(matchup, team_scores) for matchup in merged]
+
+    (merged, results), dict_bytes, dict_time = measure(build_dicts)
+
+    def build_compact():
+        matchups, teams, books = matchups_from_dicts(merged)
+        scores = [team_scores[name] for name in teams.names]
+        compact = [analyze_matchup(matchup, scores[matchup.home_id], scores[matchup.away_id])
+                   for matchup in matchups]
+        return matchups, compact, teams, books
+
+    (matchups, compact, teams, books), compact_bytes, compact_time = measure(build_compact)
+
+    # The compact pipeline must reproduce the dict results exactly
+    assert [result.to_dict(teams, books) for result in compact] == results
+    converted, _, _ = results_from_dicts(results, teams, books)
+    assert [result.to_dict(teams, books) for result in converted] == results
+
+    print(f"{args.matchups} matchups x {args.books} books")
+    print(f"    dicts (merged matchups + analyze_game):         {dict_bytes / 1e6:8.1f} MB  {dict_time:.2f}s")
+    print(f"    compact (Matchup/OddsQuote/AnalysisResult):     {compact_bytes / 1e6:8.1f} MB  {compact_time:.2f}s")
+    print(f"    {dict_bytes / compact_bytes:.1f}x smaller, {dict_bytes / args.matchups:.0f} vs "
+          f"{compact_bytes / args.matchups:.0f} bytes per matchup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# Benchmark: per-stage timings of the NBA and NFL pipelines on synthetic slates, with saved baselines.
+# Run from the repo root:
+#   python -m benchmarks.bench_pipeline --save-baseline          record timings for this machine
+#   python -m benchmarks.bench_pipeline                          compare, exit 1 on a slowdown
+#   python -m benchmarks.bench_pipeline --scenarios large --threshold 0.15
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import nba_analyzer
+import nfl_analyzer
+from benchmarks.synthetic import make_slate
+from utils.helpers import find_best_lines
+from utils.scoring import nba_team_scores, nfl_team_scores, scores_by_team
+
+# name: (teams, games, books); games * books odds rows
+SCENARIOS = {
+    'small': (30, 15, 5),
+    'medium': (200, 5000, 8),
+    'large': (500, 125000, 8),
+    'xlarge': (1500, 250000, 8),
+}
+DEFAULT_SCENARIOS = ['small', 'medium']
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+
+def _edge_key(result):
+    return max(result['home_edge'], result['away_edge'])
+
+
+# Function to run the NBA pipeline one stage at a time, returns {stage: seconds}
+def nba_stages(slate, output_file):
+    timings = {}
+
+    def stage(name, function):
+        start = time.perf_counter()
+        value = function()
+        timings[name] = time.perf_counter() - start
+        return value
+
+    team_scores = stage('team_scores', lambda: scores_by_team(*nba_team_scores(slate['stats'])))
+    merged = stage('merge_data', lambda: nba_analyzer.merge_data(slate['stats'], slate['odds'], slate['schedule']))
+    stage('all_penalties', lambda: nba_analyzer.all_penalties(merged, as_of=slate['as_of']))
+    stage('find_best_lines', lambda: [find_best_lines(matchup) for matchup in merged.values()])
+    results = stage('analyze_game', lambda: nba_analyzer.run_analysis(merged, team_scores))
+    results = stage('sorting', lambda: sorted(results, key=_edge_key, reverse=True))
+    stage('output', lambda: _write_results(results, output_file))
+    return timings
+
+
+def nfl_stages(slate, output_file):
+    timings = {}
+
+    def stage(name, function):
+        start = time.perf_counter()
+        value = function()
+        timings[name] = time.perf_counter() - start
+        return value
+
+    team_dict = stage('list_to_dict', lambda: nfl_analyzer.list_to_dict(slate['stats'], 'team'))
+    team_scores = stage('team_scores', lambda: scores_by_team(*nfl_team_scores(team_dict)))
+    merged = stage('merge_stats_and_odds', lambda: nfl_analyzer.merge_stats_and_odds(slate['odds'], team_dict))
+    stage('find_best_lines', lambda: [find_best_lines(game) for game in merged])
+    results = stage('analyze_game', lambda: nfl_analyzer.run_analysis(merged, team_scores))
+    results = stage('sorting', lambda: sorted(results, key=_edge_key, reverse=True))
+    stage('output', lambda: _write_results(results, output_file))
+    return timings
+
+
+# Same output as a batch run: the sorted results as an indented JSON file
+def _write_results(results, output_file):
+    with open(output_file, 'w') as file:
+        json.dump(results, file, indent=4)
+
+
+# Function to time every stage of both sports for one scenario, keeping each stage's best of `repeat`
+def run_scenario(name, repeat=3, seed=0):
+    teams, games, books = SCENARIOS[name]
+    output_file = os.path.join(tempfile.mkdtemp(prefix='bench_pipeline_'), 'results.json')
+    timings = {}
+    for sport, run_stages in (('NBA', nba_stages), ('NFL', nfl_stages)):
+        slate = make_slate(sport, teams, games, books, seed)
+        best = {}
+        for _ in range(repeat):
+            for stage, seconds in run_stages(slate, output_file).items():
+                best[stage] = min(seconds, best.get(stage, seconds))
+        best['total'] = sum(best.values())
+        timings[sport] = best
+    os.remove(output_file)
+    return timings
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+# Function to merge this run's scenarios into the baseline file (other scenarios are kept)
+def save_baseline(path, timings):
+    baseline = load_baseline(path)
+    baseline.setdefault('scenarios', {}).update(timings)
+    baseline['machine'] = {'python': platform.python_version(), 'platform': platform.platform(),
+                           'processor': platform.processor()}
+    baseline['saved'] = datetime.now().isoformat(timespec='seconds')
+    temp_file = f"{path}.tmp"
+    with open(temp_file, 'w') as file:
+        json.dump(baseline, file, indent=4)
+    os.replace(temp_file, path)
+
+
+# Function to list the stages that got slower than the baseline by more than threshold (0.2 = 20%).
+# Stages faster than min_seconds in the baseline are too noisy to judge and are skipped.
+def find_regressions(timings, baseline, threshold, min_seconds):
+    regressions = []
+    for scenario, sports in timings.items():
+        for sport, stages in sports.items():
+            base_stages = baseline.get('scenarios', {}).get(scenario, {}).get(sport, {})
+            for stage, seconds in stages.items():
+                base = base_stages.get(stage)
+                if base is None or base < min_seconds:
+                    continue
+                if seconds > base * (1 + threshold):
+                    regressions.append((scenario, sport, stage, base, seconds))
+    return regressions
+
+
+def print_timings(timings, baseline):
+    print(f"{'scenario':<9}{'sport':<6}{'stage':<22}{'seconds':>10}{'baseline':>10}{'change':>9}")
+    for scenario, sports in timings.items():
+        for sport, stages in sports.items():
+            base_stages = baseline.get('scenarios', {}).get(scenario, {}).get(sport, {})
+            for stage, seconds in stages.items():
+                base = base_stages.get(stage)
+                change = f"{(seconds / base - 1) * 100:+.0f}%" if base else ''
+                base_text = f"{base:.4f}" if base is not None else '-'
+                print(f"{scenario:<9}{sport:<6}{stage:<22}{seconds:>10.4f}{base_text:>10}{change:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time each pipeline stage and compare against a baseline.")
+    parser.add_argument('--scenarios', default=','.join(DEFAULT_SCENARIOS),
+                        help=f"Comma-separated scenarios ({', '.join(SCENARIOS)})")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per scenario, the best time is kept")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument('--save-baseline', action='store_true', help="Record this run as the baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    parser.add_argument('--min-seconds', type=float, default=0.005, help="Ignore stages faster than this")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    timings = {}
+    for name in names:
+        teams, games, books = SCENARIOS[name]
+        print(f"{name}: {teams} teams, {games} games x {books} books ({games * books} odds rows)")
+        timings[name] = run_scenario(name, args.repeat)
+
+    baseline = load_baseline(args.baseline)
+    print_timings(timings, baseline)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, timings)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"No baseline at {args.baseline}, run with --save-baseline first")
+        return 0
+    regressions = find_regressions(timings, baseline, args.threshold, args.min_seconds)
+    for scenario, sport, stage, base, seconds in regressions:
+        print(f"REGRESSION {scenario} {sport} {stage}: {base:.4f}s -> {seconds:.4f}s "
+              f"({(seconds / base - 1) * 100:+.0f}%, limit +{args.threshold * 100:.0f}%)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# Benchmark: streaming Elo ratings over decades of synthetic games in several leagues
+# Run from the repo root: python -m benchmarks.bench_ratings [--seasons 40]
+import argparse
+import math
+import random
+import time
+from datetime import date
+
+from backtest import evaluate_season, load_season
+from benchmarks.bench_backtest import make_season
+from benchmarks.synthetic import team_names
+from utils.ratings import EloRatings
+
+# league: (teams, games per season, season length in days)
+LEAGUES = {
+    'NBA': (30, 1230, 170),
+    'NFL': (32, 272, 125),
+    'MLB': (30, 2430, 185),
+    'NHL': (32, 1312, 185)
+}
+
+
+# Function to generate a league's games in date order. Teams have a hidden strength (Elo scale)
+# that drifts during the season and is partly reset between seasons; home teams get +60.
+def make_league(league, seasons, rng, first_year=1985):
+    team_count, season_games, days = LEAGUES[league]
+    teams = team_names(team_count)
+    strength = {team: rng.gauss(0, 120) for team in teams}
+    games = []
+    for season in range(seasons):
+        opening = date(first_year + season, 10, 1).toordinal()
+        strength = {team: 0.6 * value + rng.gauss(0, 80) for team, value in strength.items()}
+        for index in range(season_games):
+            day = opening + index * days // season_games
+            home, away = rng.sample(teams, 2)
+            strength[home] += rng.gauss(0, 3)
+            prob = 1 / (1 + 10 ** (-(strength[home] - strength[away] + 60) / 400))
+            games.append((day, home, away, rng.random() < prob))
+    return games
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seasons', type=int, default=40)
+    parser.add_argument('--queries', type=int, default=200000)
+    args = parser.parse_args()
+    rng = random.Random(20)
+
+    start = time.perf_counter()
+    leagues = {league: make_league(league, args.seasons, rng) for league in LEAGUES}
+    total_games = sum(len(games) for games in leagues.values())
+    print(f"Generated {args.seasons} seasons x {len(leagues)} leagues, {total_games:,} games "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    print(f"{'league':>7}{'games':>11}{'seconds':>9}{'games/sec':>12}{'first 10% /sec':>16}{'last 10% /sec':>15}"
+          f"{'snapshots':>11}{'Brier':>8}{'base Brier':>12}")
+    engines = {}
+    stream_seconds = 0.0
+    for league, games in leagues.items():
+        engine = engines[league] = EloRatings()
+        tenth = len(games) // 10
+        start = time.perf_counter()
+        engine.process(games[:tenth])
+        first = time.perf_counter() - start
+        engine.process(games[tenth:-tenth])
+        start_last = time.perf_counter()
+        engine.process(games[-tenth:])
+        last = time.perf_counter() - start_last
+        seconds = time.perf_counter() - start
+        stream_seconds += seconds
+
+        # Pre-game probabilities from the as-of lookups (only earlier games count) against the outcomes,
+        # base Brier always predicts the league's home win rate
+        brier = sum((engine.win_probability(home, away, day) - home_won) ** 2
+                    for day, home, away, home_won in games) / len(games)
+        home_rate = sum(game[3] for game in games) / len(games)
+        print(f"{league:>7}{len(games):>11,}{seconds:>9.2f}{len(games) / seconds:>12,.0f}{tenth / first:>16,.0f}"
+              f"{tenth / last:>15,.0f}{len(engine.snapshot_days):>11,}{brier:>8.4f}"
+              f"{home_rate * (1 - home_rate):>12.4f}")
+    print(f"All leagues: {total_games:,} games streamed in {stream_seconds:.2f}s")
+
+    # As-of lookups must match a replay of every game before that date
+    games = leagues['NBA']
+    for day, home, _, _ in rng.sample(games, 20):
+        replay = EloRatings()
+        replay.process(game for game in games if game[0] < day)
+        # Season regression is applied on the first game day of a season, so replays stop short of it
+        expected = replay.rating(home)
+        got = engines['NBA'].rating(home, day)
+        assert math.isclose(got, expected) or day - replay.last_day > replay.season_gap, (home, day, got, expected)
+
+    engine = engines['MLB']
+    days = [game[0] for game in leagues['MLB']]
+    teams = list(engine.ratings)
+    lookups = [(rng.choice(teams), rng.choice(days)) for _ in range(args.queries)]
+    start = time.perf_counter()
+    for team, day in lookups:
+        engine.rating(team, day)
+    lookup_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for _, day in lookups[:args.queries // 100]:
+        engine.standings(day)
+    table_seconds = time.perf_counter() - start
+    print(f"As-of rating lookups: {args.queries / lookup_seconds:,.0f}/sec, "
+          f"standings from snapshots: {args.queries // 100 / table_seconds:,.0f}/sec")
+
+    # Backtest cost of blending the ratings into the model probability
+    season = load_season(make_season(2010))
+    start = time.perf_counter()
+    evaluate_season(season)
+    plain = time.perf_counter() - start
+    start = time.perf_counter()
+    evaluate_season(season, elo_weight=0.3)
+    blended = time.perf_counter() - start
+    print(f"Backtest season ({len(season['results'])} games): evaluate {plain * 1000:.0f}ms, "
+          f"with elo_weight=0.3 {blended * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Benchmark: per-dict team scoring vs the batch NumPy scoring engine
+# Run from the repo root: python -m benchmarks.bench_scoring
+import random
+import time
+import numpy as np
+
+from benchmarks import synthetic
+from nba_analyzer import calculate_team_score
+from nfl_analyzer import compute_team_score, list_to_dict
+from utils.scoring import (
+    NBA_FEATURES,
+    NBA_DEFAULT_WEIGHTS,
+    NFL_FEATURES,
+    NFL_DEFAULT_WEIGHTS,
+    nba_feature_matrix,
+    nfl_feature_matrix,
+    score_matrix,
+    weight_matrix
+)
+
+TEAM_COUNTS = [30, 1000, 100000]
+WEIGHT_VARIANTS = 1000
+
+
+def make_nba_stats(count, rng):
+    return synthetic.make_nba_stats(synthetic.team_names(count), rng, players_per_team=0)
+
+
+def make_nfl_stats(count, rng):
+    return list_to_dict(synthetic.make_nfl_stats(synthetic.team_names(count), rng), 'team')
+
+
+def make_weight_variants(count, rng):
+    variants = []
+    for _ in range(count):
+        raw = {key: rng.random() for key in NBA_DEFAULT_WEIGHTS}
+        total = sum(raw.values())
+        variants.append({key: value / total for key, value in raw.items()})
+    return variants
+
+
+def timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(42)
+    variants = make_weight_variants(WEIGHT_VARIANTS, rng)
+    keys = [feature[0] for feature in NBA_FEATURES]
+    weights = weight_matrix(variants, keys)
+
+    # Load (dicts -> normalized matrix) happens once per slate, score happens per weight vector
+    print(f"{'sport':<6}{'teams':>8}{'per-dict (s)':>15}{'load (s)':>11}{'score (s)':>12}{'score speedup':>15}{'max diff':>11}")
+    for count in TEAM_COUNTS:
+        nba_stats = make_nba_stats(count, rng)
+        loop_scores, loop_time = timed(
+            lambda: [calculate_team_score(data['team_stats']) for data in nba_stats.values()])
+        (_, features), load_time = timed(lambda: nba_feature_matrix(nba_stats))
+        batch_scores, score_time = timed(
+            lambda: score_matrix(features, weight_matrix(NBA_DEFAULT_WEIGHTS, keys)))
+        diff = np.max(np.abs(np.array(loop_scores) - batch_scores))
+        print(f"{'NBA':<6}{count:>8}{loop_time:>15.4f}{load_time:>11.4f}{score_time:>12.6f}"
+              f"{loop_time / score_time:>14.1f}x{diff:>11.1e}")
+
+        nfl_stats = make_nfl_stats(count, rng)
+        loop_scores, loop_time = timed(
+            lambda: [compute_team_score(stats) for stats in nfl_stats.values()])
+        (_, features), load_time = timed(lambda: nfl_feature_matrix(nfl_stats))
+        batch_scores, score_time = timed(
+            lambda: np.clip(score_matrix(features, weight_matrix(NFL_DEFAULT_WEIGHTS, NFL_FEATURES)), 0, 1))
+        diff = np.max(np.abs(np.array(loop_scores) - batch_scores))
+        print(f"{'NFL':<6}{count:>8}{loop_time:>15.4f}{load_time:>11.4f}{score_time:>12.6f}"
+              f"{loop_time / score_time:>14.1f}x{diff:>11.1e}")
+
+    # What-if weights: every variant scored against every team
+    print(f"\nNBA weight variants ({WEIGHT_VARIANTS} vectors)")
+    for count in TEAM_COUNTS[:2]:
+        nba_stats = make_nba_stats(count, rng)
+        team_stats = [data['team_stats'] for data in nba_stats.values()]
+        _, loop_time = timed(
+            lambda: [[calculate_team_score(stats, w) for w in variants] for stats in team_stats])
+        _, features = nba_feature_matrix(nba_stats)
+        _, batch_time = timed(lambda: score_matrix(features, weights))
+        print(f"    {count:>6} teams: per-dict {loop_time:.4f}s, batch {batch_time:.4f}s, "
+              f"{loop_time / batch_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Benchmark: Monte Carlo spread/total simulation throughput
+# Run from the repo root: python -m benchmarks.bench_simulation
+import json
+import random
+import time
+
+import numpy as np
+
+from nba_analyzer import analyze_nba_slate
+from utils.simulation import simulate_games, simulate_slate
+
+
+def make_games(count, rng):
+    return [{
+        'home_win_prob': rng.uniform(0.2, 0.8),
+        'expected_total': rng.uniform(210, 240),
+        'home_spread': round(rng.uniform(-10, 10) * 2) / 2,
+        'away_spread': 0.0,
+        'over_under': round(rng.uniform(210, 240) * 2) / 2
+    } for _ in range(count)]
+
+
+def main():
+    rng = random.Random(11)
+    games = make_games(15, rng)
+    for game in games:
+        game['away_spread'] = -game['home_spread']
+
+    # Same seed gives the same estimates whatever the batch size
+    reference = simulate_games(games, 200_000, batch_size=200_000, seed=5)
+    chunked = simulate_games(games, 200_000, batch_size=7_000, seed=5)
+    assert all(np.array_equal(reference[key], chunked[key]) for key in reference)
+
+    print(f"{'games':>6}{'samples':>12}{'batch':>10}{'seconds':>10}{'samples/sec':>16}")
+    for game_count, samples, batch_size in [(15, 1_000_000, 10_000), (15, 1_000_000, 100_000),
+                                            (15, 10_000_000, 100_000), (500, 200_000, 20_000)]:
+        slate = make_games(game_count, rng)
+        start = time.perf_counter()
+        simulate_games(slate, samples, batch_size, seed=1)
+        elapsed = time.perf_counter() - start
+        # Every sample is one simulated outcome per game
+        print(f"{game_count:>6}{samples:>12}{batch_size:>10}{elapsed:>10.2f}{samples * game_count / elapsed:>16.0f}")
+
+    with open('nba_team_stats.json') as file:
+        team_stats = json.load(file)
+    with open('nba_schedule_data.json') as file:
+        team_schedule = json.load(file)
+    with open('nba_betting_odds.json') as file:
+        team_odds = json.load(file)
+    results = analyze_nba_slate(team_stats, team_schedule, team_odds)
+    for game in simulate_slate(results, team_stats, n_samples=1_000_000):
+        print(game)
+
+
+if __name__ == "__main__":
+    main()
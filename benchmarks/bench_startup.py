@@ -0,0 +1,61 @@
+# Benchmark: import time of main and of a full small run, each in a fresh interpreter
+# Run from the repo root: python -m benchmarks.bench_startup [--runs 15] [--repo PATH]
+# --repo points at another checkout (e.g. a git worktree of an older commit) to compare against
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ('numpy', 'requests', 'nba_analyzer', 'nfl_analyzer')
+
+IMPORT_SCRIPT = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import main\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(elapsed, ','.join(name for name in {modules!r} if name in sys.modules))\n"
+)
+
+
+# Function to time `import main` in a new interpreter, returns (seconds, heavy modules loaded)
+def import_time(repo):
+    script = IMPORT_SCRIPT.format(modules=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, '-c', script], cwd=repo, capture_output=True, text=True, check=True)
+    elapsed, _, loaded = output.stdout.strip().partition(' ')
+    return float(elapsed), loaded
+
+
+# Function to time a whole CLI run (interpreter start included)
+def run_time(repo, argv):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, 'main.py'] + argv, cwd=repo, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=15)
+    parser.add_argument('--repo', default='.')
+    args = parser.parse_args()
+    repo = os.path.abspath(args.repo)
+
+    timings = [import_time(repo) for _ in range(args.runs)]
+    loaded = timings[-1][1] or 'none'
+    print(f"import main: median {statistics.median(t for t, _ in timings) * 1000:7.1f}ms  "
+          f"min {min(t for t, _ in timings) * 1000:7.1f}ms  (heavy modules loaded: {loaded})")
+
+    runs = {
+        'NFL': ['--sport', 'NFL', '--quiet'],
+        'NBA': ['--sport', 'NBA', '--stats', 'nba_team_stats.json', '--schedule', 'nba_schedule_data.json',
+                '--odds', 'nba_betting_odds.json', '--quiet'],
+        'unsupported sport': ['--sport', 'MLB'],
+    }
+    for name, argv in runs.items():
+        times = [run_time(repo, argv) for _ in range(max(3, args.runs // 3))]
+        print(f"main.py {name:<18} median {statistics.median(times) * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Benchmark: vectorized weight-candidate evaluation for the tuning search
+# Run from the repo root: python -m benchmarks.bench_tuning [--workers 4]
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from backtest import evaluate_season, load_season, round_probabilities
+from benchmarks.bench_backtest import make_season
+from tuning import TuningProblem, WeightSearch
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--samples', type=int, default=50000)
+    args = parser.parse_args()
+
+    season = make_season(2010)
+    problem = TuningProblem(season)
+    print(f"{len(problem.home_won)} games, {len(problem.param_names)} parameters")
+
+    # Default weights must reproduce the backtest/analyzer probabilities
+    expected = evaluate_season(load_season(season))['model_prob'][:, 0]
+    got = round_probabilities(problem.win_probabilities(problem.defaults())[:, 0])
+    assert np.array_equal(np.sort(got), np.sort(expected))
+
+    for batch_size in (100, 1000, 5000):
+        candidates = np.random.default_rng(0).uniform(0, 1, size=(batch_size, len(problem.param_names)))
+        start = time.perf_counter()
+        problem.evaluate(candidates)
+        elapsed = time.perf_counter() - start
+        print(f"    batch {batch_size:>5}: {batch_size / elapsed:>10.0f} candidates/sec")
+
+    workdir = tempfile.mkdtemp()
+    for objective in ('log_loss', 'brier'):
+        checkpoint = os.path.join(workdir, f"random_{objective}.json")
+        with WeightSearch(season, objective, workers=args.workers, checkpoint=checkpoint) as search:
+            default_loss = search.default_loss
+            start = time.perf_counter()
+            result = search.random_search(args.samples)
+            search_time = time.perf_counter() - start
+        # Resuming a finished search from its checkpoint evaluates nothing new
+        with WeightSearch(season, objective, checkpoint=checkpoint) as resumed:
+            assert resumed.random_search(args.samples)['evaluated'] == result['evaluated']
+        with WeightSearch(season, objective, workers=args.workers) as search:
+            start = time.perf_counter()
+            coordinate = search.coordinate_search(rounds=3)
+            coordinate_time = time.perf_counter() - start
+        print(f"{objective}: default {default_loss:.5f}, random {result['loss']:.5f} "
+              f"({args.samples} candidates in {search_time:.2f}s), "
+              f"coordinate {coordinate['loss']:.5f} ({coordinate['evaluated']} candidates in {coordinate_time:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Benchmark: result selection and output writers vs the per-line print loop
+# Run from the repo root: python -m benchmarks.bench_writers [--games 100000]
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_slate
+from nba_analyzer import analyze_nba_slate
+from utils.writers import TerminalWriter, best_edge, open_writer, select_results
+
+
+def timed(function):
+    start = time.perf_counter()
+    value = function()
+    return value, time.perf_counter() - start
+
+
+# The runners' output before the writers: 14 print calls per matchup
+def print_loop(results):
+    for result in results:
+        print(f"{result['away_team']} @ {result['home_team']}:")
+        print(f"    Market assigned {result['home_team']} win probability: {result['home_market_chance']*100:.1f}%")
+        print(f"    Market assigned {result['away_team']} win probability: {result['away_market_chance']*100:.1f}%")
+        print(f"    Model est. {result['home_team']} win probability: {result['home_chance']}%")
+        print(f"    Model est. {result['away_team']} win probability: {result['away_chance']}%")
+        print(f"    {result['home_team']} edge: {result['home_edge']*100:.1f}%")
+        print(f"    {result['away_team']} edge: {result['away_edge']*100:.1f}%")
+        print(f"    Best Lines:")
+        print(f"        Home ML: {result['best_lines']['home_moneyline']['value']} ({result['best_lines']['home_moneyline']['book']})")
+        print(f"        Away ML: {result['best_lines']['away_moneyline']['value']} ({result['best_lines']['away_moneyline']['book']})")
+        print(f"        Home Spread: {result['best_lines']['home_spread']['value']} ({result['best_lines']['home_spread']['book']})")
+        print(f"        Away Spread: {result['best_lines']['away_spread']['value']} ({result['best_lines']['away_spread']['book']})")
+        print(f"        Over/Under: {result['best_lines']['over_under']['value']} ({result['best_lines']['over_under']['book']})")
+        print(f"-------------------------------------------------")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=100000)
+    parser.add_argument('--top', type=int, default=50)
+    args = parser.parse_args()
+
+    teams = 2
+    while teams * (teams - 1) < args.games:
+        teams *= 2
+    slate = make_slate('NBA', teams, args.games, 5)
+    results = analyze_nba_slate(slate['stats'], slate['schedule'], slate['odds'], slate['as_of'])
+    print(f"{len(results)} results")
+
+    full, sort_time = timed(lambda: sorted(results, key=best_edge, reverse=True))
+    top, top_time = timed(lambda: select_results(results, args.top))
+    assert top == full[:args.top]
+    print(f"  full sort {sort_time * 1000:8.1f}ms   top {args.top} heap {top_time * 1000:8.1f}ms")
+
+    work_dir = tempfile.mkdtemp(prefix='bench_writers_')
+    terminal_file = os.path.join(work_dir, 'terminal.txt')
+
+    def run_print_loop():
+        with open(terminal_file, 'w') as file, contextlib.redirect_stdout(file):
+            print_loop(full)
+    _, loop_time = timed(run_print_loop)
+    with open(terminal_file) as file:
+        expected = file.read()
+
+    def run_terminal_writer():
+        with open(terminal_file, 'w') as file, TerminalWriter(file) as writer:
+            writer.write_all(full)
+    _, writer_time = timed(run_terminal_writer)
+    with open(terminal_file) as file:
+        assert file.read() == expected
+    print(f"  terminal: print loop {loop_time:6.3f}s   TerminalWriter {writer_time:6.3f}s   "
+          f"{loop_time / writer_time:.1f}x")
+
+    for fmt in ('jsonl', 'csv', 'html'):
+        path = os.path.join(work_dir, f"results.{fmt}")
+
+        def write():
+            with open_writer(fmt, path) as writer:
+                writer.write_all(full)
+        _, write_time = timed(write)
+        print(f"  {fmt:<6} {write_time:6.3f}s  {len(full) / write_time:10.0f} results/sec  "
+              f"{os.path.getsize(path) / 1e6:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# Load test: OddsPoller against the local stub server
+# Run from the repo root: python -m benchmarks.load_test_poller [--books 8 --games 200 --rounds 20]
+import argparse
+import random
+
+from utils.helpers import find_best_lines
+from utils.odds_poller import OddsPoller
+from utils.odds_stub_server import StubOddsServer
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--books', type=int, default=8)
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--moves', type=int, default=5, help="Line moves between rounds")
+    parser.add_argument('--per-game', action='store_true', help="One request per (book, game)")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    books = [f"Book{i}" for i in range(args.books)]
+    games = [(f"Team{2 * i}", f"Team{2 * i + 1}") for i in range(args.games)]
+
+    with StubOddsServer(books, games) as stub:
+        endpoints = stub.endpoints(per_game=args.per_game)
+        with OddsPoller(endpoints, workers=args.workers) as poller:
+            for _ in range(args.rounds):
+                snapshot = poller.poll_once()
+                # Output must feed straight into find_best_lines
+                for game in snapshot:
+                    find_best_lines(game)
+                for _ in range(args.moves):
+                    stub.move_line(rng.choice(books), rng.randrange(args.games),
+                                   'over_under', round(rng.uniform(200, 240) * 2) / 2)
+
+            metrics = poller.metrics.summary()
+
+    print(f"{len(endpoints)} endpoints x {args.rounds} rounds, {len(snapshot)} games per snapshot")
+    for key, value in metrics.items():
+        print(f"    {key}: {value}")
+    total = metrics['bytes_received'] + metrics['bytes_saved']
+    if total:
+        print(f"    bandwidth saved: {metrics['bytes_saved'] / total * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# Load test: web_service.ResultService with thousands of concurrent readers and SSE clients
+# Run from the repo root: python -m benchmarks.load_test_service [--readers 2000 --subscribers 500 --seconds 10]
+# The service runs in its own process on a synthetic NBA slate kept live by IncrementalSlate;
+# odds move every --publish-interval seconds and only the changed matchups are pushed.
+import argparse
+import asyncio
+import multiprocessing
+import random
+import statistics
+import time
+
+SPORT = 'NBA'
+SLATE = 'synthetic'
+
+
+# Function to run the service with a live synthetic slate, runs in the server process
+def serve(port_queue, publish_queue, matchups, books, publish_interval, moves, seconds):
+    from benchmarks.synthetic import make_lines, make_slate
+    from incremental import IncrementalSlate
+    from web_service import ResultService
+
+    teams = 2
+    while teams * (teams - 1) < matchups:
+        teams *= 2
+    slate = make_slate('NBA', teams, matchups, books, seed=11)
+    live = IncrementalSlate(slate['stats'], slate['schedule'], slate['odds'], slate['as_of'])
+    rng = random.Random(3)
+
+    async def run():
+        service = await ResultService(port=0).start()
+        service.publish(SPORT, SLATE, live.ranked())
+        port_queue.put(service.port)
+        matchup_ids = list(live.matchups)
+        book_names = list(live.matchups[matchup_ids[0]]['odds'])
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(publish_interval)
+            for _ in range(moves):
+                live.update_odds(rng.choice(matchup_ids), rng.choice(book_names), make_lines(rng.uniform(0.2, 0.8), rng))
+            published_at = time.time()
+            service.publish(SPORT, SLATE, live.ranked())
+            publish_queue.put((service.slates[(SPORT, SLATE)].version, published_at))
+        port_queue.put(dict(service.metrics))
+        await service.close()
+
+    asyncio.run(run())
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ')[1])
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(':')
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers, body
+
+
+# Function to poll the results on one keep-alive connection every poll_interval seconds
+# (starting at a random offset), revalidating with If-None-Match
+async def reader_client(port, deadline, stats, path, poll_interval, gzip_ok):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port, limit=1 << 20)
+    etag = None
+    await asyncio.sleep(random.uniform(0, poll_interval))
+    try:
+        while time.perf_counter() < deadline:
+            request = f"GET {path} HTTP/1.1\r\nHost: localhost\r\n"
+            if gzip_ok:
+                request += "Accept-Encoding: gzip\r\n"
+            if etag:
+                request += f"If-None-Match: {etag}\r\n"
+            start = time.perf_counter()
+            writer.write((request + "\r\n").encode())
+            status, headers, body = await _read_response(reader)
+            stats['latency'].append(time.perf_counter() - start)
+            stats[status] = stats.get(status, 0) + 1
+            stats['bytes'] += len(body)
+            etag = headers.get('etag', etag)
+            await asyncio.sleep(max(0.0, poll_interval - (time.perf_counter() - start)))
+    finally:
+        writer.close()
+
+
+# Function to follow the SSE stream, recording when each version's events arrive
+async def sse_client(port, deadline, received):
+    # The snapshot event carries the whole slate on one line
+    reader, writer = await asyncio.open_connection('127.0.0.1', port, limit=1 << 26)
+    writer.write(f"GET /events/{SPORT}/{SLATE} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    try:
+        await reader.readuntil(b'\r\n\r\n')
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                block = await asyncio.wait_for(reader.readuntil(b'\n\n'), remaining)
+            except asyncio.TimeoutError:
+                break
+            fields = dict(line.split(': ', 1) for line in block.decode().split('\n') if ': ' in line)
+            if fields.get('event') == 'matchup':
+                received.append((int(fields['id']), time.time()))
+    finally:
+        writer.close()
+
+
+async def run_clients(port, readers, subscribers, seconds, poll_interval, gzip_ok):
+    deadline = time.perf_counter() + seconds
+    stats = {'latency': [], 'bytes': 0}
+    received = []
+    tasks = [sse_client(port, deadline, received) for _ in range(subscribers)]
+    tasks += [reader_client(port, deadline, stats, f"/results/{SPORT}/{SLATE}", poll_interval, gzip_ok) for _ in range(readers)]
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    errors = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    return stats, received, errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--readers', type=int, default=2000, help="Concurrent keep-alive JSON readers")
+    parser.add_argument('--subscribers', type=int, default=500, help="Concurrent SSE clients")
+    parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds between a reader's requests (0 = flat out)")
+    parser.add_argument('--no-gzip', action='store_true', help="Readers don't send Accept-Encoding: gzip")
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--matchups', type=int, default=500)
+    parser.add_argument('--books', type=int, default=5)
+    parser.add_argument('--publish-interval', type=float, default=0.5)
+    parser.add_argument('--moves', type=int, default=5, help="Odds moves per publish")
+    args = parser.parse_args()
+
+    port_queue = multiprocessing.Queue()
+    publish_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(
+        port_queue, publish_queue, args.matchups, args.books, args.publish_interval, args.moves, args.seconds + 2))
+    server.start()
+    port = port_queue.get()
+
+    stats, received, errors = asyncio.run(run_clients(port, args.readers, args.subscribers, args.seconds,
+                                                           args.poll_interval, not args.no_gzip))
+    metrics = port_queue.get()
+    server.join()
+    published = {}
+    while not publish_queue.empty():
+        version, at = publish_queue.get()
+        published[version] = at
+
+    requests = len(stats['latency'])
+    latency = sorted(stats['latency'])
+    print(f"{args.readers} readers (every {args.poll_interval}s) + {args.subscribers} SSE clients for {args.seconds:.0f}s, "
+          f"{args.matchups} matchups, {len(published)} publishes")
+    print(f"    requests: {requests} ({requests / args.seconds:,.0f}/sec), 200: {stats.get(200, 0)}, "
+          f"304: {stats.get(304, 0)}, {stats['bytes'] / 1e6:.1f} MB of bodies")
+    if latency:
+        print(f"    latency: p50 {latency[len(latency) // 2] * 1000:.1f}ms  "
+              f"p99 {latency[int(len(latency) * 0.99)] * 1000:.1f}ms  max {latency[-1] * 1000:.1f}ms")
+    delays = [at - published[version] for version, at in received if version in published]
+    if delays:
+        delays.sort()
+        print(f"    SSE: {len(received)} matchup events, delivery p50 {statistics.median(delays) * 1000:.1f}ms  "
+              f"p99 {delays[int(len(delays) * 0.99)] * 1000:.1f}ms")
+    print(f"    server: {metrics}")
+    if errors:
+        print(f"    {len(errors)} client errors, first: {type(errors[0]).__name__}: {errors[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# Synthetic league/slate generator for benchmarks and load-scaled fixtures.
+# Output matches the input files the analyzers read: NBA team stats (team_stats, players, injuries),
+# NBA schedules, NFL team stats and multi-book odds in the find_best_lines shape.
+# Run from the repo root to write fixture files:
+#   python -m benchmarks.synthetic --sport NBA --teams 30 --games 15 --books 5 --output-dir fixtures
+import argparse
+import json
+import os
+import random
+from datetime import date, timedelta
+
+BOOK_NAMES = ['FanDuel', 'DraftKings', 'BetMGM', 'Caesars', 'PointsBet', 'BetRivers', 'Bet365', 'WynnBet']
+AS_OF = date(2025, 1, 15)
+
+
+def team_names(count):
+    return [f"Team{i}" for i in range(count)]
+
+
+def book_names(count):
+    return [BOOK_NAMES[i] if i < len(BOOK_NAMES) else f"Book{i}" for i in range(count)]
+
+
+def moneyline(prob):
+    if prob >= 0.5:
+        return -round(prob / (1 - prob) * 100)
+    return round((1 - prob) / prob * 100)
+
+
+# Function to build NBA team stats: {team: {'team_stats', 'players', 'injuries'}}
+# Each player is injured with probability injury_rate; injuries list player names
+def make_nba_stats(teams, rng, players_per_team=9, injury_rate=0.05):
+    team_stats = {}
+    for team in teams:
+        players = [{
+            'name': f"{team} Player{i}",
+            'MPG': round(rng.uniform(12, 36), 1),
+            'Ortg': round(rng.uniform(100, 130), 1),
+            'Drtg': round(rng.uniform(100, 125), 1)
+        } for i in range(players_per_team)]
+        team_stats[team] = {
+            'team_stats': {
+                'Ortg': round(rng.uniform(105, 125), 1),
+                'Drtg': round(rng.uniform(105, 125), 1),
+                'Pace': round(rng.uniform(96, 104), 1),
+                'TS%': round(rng.uniform(0.52, 0.62), 3),
+                'TOV%': round(rng.uniform(11, 16), 1),
+                'Rebound%': round(rng.uniform(47, 53), 1)
+            },
+            'players': players,
+            'injuries': [player['name'] for player in players if rng.random() < injury_rate]
+        }
+    return team_stats
+
+
+# Function to build a list of NFL team stat rows (the nfl_stats.json shape)
+def make_nfl_stats(teams, rng):
+    return [{
+        'team': team,
+        'margin_of_victory': round(rng.uniform(-15, 15), 1),
+        'offense_rank': rng.randint(1, 32),
+        'defense_rank': rng.randint(1, 32),
+        'turnover_margin': rng.randint(-15, 15),
+        'record_in_one_score_games': f"{rng.randint(0, 8)}-{rng.randint(0, 8)}"
+    } for team in teams]
+
+
+# Function to build NBA schedules ({team: [games]}) from days_before to days_after around as_of.
+# Every game is recorded for both teams; games before as_of have results.
+def make_nba_schedule(teams, rng, as_of=AS_OF, days_before=60, days_after=30, play_rate=0.5):
+    schedule = {team: [] for team in teams}
+    for offset in range(-days_before, days_after):
+        game_date = as_of + timedelta(days=offset)
+        playing = [team for team in teams if rng.random() < play_rate]
+        rng.shuffle(playing)
+        for home, away in zip(playing[::2], playing[1::2]):
+            home_won = rng.random() < 0.55
+            played = game_date < as_of
+            schedule[home].append({'date': game_date, 'opponent': away, 'home_or_away': 'home',
+                                   'result': ('W' if home_won else 'L') if played else None})
+            schedule[away].append({'date': game_date, 'opponent': home, 'home_or_away': 'away',
+                                   'result': ('L' if home_won else 'W') if played else None})
+
+    # Derived fields as in nba_schedule_data.json
+    for games in schedule.values():
+        previous = None
+        for game in games:
+            rest = (game['date'] - previous['date']).days - 1 if previous else 2
+            same_stand = previous is not None and previous['home_or_away'] == game['home_or_away']
+            game['back_to_back'] = rest == 0
+            game['game_in_trip'] = previous['game_in_trip'] + 1 if same_stand else 1
+            game['days_rest'] = rest
+            previous = game
+        for game in games:
+            game['date'] = game['date'].isoformat()
+    return schedule
+
+
+# Function to pick `count` distinct (home, away) pairings, so merge_data keeps every matchup.
+# With distinct=False pairings repeat (as over many slates), for pipelines that keep a list.
+def make_pairings(teams, count, rng, distinct=True):
+    if not distinct:
+        return [tuple(rng.sample(teams, 2)) for _ in range(count)]
+    team_count = len(teams)
+    if count > team_count * (team_count - 1):
+        raise ValueError(f"{team_count} teams only have {team_count * (team_count - 1)} distinct pairings")
+    order = list(teams)
+    rng.shuffle(order)
+    pairings = []
+    offset = 1
+    while len(pairings) < count:
+        for index in range(team_count):
+            if len(pairings) == count:
+                break
+            pairings.append((order[index], order[(index + offset) % team_count]))
+        offset += 1
+    return pairings
+
+
+# Function to build one book's lines around a fair home win probability (and game total, if given)
+def make_lines(fair_prob, rng, sport='NBA', total=None):
+    home_prob = min(0.95, max(0.05, fair_prob + rng.gauss(0, 0.008)))
+    # Books hang the same spread, now and then one shades it by half a point
+    spread = round((0.5 - fair_prob) * (28 if sport == 'NBA' else 20) * 2) / 2
+    shade = rng.random()
+    spread += 0.5 if shade < 0.03 else -0.5 if shade > 0.97 else 0.0
+    if total is None:
+        total = rng.uniform(210, 240) if sport == 'NBA' else rng.uniform(38, 54)
+    total += rng.gauss(0, 0.25)
+    return {
+        'home_moneyline': moneyline(min(0.97, home_prob + 0.02)),
+        'away_moneyline': moneyline(min(0.97, 1 - home_prob + 0.02)),
+        'home_spread': spread,
+        'away_spread': -spread,
+        'over_under': round(total * 2) / 2
+    }
+
+
+# Function to yield odds entries ({'home_team', 'away_team', 'odds': {book: lines}}) one game at a time.
+# games * books is the number of odds rows; as a generator it scales to millions of rows.
+def iter_odds(teams, games, books, rng, sport='NBA', distinct=True):
+    books = book_names(books) if isinstance(books, int) else books
+    for home, away in make_pairings(teams, games, rng, distinct):
+        fair_prob = rng.uniform(0.2, 0.8)
+        total = rng.uniform(210, 240) if sport == 'NBA' else rng.uniform(38, 54)
+        yield {'home_team': home, 'away_team': away,
+               'odds': {book: make_lines(fair_prob, rng, sport, total) for book in books}}
+
+
+def make_odds(teams, games, books, rng, sport='NBA', distinct=True):
+    return list(iter_odds(teams, games, books, rng, sport, distinct))
+
+
+# Function to build a whole slate's inputs for one sport, as a dict of the analyzers' input values
+def make_slate(sport='NBA', teams=30, games=15, books=5, seed=0, as_of=AS_OF, injury_rate=0.05):
+    rng = random.Random(seed)
+    names = team_names(teams)
+    if sport == 'NBA':
+        return {
+            'sport': 'NBA',
+            'as_of': as_of.isoformat(),
+            'stats': make_nba_stats(names, rng, injury_rate=injury_rate),
+            'schedule': make_nba_schedule(names, rng, as_of),
+            'odds': make_odds(names, games, books, rng, 'NBA')
+        }
+    if sport == 'NFL':
+        return {
+            'sport': 'NFL',
+            'stats': make_nfl_stats(names, rng),
+            'odds': make_odds(names, games, books, rng, 'NFL')
+        }
+    raise ValueError(f"{sport} not yet supported.")
+
+
+# Function to write a slate's inputs as JSON files, returns a batch-manifest style slate dict
+def write_slate(slate, output_dir, prefix=None):
+    os.makedirs(output_dir, exist_ok=True)
+    prefix = prefix or slate['sport'].lower()
+    written = {'sport': slate['sport']}
+    if slate.get('as_of'):
+        written['as_of'] = slate['as_of']
+    for key in ('stats', 'schedule', 'odds'):
+        if key in slate:
+            path = os.path.join(output_dir, f"{prefix}_{key}.json")
+            with open(path, 'w') as file:
+                json.dump(slate[key], file, indent=4)
+            written[key] = path
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic stats, schedule and odds files.")
+    parser.add_argument('--sport', default='NBA')
+    parser.add_argument('--teams', type=int, default=30)
+    parser.add_argument('--games', type=int, default=15)
+    parser.add_argument('--books', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--injury-rate', type=float, default=0.05)
+    parser.add_argument('--output-dir', default='fixtures')
+    args = parser.parse_args()
+
+    slate = make_slate(args.sport.strip().upper(), args.teams, args.games, args.books, args.seed,
+                       injury_rate=args.injury_rate)
+    written = write_slate(slate, args.output_dir)
+    print(f"Wrote {args.games} games x {args.books} books ({args.games * args.books} odds rows): "
+          + ", ".join(written[key] for key in ('stats', 'schedule', 'odds') if key in written))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import time
+from bisect import bisect_left, insort
+
+from nba_analyzer import (
+    FATIGUE_WEIGHTS,
+    INJURY_WEIGHTS,
+    analyze_game,
+    calculate_penalties,
+    calculate_team_score,
+    merge_game
+)
+from utils.lineup import LineupEngine
+from utils.schedule_index import ScheduleIndex
+from utils.scoring import nba_team_scores, scores_by_team
+
+
+# Keeps a live NBA slate's analyze_game results current as single inputs change.
+# Each matchup depends on its two teams (stats, schedule, injuries) and its own per-book odds,
+# so an update only recomputes the matchups that depend on it. The edge ranking is a sorted
+# list kept in place with bisect, so no update re-sorts the whole slate.
+# lineup=True weighs injuries by the players ruled out (utils.lineup); an injury report then only
+# updates the players whose status changed before re-analyzing the team's matchups.
+class IncrementalSlate:
+    def __init__(self, team_stats, team_schedule, team_odds, as_of=None, fatigue_weights=None, injury_weights=None,
+                 lineup=False):
+        # Shallow copies so updates never write into the caller's dicts
+        self.team_stats = {team: dict(data) for team, data in team_stats.items()}
+        self.team_schedule = dict(team_schedule)
+        self.as_of = as_of
+        self.fatigue_weights = fatigue_weights or FATIGUE_WEIGHTS
+        self.injury_weights = injury_weights or INJURY_WEIGHTS
+
+        self.team_scores = scores_by_team(*nba_team_scores(self.team_stats)) if self.team_stats else {}
+        self.lineup = LineupEngine(self.team_stats) if lineup else None
+        self.schedule_indexes = {}
+        self.team_penalties = {}
+
+        self.matchups = {}
+        self.results = {}
+        self.team_matchups = {}
+        # Sorted (-best edge, insertion order, matchup_id), same order as the full sort in run_nba_analysis
+        self._ranking = []
+        self._rank_keys = {}
+        self._order = {}
+
+        self.updates = 0
+        self.last_update_seconds = 0.0
+
+        for game in team_odds:
+            if isinstance(game, dict):
+                self.add_matchup(game)
+
+    # Function to add (or replace) a matchup from an odds entry
+    def add_matchup(self, game):
+        game = dict(game, odds={book: dict(lines) for book, lines in (game.get('odds') or {}).items()})
+        matchup_id, matchup = merge_game(game, self.team_stats, self.team_schedule)
+        if matchup_id in self.matchups:
+            self.remove_matchup(matchup_id)
+        self.matchups[matchup_id] = matchup
+        self._order[matchup_id] = len(self._order)
+        for team in (matchup['home_team'], matchup['away_team']):
+            self.team_matchups.setdefault(team, set()).add(matchup_id)
+        self._recompute(matchup_id)
+        return matchup_id
+
+    def remove_matchup(self, matchup_id):
+        matchup = self.matchups.pop(matchup_id)
+        for team in (matchup['home_team'], matchup['away_team']):
+            self.team_matchups.get(team, set()).discard(matchup_id)
+        self._unrank(matchup_id)
+        self.results.pop(matchup_id, None)
+
+    # Function to get one team's penalties, computed once per team and reused by all its matchups
+    def _penalties(self, team, schedule, injuries):
+        if team not in self.team_penalties:
+            if schedule and team not in self.schedule_indexes:
+                self.schedule_indexes[team] = ScheduleIndex(schedule)
+            self.team_penalties[team] = calculate_penalties(
+                schedule, injuries, self.fatigue_weights, self.injury_weights,
+                self.as_of, self.schedule_indexes.get(team),
+                self.lineup.penalty(team) if self.lineup is not None else None)
+        return self.team_penalties[team]
+
+    def _recompute(self, matchup_id):
+        matchup = self.matchups[matchup_id]
+        for side in ('home', 'away'):
+            matchup[f'{side}_penalties'] = self._penalties(
+                matchup[f'{side}_team'], matchup[f'{side}_schedule'], matchup[f'{side}_injuries'])
+        result = analyze_game(matchup, self.team_scores)
+        self.results[matchup_id] = result
+        self._unrank(matchup_id)
+        key = (-max(result['home_edge'], result['away_edge']), self._order[matchup_id], matchup_id)
+        insort(self._ranking, key)
+        self._rank_keys[matchup_id] = key
+
+    def _unrank(self, matchup_id):
+        key = self._rank_keys.pop(matchup_id, None)
+        if key is not None:
+            del self._ranking[bisect_left(self._ranking, key)]
+
+    def _recompute_team(self, team):
+        for matchup_id in self.team_matchups.get(team, ()):
+            self._recompute(matchup_id)
+
+    def _finish(self, start):
+        self.last_update_seconds = time.perf_counter() - start
+        self.updates += 1
+
+    def _set_team_field(self, team, field, value):
+        for matchup_id in self.team_matchups.get(team, ()):
+            matchup = self.matchups[matchup_id]
+            side = 'home' if matchup['home_team'] == team else 'away'
+            matchup[f'{side}_{field}'] = value
+
+    # Function to apply one book's new lines for one matchup (only that matchup is re-analyzed)
+    def update_odds(self, matchup_id, book, lines):
+        start = time.perf_counter()
+        odds = self.matchups[matchup_id]['odds']
+        odds[book] = dict(odds.get(book, {}), **lines)
+        self._recompute(matchup_id)
+        self._finish(start)
+
+    # Function to drop a book from one matchup (e.g. lines pulled)
+    def remove_book(self, matchup_id, book):
+        start = time.perf_counter()
+        self.matchups[matchup_id]['odds'].pop(book, None)
+        self._recompute(matchup_id)
+        self._finish(start)
+
+    # Function to replace a team's injury list and re-analyze only that team's matchups
+    def update_injuries(self, team, injuries):
+        start = time.perf_counter()
+        self.team_stats.setdefault(team, {})['injuries'] = injuries
+        self._set_team_field(team, 'injuries', injuries)
+        if self.lineup is not None and not self.lineup.set_injuries(team, injuries):
+            # Nobody who plays changed status, so the penalties and results stand
+            self._finish(start)
+            return
+        self.team_penalties.pop(team, None)
+        self._recompute_team(team)
+        self._finish(start)
+
+    # Function to replace a team's season stats and re-score only that team
+    def update_team_stats(self, team, stats):
+        start = time.perf_counter()
+        team_data = dict(self.team_stats.get(team, {}), team_stats=stats)
+        self.team_stats[team] = team_data
+        self._set_team_field(team, 'stats', team_data)
+        self.team_scores[team] = calculate_team_score(stats)
+        if self.lineup is not None:
+            # Season Ortg/Drtg only; the players' impacts and the penalty don't change
+            self.lineup.team_stats[team] = stats
+        self._recompute_team(team)
+        self._finish(start)
+
+    # Function to replace a team's schedule and rebuild only that team's index and penalties
+    def update_schedule(self, team, schedule):
+        start = time.perf_counter()
+        self.team_schedule[team] = schedule
+        self._set_team_field(team, 'schedule', schedule)
+        self.schedule_indexes.pop(team, None)
+        self.team_penalties.pop(team, None)
+        self._recompute_team(team)
+        self._finish(start)
+
+    # Function to return results ordered by best edge, optionally only the top N
+    def ranked(self, top=None):
+        keys = self._ranking if top is None else self._ranking[:top]
+        return [self.results[key[2]] for key in keys]
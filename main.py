@@ -1,15 +1,97 @@
-from nfl_analyzer import run_nfl_analysis
-from nba_analyzer import run_nba_analysis
+import argparse
+import sys
 
-def main():
-    sport = input("Enter sport (NFL, NBA, etc): ").strip().upper()
+from utils.profiling import NULL_PROFILER, StageProfiler, run_with_cprofile
+from utils.sports import get_sport, sport_names
+from utils.writers import TerminalWriter, open_writer
 
-    if sport == "NFL":
-        run_nfl_analysis()
-    elif sport == "NBA":
-        run_nba_analysis()
-    else:
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate win probabilities and betting edges.")
+    parser.add_argument('--sport', help=f"Sport to analyze ({', '.join(sport_names())}). Asked interactively if omitted.")
+    parser.add_argument('--stats', help="Team stats file")
+    parser.add_argument('--schedule', help="Team schedule file (NBA)")
+    parser.add_argument('--odds', help="Matchup odds file")
+    parser.add_argument('--as-of', help="Analyze games on or after this date (YYYY-MM-DD), default today")
+    parser.add_argument('--batch', metavar='MANIFEST', help="Run every slate in a JSON manifest without prompts")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for --batch (default: CPU count)")
+    parser.add_argument('--output-dir', default='results', help="Directory for --batch result files")
+    parser.add_argument('--cache-dir', help="Load inputs through a binary columnar cache kept in this directory")
+    parser.add_argument('--lineup', action='store_true',
+                        help="NBA: weigh injuries by the players ruled out (minutes-weighted Ortg/Drtg) instead of counting them")
+    parser.add_argument('--simulate', action='store_true',
+                        help="NBA: add Monte Carlo spread cover and over/under chances to each result")
+    parser.add_argument('--top', type=int, help="Only report the K matchups with the biggest edge")
+    parser.add_argument('--min-edge', type=float, help="Only report matchups with an edge of at least this (0.03 = 3%%)")
+    parser.add_argument('--csv', metavar='FILE', help="Also write results as CSV")
+    parser.add_argument('--jsonl', metavar='FILE', help="Also write results as JSON Lines")
+    parser.add_argument('--html', metavar='FILE', help="Also write results as a static HTML report")
+    parser.add_argument('--quiet', action='store_true', help="Skip the terminal view")
+    parser.add_argument('--profile', action='store_true', help="Print per-stage timings after the run (to stderr)")
+    parser.add_argument('--profile-json', metavar='FILE', help="Write per-stage timings as JSON")
+    parser.add_argument('--profile-prom', metavar='FILE', help="Write per-stage timings in Prometheus text format")
+    parser.add_argument('--profile-memory', action='store_true', help="Also trace peak Python memory per stage (slower)")
+    parser.add_argument('--cprofile', metavar='FILE', help="Run under cProfile and write the stats to FILE")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.batch:
+        from batch_runner import run_manifest
+        run_manifest(args.batch, args.workers, args.output_dir, args.cache_dir)
+        return
+
+    input_cache = None
+    if args.cache_dir:
+        from utils.columnar_cache import ColumnarCache
+        input_cache = ColumnarCache(args.cache_dir)
+
+    sport = (args.sport or input("Enter sport (NFL, NBA, etc): ")).strip().upper()
+
+    profiler = NULL_PROFILER
+    if args.profile or args.profile_json or args.profile_prom or args.profile_memory:
+        profiler = StageProfiler(track_memory=args.profile_memory, labels={'sport': sport})
+
+    # Only the selected sport's analyzer (and its dependencies) gets imported
+    plugin = get_sport(sport)
+    if plugin is None:
         print(f"{sport} not yet supported.")
+        return
+    options = {}
+    if args.lineup:
+        if 'lineup' not in plugin.options:
+            print(f"--lineup is not supported for {sport}.")
+            return
+        options['lineup'] = True
+    if args.simulate:
+        if 'simulate' not in plugin.options:
+            print(f"--simulate is not supported for {sport}.")
+            return
+        options['simulate'] = True
+    files = {'stats': args.stats, 'schedule': args.schedule, 'odds': args.odds}
+
+    writers = [] if args.quiet else [TerminalWriter()]
+    for fmt in ('csv', 'jsonl', 'html'):
+        if getattr(args, fmt):
+            writers.append(open_writer(fmt, getattr(args, fmt)))
+
+    def run():
+        return plugin.run(files, args.as_of, input_cache, profiler, writers, args.top, args.min_edge, **options)
+
+    if args.cprofile:
+        _, report = run_with_cprofile(run, args.cprofile)
+        print(report, file=sys.stderr)
+    else:
+        run()
+
+    if profiler.enabled:
+        profiler.stop()
+        if args.profile_json:
+            profiler.write_json(args.profile_json)
+        if args.profile_prom:
+            profiler.write_prometheus(args.profile_prom)
+        if args.profile or args.profile_memory:
+            print(profiler.summary(), file=sys.stderr)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
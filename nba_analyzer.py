@@ -1,32 +1,18 @@
-import json
-import requests 
-from datetime import datetime, timedelta
 from utils.helpers import (
     normalize,
-    implied_probability,
-    moneyline_to_decimal,
     win_probability,
     find_best_lines,
-    calculate_edge,
-    normalize_team_score
+    game_result,
+    file_opener,
+    list_to_dict
 )
+from utils.schedule_index import ScheduleIndex
+from utils.streaming import iter_records, write_json_lines
+from utils.cache import weights_hash
+from utils.profiling import NULL_PROFILER
+from utils.writers import select_results
 
-# Utility functions
-def file_opener(filename):
-    try:
-        with open(filename, 'r') as file:
-            data = json.load(file)
-            return data
-    except FileNotFoundError:
-        print(f"{filename} NOT FOUND")
-        return []
-
-def list_to_dict(list_of_dicts, key_name):
-    team_dict = {}
-    for dictionary in list_of_dicts:
-        key = dictionary[key_name]
-        team_dict[key] = dictionary
-    return team_dict
+# utils.scoring (NumPy) is imported where teams are scored, so importing this module stays cheap
 
 
 # Function to calculate a normalized team score based on weighted stats
@@ -58,217 +44,328 @@ def calculate_team_score(stats, weights=None):
 
     return team_score
 
-# Function to merge 3 different sets of data under matchup ID
-def merge_data(team_stats, team_odds, team_schedule):
-    all_team_data = {}
+# Stats calculate_team_score reads from a team's 'team_stats'
+TEAM_STAT_KEYS = ('Ortg', 'Drtg', 'Pace', 'TS%', 'TOV%', 'Rebound%')
+
+# Function to list the stats calculate_team_score needs that a team's stats lack
+def missing_stats(stats):
+    return [key for key in TEAM_STAT_KEYS if stats.get(key) is None]
+
+# Function to leave out (matchup_id, matchup) pairs with a team that can't be scored
+# skipped, when given, receives {matchup_id: [teams missing stats]} for every matchup left out
+def iter_scorable(matchups, skipped=None):
+    for matchup_id, matchup in matchups:
+        teams = [matchup[f'{side}_team'] for side in ('home', 'away')
+                 if missing_stats(matchup[f'{side}_stats'].get('team_stats', {}))]
+        if teams:
+            if skipped is not None:
+                skipped[matchup_id] = teams
+            continue
+        yield matchup_id, matchup
+
+# Function to merge one odds entry with both teams' stats and schedules, returns (matchup_id, matchup)
+def merge_game(game, team_stats, team_schedule):
+    home = game.get('home_team')
+    away = game.get('away_team')
+    matchup_id = f"{home}_vs_{away}"
+    home_stats = team_stats.get(home, {})
+    away_stats = team_stats.get(away, {})
+    home_injuries = home_stats.get('injuries', [])
+    away_injuries = away_stats.get('injuries', [])
+    home_schedule = team_schedule[home]
+    away_schedule = team_schedule[away]
+    return matchup_id, {
+        'home_team': home,
+        'away_team': away,
+        'home_stats': home_stats,
+        'away_stats': away_stats,
+        'home_injuries': home_injuries,
+        'away_injuries': away_injuries,
+        'home_schedule': home_schedule,
+        'away_schedule': away_schedule,
+        'odds': game.get('odds')
+    }
+
+# Function to merge odds with stats and schedules one matchup at a time (odds can be any iterable/generator)
+def iter_merge_data(team_stats, team_odds, team_schedule):
     for game in team_odds:
         if not isinstance(game, dict):
             print("Bad game data:", game)
             continue
-        home = game.get('home_team')
-        away = game.get('away_team')
-        matchup_id = f"{home}_vs_{away}"
-        home_stats = team_stats.get(home, {})
-        away_stats = team_stats.get(away, {})
-        home_injuries = home_stats.get('injuries', [])
-        away_injuries = away_stats.get('injuries', [])
-        home_schedule = team_schedule[home]
-        away_schedule = team_schedule[away]
-        all_team_data[matchup_id] = {
-            'home_team': home,
-            'away_team': away,
-            'home_stats': home_stats,
-            'away_stats': away_stats,
-            'home_injuries': home_injuries,
-            'away_injuries': away_injuries,
-            'home_schedule': home_schedule,
-            'away_schedule': away_schedule,
-            'odds': game.get('odds')
-        }
-    return all_team_data
+        yield merge_game(game, team_stats, team_schedule)
+
+# Function to merge 3 different sets of data under matchup ID
+def merge_data(team_stats, team_odds, team_schedule):
+    return dict(iter_merge_data(team_stats, team_odds, team_schedule))
 
 # Function to calculate and weight total penalties to be applied to team score
-def calculate_penalties(schedule, injuries, fatigue_weights, injury_weights):
+# Pass a prebuilt ScheduleIndex to skip re-parsing the schedule on every call
+# lineup_penalty (from utils.lineup) replaces the injury-count buckets with the player-level impact
+def calculate_penalties(schedule, injuries, fatigue_weights, injury_weights, as_of=None, schedule_index=None,
+                        lineup_penalty=None):
     if not schedule:
         return {'fatigue': 0, 'injuries': 0, 'total': 0}
 
-    # Convert dates to datetime objects
-    for game in schedule:
-        game['date'] = datetime.strptime(game['date'], "%Y-%m-%d").date()
-
-    schedule.sort(key=lambda game: game['date'])
+    schedule_index = schedule_index or ScheduleIndex(schedule)
 
-    today = datetime.today().date()
-
-    next_game_index = None
-    for index, game in enumerate(schedule):
-        if game['date'] >= today:
-            next_game_index = index
-            break
-    if next_game_index is None:
+    # Fatigue from back-to-backs, 3 games in 4 nights and long road trips (3+ away games in a row)
+    fatigue_score = schedule_index.fatigue_score(fatigue_weights, as_of)
+    if fatigue_score is None:
         return {'fatigue': 0, 'injuries': 0, 'total': 0}
 
-    current_game = schedule[next_game_index]
-    current_game_date = current_game['date']
-
-    current_game['fatigue_score'] = 0
-
-    # Check for back-to-back
-    if next_game_index > 0:
-        previous_date = schedule[next_game_index - 1]['date']
-        if (current_game_date - previous_date) == timedelta(days=1):
-            current_game['fatigue_score'] += fatigue_weights['back_to_back']
-
-    #check for 3 games in 4 nights
-    games_in_4 = 1
-    for j in range(len(schedule)):
-        # j also means index
-        if j != next_game_index:
-            date_diff = abs((schedule[j]['date'] - current_game_date).days)
-            if date_diff <= 3:
-                games_in_4 += 1
-    if games_in_4 >= 3:
-        current_game['fatigue_score'] += fatigue_weights['3_games_4_nights']
-    # check for long road trip (3+ away games in a row)
-    road_streak = 0
-    if current_game.get('home_or_away') == 'away':
-        road_streak = 1
-        # Looking back
-        j = next_game_index - 1
-        while j >= 0 and schedule[j].get('home_or_away') == 'away':
-            road_streak += 1
-            j -= 1
-        # Looking forward
-        j = next_game_index + 1
-        while j < len(schedule) and schedule[j].get('home_or_away') == 'away':
-            road_streak += 1
-            j += 1
-        if road_streak >= 3:
-            current_game['fatigue_score'] += fatigue_weights['long_road_trip']
-    for game in schedule:
-        game['date'] = game['date'].strftime("%Y-%m-%d")
-
-    if not injuries:
-        current_game['injury_score'] = 0
-
-    current_game['injury_score'] = 0
+    injury_score = 0
+    if lineup_penalty is not None:
+        injury_score = lineup_penalty
     # Apply weights based on number of injured players
-    if len(injuries) >= 3:
-        current_game['injury_score'] += injury_weights['3_max']
+    elif len(injuries) >= 3:
+        injury_score += injury_weights['3_max']
     elif len(injuries) == 2:
-        current_game['injury_score'] += injury_weights['2_out']
+        injury_score += injury_weights['2_out']
     elif len(injuries) == 1:
-        current_game['injury_score'] += injury_weights['1_out']
+        injury_score += injury_weights['1_out']
 
     return {
-        'fatigue': current_game['fatigue_score'], 
-        'injuries': current_game['injury_score'],
-        'total': current_game['fatigue_score'] + current_game['injury_score']
+        'fatigue': fatigue_score,
+        'injuries': injury_score,
+        'total': fatigue_score + injury_score
     }
 
+# Default weights of fatigue and injuries
+FATIGUE_WEIGHTS = {
+    'back_to_back': 0.45,
+    'long_road_trip': 0.2,
+    '3_games_4_nights':0.35,
+}
+INJURY_WEIGHTS = {
+    '1_out': 0.10,
+    '2_out': 0.20,
+    '3_max': 0.30
+}
+
+# Function to attach home and away penalties to a single matchup
+# With a TeamCache each (team, as_of, weights) penalty is computed once and reused
+# With a LineupEngine injuries are weighed by the players ruled out instead of counted
+def apply_penalties(matchup, fatigue_weights, injury_weights, as_of=None, schedule_indexes=None, cache=None, lineup=None):
+    schedule_indexes = schedule_indexes if schedule_indexes is not None else {}
+    weights_key = None
+    if cache is not None:
+        weights_key = weights_hash(fatigue_weights, injury_weights, lineup.weights if lineup is not None else None)
+    for side in ('home', 'away'):
+        team = matchup.get(f'{side}_team')
+        schedule = matchup.get(f'{side}_schedule', [])
+        injuries = matchup.get(f'{side}_injuries', [])
+        if schedule and team not in schedule_indexes:
+            schedule_indexes[team] = ScheduleIndex(schedule)
+
+        # The lineup penalty comes from the engine's current state for the team, so it is part of the key too
+        lineup_penalty = lineup.penalty(team) if lineup is not None else None
+
+        def compute():
+            return calculate_penalties(
+                schedule, injuries, fatigue_weights, injury_weights, as_of, schedule_indexes.get(team), lineup_penalty)
+
+        if cache is not None:
+            inputs = injuries if lineup is None else [injuries, lineup_penalty]
+            matchup[f'{side}_penalties'] = cache.get_or_compute('penalties', team, compute, as_of, weights_key,
+                                                                inputs=inputs)
+        else:
+            matchup[f'{side}_penalties'] = compute()
+    return matchup
+
 # Function that defines weights of fatigue and injuries
-def all_penalties(all_team_data, fatigue_weights=None, injury_weights=None):
-    fatigue_weights = fatigue_weights or {
-        'back_to_back': 0.45,
-        'long_road_trip': 0.2,
-        '3_games_4_nights':0.35,
-    }
-    injury_weights = injury_weights or {
-        '1_out': 0.10,
-        '2_out': 0.20,
-        '3_max': 0.30
-    }
+def all_penalties(all_team_data, fatigue_weights=None, injury_weights=None, as_of=None, schedule_indexes=None, cache=None,
+                  lineup=None):
+    fatigue_weights = fatigue_weights or FATIGUE_WEIGHTS
+    injury_weights = injury_weights or INJURY_WEIGHTS
+    # One ScheduleIndex per team, shared by every matchup the team appears in
+    schedule_indexes = schedule_indexes if schedule_indexes is not None else {}
     # Loop through each matchup and assign home and away variables to be called into the penalties function
     for matchup_id, matchup in all_team_data.items():
-        home_schedule = matchup.get('home_schedule', [])
-        away_schedule = matchup.get('away_schedule', [])
-        home_injuries = matchup.get('home_injuries', [])
-        away_injuries = matchup.get('away_injuries', [])
-
-
-        matchup['home_penalties'] = calculate_penalties(home_schedule, home_injuries, fatigue_weights, injury_weights)
-        matchup['away_penalties'] = calculate_penalties(away_schedule, away_injuries, fatigue_weights, injury_weights)
-
-# Function that analyzes each matchup and calls most functions and returns results
-def analyze_game(game):
+        apply_penalties(matchup, fatigue_weights, injury_weights, as_of, schedule_indexes, cache, lineup)
+
+# Function to apply penalties to a stream of (matchup_id, matchup) pairs as they arrive
+def iter_penalties(matchups, fatigue_weights=None, injury_weights=None, as_of=None, schedule_indexes=None, cache=None,
+                   lineup=None):
+    fatigue_weights = fatigue_weights or FATIGUE_WEIGHTS
+    injury_weights = injury_weights or INJURY_WEIGHTS
+    schedule_indexes = schedule_indexes if schedule_indexes is not None else {}
+    for matchup_id, matchup in matchups:
+        yield matchup_id, apply_penalties(matchup, fatigue_weights, injury_weights, as_of, schedule_indexes, cache, lineup)
+
+# Function to get the unrounded home win probability for a merged matchup (penalties applied)
+def game_win_probability(game, team_scores=None, cache=None):
     home_stats = game['home_stats']
     away_stats = game['away_stats']
 
-    best_lines = find_best_lines(game)
-
-    home_moneyline = best_lines['home_moneyline']['value']
-    away_moneyline = best_lines['away_moneyline']['value']
-
-    home_decimal = moneyline_to_decimal(home_moneyline)
-    away_decimal = moneyline_to_decimal(away_moneyline)
-
-    home_score = calculate_team_score(home_stats.get('team_stats', {}))
-    away_score = calculate_team_score(away_stats.get('team_stats', {}))
+    # Use batch-computed scores when given, fall back to scoring the dict
+    if team_scores and game['home_team'] in team_scores:
+        home_score = team_scores[game['home_team']]
+    elif cache is not None:
+        home_score = cache.get_or_compute('score', game['home_team'],
+                                          lambda: calculate_team_score(home_stats.get('team_stats', {})),
+                                          uses_schedule=False)
+    else:
+        home_score = calculate_team_score(home_stats.get('team_stats', {}))
+    if team_scores and game['away_team'] in team_scores:
+        away_score = team_scores[game['away_team']]
+    elif cache is not None:
+        away_score = cache.get_or_compute('score', game['away_team'],
+                                          lambda: calculate_team_score(away_stats.get('team_stats', {})),
+                                          uses_schedule=False)
+    else:
+        away_score = calculate_team_score(away_stats.get('team_stats', {}))
     home_penalties = game.get('home_penalties', {}).get('total', 0)
     away_penalties = game.get('away_penalties', {}).get('total', 0)
     
     home_adj_score = home_score * (1 - home_penalties)
     away_adj_score = away_score * (1 - away_penalties)
 
-    home_win_prob = win_probability(home_adj_score, away_adj_score)
-    away_win_prob = 1 - home_win_prob
-
-    home_market_prob = implied_probability(home_decimal)
-    away_market_prob = implied_probability(away_decimal)
+    return win_probability(home_adj_score, away_adj_score)
 
-    home_edge = calculate_edge(home_win_prob, home_market_prob)
-    away_edge = calculate_edge(away_win_prob, away_market_prob)
-
-    home_chance = round(home_win_prob * 100, 1)
-    away_chance = round(away_win_prob * 100, 1)
+# Function that analyzes each matchup and calls most functions and returns results
+# best_lines can be passed in when find_best_lines already ran for the matchup
+def analyze_game(game, team_scores=None, cache=None, best_lines=None):
+    if best_lines is None:
+        best_lines = find_best_lines(game)
 
-    return {
-        'home_team': game['home_team'],
-        'away_team': game['away_team'],
-        'home_chance': home_chance,
-        'away_chance': away_chance,
-        'home_edge': home_edge,
-        'away_edge': away_edge,
-        'best_lines': best_lines,
-        'home_market_chance': home_market_prob,
-        'away_market_chance': away_market_prob
-    }
+    home_win_prob = game_win_probability(game, team_scores, cache)
+    away_win_prob = 1 - home_win_prob
 
-def run_analysis(all_team_data):
-    return [analyze_game(game) for game in all_team_data.values()]
+    return game_result(game, best_lines, home_win_prob, away_win_prob)
 
+def run_analysis(all_team_data, team_scores=None, cache=None, best_lines=None):
+    if best_lines is not None:
+        return [analyze_game(game, team_scores, cache, lines) for game, lines in zip(all_team_data.values(), best_lines)]
+    return [analyze_game(game, team_scores, cache) for game in all_team_data.values()]
 
-def run_nba_analysis():
-    team_stats_file = input("Enter Team Stats Filename(JSON format): ")
-    schedule_file = input("Enter team schedule FIlename(Json Format): ")
-    odds_file = input("Enter matchup odds Filename(Json Format): ")
+# Function to stream results one matchup at a time: merge -> penalties -> analyze_game
+# Only team-level data (stats, schedules) is held in memory, odds are read lazily from odds_file
+def stream_nba_analysis(team_stats, team_schedule, odds_file, as_of=None, skipped=None):
+    team_scores = score_teams(team_stats)
+    matchups = iter_scorable(iter_merge_data(team_stats, iter_records(odds_file), team_schedule), skipped)
+    for matchup_id, matchup in iter_penalties(matchups, as_of=as_of):
+        yield analyze_game(matchup, team_scores)
 
+# Function to run the streaming pipeline end to end and write results as JSON Lines
+def run_nba_stream(team_stats_file, schedule_file, odds_file, output_file, as_of=None):
     team_stats = file_opener(team_stats_file)
     team_schedule = file_opener(schedule_file)
-    team_odds = file_opener(odds_file)
-    #print("Sample odds data:", team_odds[0])
-
-    all_team_data = merge_data(team_stats, team_odds, team_schedule)
-
-    all_penalties(all_team_data)
-
-    results = sorted(run_analysis(all_team_data), key=lambda x: max(x['home_edge'], x['away_edge']), reverse=True)
-
-    for result in results:
-        print(f"{result['away_team']} @ {result['home_team']}:")
-        print(f"    Market assigned {result['home_team']} win probability: {result['home_market_chance']*100:.1f}%")
-        print(f"    Market assigned {result['away_team']} win probability: {result['away_market_chance']*100:.1f}%")
-        print(f"    Model est. {result['home_team']} win probability: {result['home_chance']}%")
-        print(f"    Model est. {result['away_team']} win probability: {result['away_chance']}%")
-        print(f"    {result['home_team']} edge: {result['home_edge']*100:.1f}%")
-        print(f"    {result['away_team']} edge: {result['away_edge']*100:.1f}%")
-        print(f"    Best Lines:")
-        print(f"        Home ML: {result['best_lines']['home_moneyline']['value']} ({result['best_lines']['home_moneyline']['book']})")
-        print(f"        Away ML: {result['best_lines']['away_moneyline']['value']} ({result['best_lines']['away_moneyline']['book']})")
-        print(f"        Home Spread: {result['best_lines']['home_spread']['value']} ({result['best_lines']['home_spread']['book']})")
-        print(f"        Away Spread: {result['best_lines']['away_spread']['value']} ({result['best_lines']['away_spread']['book']})")
-        print(f"        Over/Under: {result['best_lines']['over_under']['value']} ({result['best_lines']['over_under']['book']})")
-        print(f"-------------------------------------------------")
+    skipped = {}
+    results = stream_nba_analysis(team_stats, team_schedule, odds_file, as_of, skipped)
+    count = write_json_lines(results, output_file)
+    print(f"Wrote {count} matchups to {output_file}")
+    for matchup_id, teams in skipped.items():
+        print(f"Skipped {matchup_id}: missing team stats for {', '.join(teams)}")
+    return count
+
+
+# Function to analyze one slate from already-loaded data, returns results sorted by best edge
+# team_scores, schedule_indexes and a TeamCache can be passed in to reuse them across slates
+# A StageProfiler records the time spent in each stage; top/min_edge limit the results returned
+# lineup=True (or a prebuilt utils.lineup.LineupEngine) weighs injuries by the players ruled out
+# Matchups with a team missing stats are left out; skipped, when given, receives them (see iter_scorable)
+# simulate=True adds each result's Monte Carlo spread/total chances under 'simulation' (utils.simulation)
+def analyze_nba_slate(team_stats, team_schedule, team_odds, as_of=None, team_scores=None, schedule_indexes=None, cache=None,
+                      profiler=NULL_PROFILER, top=None, min_edge=None, lineup=None, skipped=None, simulate=False):
+    with profiler.stage('merge') as stage:
+        all_team_data = dict(iter_scorable(iter_merge_data(team_stats, team_odds, team_schedule), skipped))
+        stage.add(len(all_team_data))
+
+    if lineup is True:
+        with profiler.stage('lineup') as stage:
+            from utils.lineup import LineupEngine
+            lineup = LineupEngine(team_stats)
+            stage.add(len(team_stats))
+
+    with profiler.stage('penalties') as stage:
+        all_penalties(all_team_data, as_of=as_of, schedule_indexes=schedule_indexes, cache=cache, lineup=lineup or None)
+        stage.add(len(all_team_data))
+
+    # Score every team once instead of once per matchup (the cache scores lazily instead)
+    if not team_scores and cache is None:
+        with profiler.stage('scoring') as stage:
+            team_scores = score_teams(team_stats)
+            stage.add(len(team_scores))
+
+    with profiler.stage('best_lines') as stage:
+        best_lines = [find_best_lines(game) for game in all_team_data.values()]
+        stage.add(len(best_lines))
+
+    with profiler.stage('analyze') as stage:
+        results = run_analysis(all_team_data, team_scores, cache, best_lines)
+        stage.add(len(results))
+
+    # Simulated from the unrounded win probabilities, before sorting while results still line up with the games
+    if simulate:
+        with profiler.stage('simulate') as stage:
+            from utils.simulation import simulate_slate
+            win_probs = [game_win_probability(game, team_scores, cache) for game in all_team_data.values()]
+            for result, simulation in zip(results, simulate_slate(results, team_stats, win_probs=win_probs)):
+                result['simulation'] = simulation
+            stage.add(len(results))
+
+    # Best edge first; with top set only the K best are kept (bounded heap, no full sort)
+    with profiler.stage('sort') as stage:
+        results = select_results(results, top, min_edge)
+        stage.add(len(results))
+    return results
+
+
+# Function to score every team at once (utils.scoring), returns {team: score}
+def score_teams(team_stats):
+    from utils.scoring import nba_team_scores, scores_by_team
+    return scores_by_team(*nba_team_scores(team_stats))
+
+
+# Season hooks (utils.sports) for the offline tools: the stats file is already {team: stats}
+def team_data(stats):
+    return stats
+
+def feature_matrix(team_stats):
+    from utils.scoring import nba_feature_matrix
+    return nba_feature_matrix(team_stats)
+
+def score_weights():
+    from utils.scoring import NBA_DEFAULT_WEIGHTS
+    return dict(NBA_DEFAULT_WEIGHTS)
+
+
+# Sport plugin hooks (utils.sports): files holds the 'stats', 'schedule' and 'odds' filenames
+# With shared, the stats and schedule are loaded, scored and indexed once per file for every slate using them
+def load_slate(files, input_cache=None, shared=None):
+    from utils.sports import shared_value
+    team_stats = shared_value(shared, 'nba_stats', files['stats'], lambda: file_opener(files['stats'], input_cache))
+    slate = {
+        'team_stats': team_stats,
+        'team_schedule': shared_value(shared, 'nba_schedule', files['schedule'],
+                                      lambda: file_opener(files['schedule'], input_cache)),
+        'odds': file_opener(files['odds'], input_cache)
+    }
+    if shared is not None:
+        slate['team_scores'] = shared_value(shared, 'nba_scores', files['stats'], lambda: score_teams(team_stats))
+        # Filled lazily by all_penalties and reused by later slates
+        slate['schedule_indexes'] = shared_value(shared, 'nba_schedule_indexes', files['schedule'], dict)
+    return slate
+
+def analyze_slate(slate, as_of=None, profiler=NULL_PROFILER, top=None, min_edge=None, lineup=False, simulate=False):
+    skipped = {}
+    results = analyze_nba_slate(slate['team_stats'], slate['team_schedule'], slate['odds'], as_of,
+                                slate.get('team_scores'), slate.get('schedule_indexes'), profiler=profiler, top=top,
+                                min_edge=min_edge, lineup=lineup or None, skipped=skipped, simulate=simulate)
+    for matchup_id, teams in skipped.items():
+        print(f"Skipped {matchup_id}: missing team stats for {', '.join(teams)}")
+    return results
+
+
+# Filenames left as None are asked for interactively
+# writers (utils.writers) default to the terminal view
+def run_nba_analysis(team_stats_file=None, schedule_file=None, odds_file=None, as_of=None, input_cache=None,
+                     profiler=NULL_PROFILER, writers=None, top=None, min_edge=None, lineup=False, simulate=False):
+    from utils.sports import get_sport
+    files = {'stats': team_stats_file, 'schedule': schedule_file, 'odds': odds_file}
+    return get_sport('NBA').run(files, as_of, input_cache, profiler, writers, top, min_edge, lineup=lineup,
+                                simulate=simulate)
+
 
 if __name__ == '__main__':
-    run_nba_analysis()
\ No newline at end of file
+    run_nba_analysis()
@@ -1,94 +1,66 @@
-import json
-import requests 
 from utils.helpers import (
     normalize,
-    implied_probability,
-    moneyline_to_decimal,
     win_probability,
     find_best_lines,
-    calculate_edge,
-    normalize_team_score
+    normalize_team_score,
+    parse_record,
+    game_result,
+    file_opener,
+    list_to_dict
 )
+from utils.streaming import iter_records, write_json_lines
+from utils.profiling import NULL_PROFILER
+from utils.writers import select_results
 
-def file_opener(file_name):
-    try:
-        with open(file_name) as file:
-            data = json.load(file)
-            return data
-    except FileNotFoundError:
-        print("FILE NOT FOUND")
-        return []
-
-def list_to_dict(list_of_dicts, key_name):
-    team_dict = {}
-    for dictionary in list_of_dicts:
-        key = dictionary[key_name]
-        team_dict[key] = dictionary
-    return team_dict
+# utils.scoring (NumPy) is imported where teams are scored, so importing this module stays cheap
 
-def merge_stats_and_odds(odds_data, team_dict):
+# Function to merge stats into odds one game at a time (odds can be any iterable/generator)
+def iter_merge_stats_and_odds(odds_data, team_dict):
     #merge team stats to odds by matching home and away to team in stats
-    teams_stats_odds = []
     for game in odds_data:
         home = game.get('home_team')
         away = game.get('away_team')
         home_stats = team_dict.get(home, {})
         away_stats = team_dict.get(away, {})
-        teams_stats_odds.append({
+        yield {
             'home_team': home,
             'away_team': away,
             'home_stats': home_stats,
             'away_stats': away_stats,
             'odds': game.get('odds')
-        })
-    return teams_stats_odds
-
-def parse_record(record_str):
-    try:
-        wins, losses = map(int, record_str.split('-'))
-        return wins / (wins + losses) if (wins + losses) > 0 else 0
-    except:
-        return 0
+        }
 
+def merge_stats_and_odds(odds_data, team_dict):
+    return list(iter_merge_stats_and_odds(odds_data, team_dict))
 
-def analyze_game(game, teams_stats_odds):
+# best_lines can be passed in when find_best_lines already ran for the game
+def analyze_game(game, teams_stats_odds, team_scores=None, cache=None, best_lines=None):
     home_stats = game['home_stats']
     away_stats = game['away_stats']
     
-    best_lines = find_best_lines(game)
-
-    home_moneyline = best_lines['home_moneyline']['value']
-    away_moneyline = best_lines['away_moneyline']['value']
-
-    home_decimal = moneyline_to_decimal(home_moneyline)
-    away_decimal = moneyline_to_decimal(away_moneyline)
-
-    home_score = compute_team_score(home_stats)
-    away_score = compute_team_score(away_stats)
-
-    home_market_prob = implied_probability(home_decimal)
-    away_market_prob = implied_probability(away_decimal)
+    if best_lines is None:
+        best_lines = find_best_lines(game)
+
+    # Use batch-computed scores when given, fall back to scoring the dict
+    if team_scores and game['home_team'] in team_scores:
+        home_score = team_scores[game['home_team']]
+    elif cache is not None:
+        home_score = cache.get_or_compute('score', game['home_team'],
+                                          lambda: compute_team_score(home_stats), uses_schedule=False)
+    else:
+        home_score = compute_team_score(home_stats)
+    if team_scores and game['away_team'] in team_scores:
+        away_score = team_scores[game['away_team']]
+    elif cache is not None:
+        away_score = cache.get_or_compute('score', game['away_team'],
+                                          lambda: compute_team_score(away_stats), uses_schedule=False)
+    else:
+        away_score = compute_team_score(away_stats)
 
     home_est_prob = win_probability(home_score, away_score)
     away_est_prob = win_probability(away_score, home_score)
 
-    home_edge = calculate_edge(home_est_prob, home_market_prob)
-    away_edge = calculate_edge(away_est_prob, away_market_prob)
-
-    home_chance = round(home_est_prob * 100, 1)
-    away_chance = round(away_est_prob * 100, 1)
-
-    return {
-        'home_team': game['home_team'],
-        'away_team': game['away_team'],
-        'home_chance': home_chance,
-        'away_chance': away_chance,
-        'home_edge': home_edge,
-        'away_edge': away_edge,
-        'best_lines': best_lines,
-        'home_market_chance': home_market_prob,
-        'away_market_chance': away_market_prob
-    }
+    return game_result(game, best_lines, home_est_prob, away_est_prob)
 
 def compute_team_score(stats, weights=None):
     weights = weights or {
@@ -114,36 +86,98 @@ def compute_team_score(stats, weights=None):
 
     return max(0, min(score, 1))
 
-def run_analysis(teams_stats_odds):
-    return [analyze_game(game, teams_stats_odds) for game in teams_stats_odds]
-
-
-def run_nfl_analysis():
-    odds_file = "nfl_odds.json"
-    stats_file = "nfl_stats.json"
-
-    odds_data = file_opener(odds_file)
-    team_data = file_opener(stats_file)
-    team_dict = list_to_dict(team_data, 'team')
-    teams_stats_odds = merge_stats_and_odds(odds_data, team_dict)
-
-    results = sorted(run_analysis(teams_stats_odds), key=lambda x: max(x['home_edge'], x['away_edge']), reverse=True)
-
-    for result in results:
-        print(f"{result['away_team']} @ {result['home_team']}:")
-        print(f"    Market assigned {result['home_team']} win probability: {result['home_market_chance']*100:.1f}%")
-        print(f"    Market assigned {result['away_team']} win probability: {result['away_market_chance']*100:.1f}%")
-        print(f"    Model est. {result['home_team']} win probability: {result['home_chance']}%")
-        print(f"    Model est. {result['away_team']} win probability: {result['away_chance']}%")
-        print(f"    {result['home_team']} edge: {result['home_edge']*100:.1f}%")
-        print(f"    {result['away_team']} edge: {result['away_edge']*100:.1f}%")
-        print(f"    Best Lines:")
-        print(f"        Home ML: {result['best_lines']['home_moneyline']['value']} ({result['best_lines']['home_moneyline']['book']})")
-        print(f"        Away ML: {result['best_lines']['away_moneyline']['value']} ({result['best_lines']['away_moneyline']['book']})")
-        print(f"        Home Spread: {result['best_lines']['home_spread']['value']} ({result['best_lines']['home_spread']['book']})")
-        print(f"        Away Spread: {result['best_lines']['away_spread']['value']} ({result['best_lines']['away_spread']['book']})")
-        print(f"        Over/Under: {result['best_lines']['over_under']['value']} ({result['best_lines']['over_under']['book']})")
-        print(f"-------------------------------------------------")
+def run_analysis(teams_stats_odds, team_scores=None, cache=None, best_lines=None):
+    if best_lines is not None:
+        return [analyze_game(game, teams_stats_odds, team_scores, cache, lines)
+                for game, lines in zip(teams_stats_odds, best_lines)]
+    return [analyze_game(game, teams_stats_odds, team_scores, cache) for game in teams_stats_odds]
+
+# Function to stream results one game at a time: merge -> analyze_game
+# Only the team dict is held in memory, odds are read lazily from odds_file
+def stream_nfl_analysis(team_dict, odds_file):
+    team_scores = score_teams(team_dict)
+    for game in iter_merge_stats_and_odds(iter_records(odds_file), team_dict):
+        yield analyze_game(game, None, team_scores)
+
+# Function to run the streaming pipeline end to end and write results as JSON Lines
+def run_nfl_stream(odds_file, stats_file, output_file):
+    team_dict = list_to_dict(file_opener(stats_file), 'team')
+    count = write_json_lines(stream_nfl_analysis(team_dict, odds_file), output_file)
+    print(f"Wrote {count} games to {output_file}")
+    return count
+
+
+# Function to analyze one slate from already-loaded data, returns results sorted by best edge
+# A StageProfiler records the time spent in each stage; top/min_edge limit the results returned
+def analyze_nfl_slate(team_dict, odds_data, team_scores=None, cache=None, profiler=NULL_PROFILER, top=None, min_edge=None):
+    with profiler.stage('merge') as stage:
+        teams_stats_odds = merge_stats_and_odds(odds_data, team_dict)
+        stage.add(len(teams_stats_odds))
+
+    # Score every team once instead of once per matchup (the cache scores lazily instead)
+    if not team_scores and cache is None:
+        with profiler.stage('scoring') as stage:
+            team_scores = score_teams(team_dict)
+            stage.add(len(team_scores))
+
+    with profiler.stage('best_lines') as stage:
+        best_lines = [find_best_lines(game) for game in teams_stats_odds]
+        stage.add(len(best_lines))
+
+    with profiler.stage('analyze') as stage:
+        results = run_analysis(teams_stats_odds, team_scores, cache, best_lines)
+        stage.add(len(results))
+
+    # Best edge first; with top set only the K best are kept (bounded heap, no full sort)
+    with profiler.stage('sort') as stage:
+        results = select_results(results, top, min_edge)
+        stage.add(len(results))
+    return results
+
+
+# Function to score every team at once (utils.scoring), returns {team: score}
+def score_teams(team_dict):
+    from utils.scoring import nfl_team_scores, scores_by_team
+    return scores_by_team(*nfl_team_scores(team_dict))
+
+
+# Season hooks (utils.sports) for the offline tools: the stats file is a list of team rows
+def team_data(stats):
+    return list_to_dict(stats, 'team') if isinstance(stats, list) else stats
+
+def feature_matrix(team_dict):
+    from utils.scoring import nfl_feature_matrix
+    return nfl_feature_matrix(team_dict)
+
+def score_weights():
+    from utils.scoring import NFL_DEFAULT_WEIGHTS
+    return dict(NFL_DEFAULT_WEIGHTS)
+
+
+# Sport plugin hooks (utils.sports): files holds the 'odds' and 'stats' filenames
+# With shared, the stats file is loaded and scored once for every slate using it
+def load_slate(files, input_cache=None, shared=None):
+    from utils.sports import shared_value
+    odds_data = file_opener(files['odds'], input_cache)
+    team_dict = shared_value(shared, 'nfl_stats', files['stats'],
+                             lambda: team_data(file_opener(files['stats'], input_cache)))
+    slate = {'team_dict': team_dict, 'odds': odds_data}
+    if shared is not None:
+        slate['team_scores'] = shared_value(shared, 'nfl_scores', files['stats'], lambda: score_teams(team_dict))
+    return slate
+
+def analyze_slate(slate, as_of=None, profiler=NULL_PROFILER, top=None, min_edge=None):
+    return analyze_nfl_slate(slate['team_dict'], slate['odds'], slate.get('team_scores'), profiler=profiler, top=top,
+                             min_edge=min_edge)
+
+
+# writers (utils.writers) default to the terminal view
+def run_nfl_analysis(odds_file="nfl_odds.json", stats_file="nfl_stats.json", input_cache=None, profiler=NULL_PROFILER,
+                     writers=None, top=None, min_edge=None):
+    from utils.sports import get_sport
+    files = {'odds': odds_file, 'stats': stats_file}
+    return get_sport('NFL').run(files, None, input_cache, profiler, writers, top, min_edge)
+
 
 if __name__ == "__main__":
-    run_nfl_analysis()
\ No newline at end of file
+    run_nfl_analysis()
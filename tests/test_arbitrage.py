@@ -0,0 +1,42 @@
+from utils.arbitrage import ArbitrageScanner, scan_slate
+
+
+def _game(books):
+    return {'home_team': 'Home', 'away_team': 'Away', 'odds': {
+        book: {'home_moneyline': -110, 'away_moneyline': -110, 'home_spread': home, 'away_spread': -home,
+               'over_under': 220.5}
+        for book, home in books.items()
+    }}
+
+
+def test_spread_middle_underdog_home():
+    # Home +5.5 at BookA and away -4.5 at BookB both win when the away team wins by 5
+    middles = scan_slate([_game({'BookA': 5.5, 'BookB': 4.5})], kind='middle')
+    assert len(middles) == 1
+    middle = middles[0]
+    assert middle['market'] == 'spread'
+    assert middle['middle_outcomes'] == 1
+    assert [(leg['side'], leg['book'], leg['line']) for leg in middle['legs']] == [
+        ('home', 'BookA', 5.5), ('away', 'BookB', -4.5)]
+
+
+def test_spread_middle_favorite_home():
+    # Home -2.5 at BookB and away +3.5 at BookA both win when the home team wins by 3
+    middles = scan_slate([_game({'BookA': -3.5, 'BookB': -2.5})], kind='middle')
+    assert len(middles) == 1
+    assert middles[0]['middle_outcomes'] == 1
+    assert [(leg['side'], leg['book'], leg['line']) for leg in middles[0]['legs']] == [
+        ('home', 'BookB', -2.5), ('away', 'BookA', 3.5)]
+
+
+def test_no_spread_middle_for_same_lines():
+    assert scan_slate([_game({'BookA': -3.5, 'BookB': -3.5})], kind='middle') == []
+
+
+def test_update_opens_spread_middle():
+    scanner = ArbitrageScanner([_game({'BookA': -3.5, 'BookB': -3.5})])
+    found = scanner.update_book('Home_vs_Away', 'BookB', {'home_moneyline': -110, 'away_moneyline': -110,
+                                                          'home_spread': -2.5, 'away_spread': 2.5,
+                                                          'over_under': 220.5})
+    assert [item['market'] for item in found] == ['spread']
+    assert scanner.top_quotes('Home_vs_Away', 'away_spread') == [(3.5, 'BookA'), (2.5, 'BookB')]
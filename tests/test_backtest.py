@@ -0,0 +1,56 @@
+import json
+
+import numpy as np
+
+from backtest import evaluate_season, load_season, round_probabilities
+from utils.helpers import win_probability
+
+with open('nba_team_stats.json', 'r') as file:
+    TEAM_STATS = json.load(file)
+
+
+def _season(injuries=None, home='Pacers', away='Thunder', current_injuries=('Somebody',)):
+    odds = {'BookA': {'home_moneyline': -120, 'away_moneyline': 100, 'home_spread': -2.5, 'away_spread': 2.5,
+                      'over_under': 225.5}}
+    season = {
+        'sport': 'NBA',
+        'stats': {team: dict(data, injuries=list(current_injuries)) for team, data in TEAM_STATS.items()},
+        'schedule': {
+            home: [{'date': '2025-01-10', 'opponent': away, 'home_or_away': 'home', 'result': 'W'}],
+            away: [{'date': '2025-01-10', 'opponent': home, 'home_or_away': 'away', 'result': 'L'}]
+        },
+        'snapshots': [{'timestamp': '2025-01-10T10:00:00', 'game_date': '2025-01-10',
+                       'home_team': home, 'away_team': away, 'odds': odds}],
+        'results': [{'game_date': '2025-01-10', 'home_team': home, 'away_team': away, 'winner': home}]
+    }
+    if injuries is not None:
+        season['injuries'] = injuries
+    return load_season(season)
+
+
+def test_current_injury_list_is_not_used_for_past_games():
+    # Every team lists an injury in the stats file; without dated reports the game has no injury penalty
+    no_reports = evaluate_season(_season())['model_prob'][0]
+    healthy = evaluate_season(_season(current_injuries=()))['model_prob'][0]
+    assert no_reports.tolist() == healthy.tolist()
+    later_report = evaluate_season(_season({'Pacers': [{'date': '2025-02-01', 'injuries': ['A', 'B', 'C']}]}))
+    assert later_report['model_prob'][0].tolist() == no_reports.tolist()
+
+
+def test_dated_injury_report_applies_from_its_date():
+    no_reports = evaluate_season(_season())['model_prob'][0]
+    earlier_report = evaluate_season(_season({'Pacers': [{'date': '2025-01-01', 'injuries': ['A', 'B', 'C']}]}))
+    assert earlier_report['model_prob'][0, 0] < no_reports[0]
+
+
+def test_games_with_unknown_teams_are_skipped():
+    evaluated = evaluate_season(_season(home='Nowhere'))
+    assert evaluated['skipped'] == 1
+    assert len(evaluated['home_won']) == 0
+
+
+def test_probabilities_round_like_the_analyzers():
+    home = np.array([0.5733, 0.5151, 0.3166])
+    away = np.array([0.4667, 0.6849, 0.4834])
+    expected = [win_probability(h, a) for h, a in zip(home.tolist(), away.tolist())]
+    assert round_probabilities(home / (home + away)).tolist() == expected
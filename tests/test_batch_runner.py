@@ -0,0 +1,61 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from batch_runner import load_manifest, output_path, run_batch, run_manifest
+from utils.sports import get_sport
+
+NBA = {'sport': 'nba', 'stats': 'nba_team_stats.json', 'schedule': 'nba_schedule_data.json',
+       'odds': 'nba_betting_odds.json', 'as_of': '2025-06-24'}
+NFL = {'sport': 'NFL', 'stats': 'nfl_stats.json', 'odds': 'nfl_odds.json'}
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    for name in ('nba_team_stats.json', 'nba_schedule_data.json', 'nba_betting_odds.json',
+                 'nfl_stats.json', 'nfl_odds.json'):
+        shutil.copy(name, tmp_path / name)
+    path = tmp_path / 'manifest.json'
+    path.write_text(json.dumps({'slates': [NBA, NFL, dict(NBA, lineup=True, output='lineup.json')]}))
+    return str(path)
+
+
+def _expected(slate):
+    plugin = get_sport(slate['sport'])
+    files = {name: slate[name] for name, _, _ in plugin.inputs}
+    options = {'lineup': True} if slate.get('lineup') else {}
+    return json.dumps(plugin.run(files, slate.get('as_of'), writers=[], **options), indent=4)
+
+
+def test_manifest_paths_are_relative_to_the_manifest(manifest):
+    slates = load_manifest(manifest)
+    base_dir = os.path.dirname(manifest)
+    assert slates[0]['sport'] == 'NBA'
+    assert slates[0]['schedule'] == os.path.join(base_dir, 'nba_schedule_data.json')
+    assert output_path(slates[1], 1, 'out') == os.path.join('out', '0001_nfl_results.json')
+    assert output_path(slates[2], 2, 'out') == os.path.join('out', 'lineup.json')
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_batch_outputs_match_single_runs(manifest, tmp_path, workers):
+    output_dir = str(tmp_path / f'results_{workers}')
+    summaries = run_manifest(manifest, workers, output_dir)
+    assert [summary.get('error') for summary in summaries] == [None, None, None]
+    for slate, summary in zip(load_manifest(manifest), summaries):
+        with open(summary['output'], 'r') as file:
+            assert file.read() == _expected(slate)
+
+
+def test_failed_slates_are_reported_without_output(manifest, tmp_path):
+    slates = load_manifest(manifest)
+    broken = [dict(slates[0], odds=str(tmp_path / 'missing.json')), {'sport': 'MLB'},
+              dict(slates[1], lineup=True), dict(slates[0], schedule=None)]
+    summaries = run_batch(broken, 1, str(tmp_path / 'broken'))
+    assert [summary['output'] for summary in summaries] == [None] * 4
+    assert 'FileNotFoundError' in summaries[0]['error']
+    assert 'not yet supported' in summaries[1]['error']
+    assert 'does not support: lineup' in summaries[2]['error']
+    assert 'missing schedule' in summaries[3]['error']
+    assert os.listdir(tmp_path / 'broken') == []
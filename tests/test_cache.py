@@ -0,0 +1,86 @@
+import copy
+import json
+
+from nba_analyzer import FATIGUE_WEIGHTS, INJURY_WEIGHTS, analyze_nba_slate, apply_penalties
+from utils.cache import TeamCache
+from utils.lineup import LineupEngine
+
+AS_OF = '2025-06-24'
+
+
+def _load(name):
+    with open(name, 'r') as file:
+        return json.load(file)
+
+
+def test_inputs_change_is_a_miss():
+    cache = TeamCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_compute('penalties', 'Pacers', compute, AS_OF, inputs=[]) == 1
+    assert cache.get_or_compute('penalties', 'Pacers', compute, AS_OF, inputs=[]) == 1
+    assert cache.get_or_compute('penalties', 'Pacers', compute, AS_OF, inputs=['Player']) == 2
+    assert cache.get_or_compute('penalties', 'Pacers', compute, AS_OF, inputs=['Player']) == 2
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_update_stats_and_schedule_invalidate_only_that_team():
+    cache = TeamCache()
+    count = iter(range(100))
+    score = cache.get_or_compute('score', 'Pacers', lambda: next(count), uses_schedule=False)
+    penalty = cache.get_or_compute('penalties', 'Pacers', lambda: next(count), AS_OF)
+    other = cache.get_or_compute('penalties', 'Thunder', lambda: next(count), AS_OF)
+
+    cache.update_schedule('Pacers')
+    assert cache.get_or_compute('score', 'Pacers', lambda: next(count), uses_schedule=False) == score
+    assert cache.get_or_compute('penalties', 'Pacers', lambda: next(count), AS_OF) != penalty
+    cache.update_stats('Pacers')
+    assert cache.get_or_compute('score', 'Pacers', lambda: next(count), uses_schedule=False) != score
+    assert cache.get_or_compute('penalties', 'Thunder', lambda: next(count), AS_OF) == other
+
+
+def test_shared_cache_sees_injury_changes():
+    team_stats = _load('nba_team_stats.json')
+    team_schedule = _load('nba_schedule_data.json')
+    team_odds = _load('nba_betting_odds.json')
+    cache = TeamCache()
+    first = analyze_nba_slate(team_stats, team_schedule, team_odds, AS_OF, cache=cache)
+
+    # Injuries changed in place, without update_stats
+    injured = copy.deepcopy(team_stats)
+    injured['Pacers']['injuries'] = [player['name'] for player in injured['Pacers']['players'][:3]]
+    expected = analyze_nba_slate(injured, team_schedule, team_odds, AS_OF)
+    assert expected != first
+    assert analyze_nba_slate(injured, team_schedule, team_odds, AS_OF, cache=cache) == expected
+
+
+def test_shared_cache_sees_lineup_changes():
+    team_stats = _load('nba_team_stats.json')
+    team_schedule = _load('nba_schedule_data.json')
+    team_odds = _load('nba_betting_odds.json')
+    cache = TeamCache()
+    first = analyze_nba_slate(team_stats, team_schedule, team_odds, AS_OF, cache=cache, lineup=True)
+
+    injured = copy.deepcopy(team_stats)
+    injured['Pacers']['injuries'] = [player['name'] for player in injured['Pacers']['players']]
+    expected = analyze_nba_slate(injured, team_schedule, team_odds, AS_OF, lineup=True)
+    assert expected != first
+    assert analyze_nba_slate(injured, team_schedule, team_odds, AS_OF, cache=cache, lineup=True) == expected
+
+
+def test_lineup_engine_state_is_part_of_the_key():
+    team_stats = _load('nba_team_stats.json')
+    team_schedule = _load('nba_schedule_data.json')
+    engine = LineupEngine(team_stats)
+    cache = TeamCache()
+    matchup = {'home_team': 'Pacers', 'away_team': 'Thunder',
+               'home_schedule': team_schedule['Pacers'], 'away_schedule': team_schedule['Thunder']}
+    before = apply_penalties(dict(matchup), FATIGUE_WEIGHTS, INJURY_WEIGHTS, AS_OF, cache=cache, lineup=engine)['home_penalties']
+    # The engine hears about injuries the matchup's injury list doesn't carry
+    engine.set_injuries('Pacers', [player['name'] for player in team_stats['Pacers']['players']])
+    after = apply_penalties(dict(matchup), FATIGUE_WEIGHTS, INJURY_WEIGHTS, AS_OF, cache=cache, lineup=engine)['home_penalties']
+    assert after['injuries'] == engine.penalty('Pacers') > before['injuries']
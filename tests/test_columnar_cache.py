@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+from utils.columnar_cache import ColumnarCache
+
+ROUND_TRIPS = [
+    [{'a.b': 1, 'a': {'b': 2}}],
+    {'team.one': {'x/y': 1, 'x': {'y': 2}}, 'team': {'one': {'x/y': 3, 'x': {'y': 4}}}},
+    [{'__key__': 'field', 'rows': {'k': {'__key__': 1, 'v': 2}}}],
+    [{'a\\.b': 1, 'a\\': {'b': 2}, 'a.b': 3, '50%': None}],
+]
+
+
+@pytest.mark.parametrize('data', ROUND_TRIPS)
+def test_round_trip_keeps_dotted_and_nested_keys_apart(tmp_path, data):
+    path = tmp_path / 'input.json'
+    path.write_text(json.dumps(data))
+    cache = ColumnarCache(str(tmp_path / 'cache'))
+    cache.open(str(path))
+    assert cache.open(str(path)).to_python() == data
+
+
+def test_stat_columns_keep_their_names(tmp_path):
+    with open('nba_team_stats.json', 'r') as file:
+        team_stats = json.load(file)
+    path = tmp_path / 'stats.json'
+    path.write_text(json.dumps(team_stats))
+    columnar = ColumnarCache(str(tmp_path / 'cache')).open(str(path))
+    expected = [[data['team_stats']['Ortg'], data['team_stats']['TS%']] for data in team_stats.values()]
+    assert columnar.matrix('root/data', ['team_stats.Ortg', 'team_stats.TS%']).tolist() == expected
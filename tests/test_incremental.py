@@ -0,0 +1,59 @@
+import copy
+
+import pytest
+
+from incremental import IncrementalSlate
+from nba_analyzer import analyze_nba_slate, file_opener
+
+AS_OF = '2025-06-24'
+TEAM_STATS = file_opener('nba_team_stats.json')
+TEAM_SCHEDULE = file_opener('nba_schedule_data.json')
+TEAM_ODDS = file_opener('nba_betting_odds.json')
+
+
+# Function to re-run the full slate from the incremental slate's current inputs
+def _full(slate, lineup=False):
+    odds = [{'home_team': m['home_team'], 'away_team': m['away_team'], 'odds': m['odds']}
+            for m in slate.matchups.values()]
+    return analyze_nba_slate(slate.team_stats, slate.team_schedule, odds, AS_OF, lineup=lineup)
+
+
+@pytest.mark.parametrize('lineup', [False, True])
+def test_updates_match_a_full_recompute(lineup):
+    inputs = copy.deepcopy((TEAM_STATS, TEAM_SCHEDULE, TEAM_ODDS))
+    slate = IncrementalSlate(TEAM_STATS, TEAM_SCHEDULE, TEAM_ODDS, AS_OF, lineup=lineup)
+    assert slate.ranked() == _full(slate, lineup)
+
+    matchup_id = next(iter(slate.matchups))
+    slate.update_odds(matchup_id, 'FanDuel', {'home_moneyline': 320, 'away_moneyline': -400})
+    assert slate.ranked() == _full(slate, lineup)
+    slate.remove_book(matchup_id, 'BetMGM')
+    assert slate.ranked() == _full(slate, lineup)
+
+    slate.update_injuries('Pacers', ['Tyrese Haliburton', 'Myles Turner'])
+    assert slate.ranked() == _full(slate, lineup)
+    slate.update_injuries('Pacers', [])
+    assert slate.ranked() == _full(slate, lineup)
+
+    slate.update_team_stats('Knicks', dict(TEAM_STATS['Knicks']['team_stats'], Ortg=125.0))
+    assert slate.ranked() == _full(slate, lineup)
+
+    schedule = [dict(game) for game in TEAM_SCHEDULE['Thunder']]
+    for game in schedule:
+        game['home_or_away'] = 'away'
+    slate.update_schedule('Thunder', schedule)
+    assert slate.ranked() == _full(slate, lineup)
+
+    assert slate.ranked(top=1) == slate.ranked()[:1]
+    assert slate.updates == 6
+    # The caller's inputs are never written to
+    assert (TEAM_STATS, TEAM_SCHEDULE, TEAM_ODDS) == inputs
+
+
+def test_re_adding_a_matchup_replaces_it():
+    slate = IncrementalSlate(TEAM_STATS, TEAM_SCHEDULE, TEAM_ODDS, AS_OF)
+    game = dict(TEAM_ODDS[0], odds={'FanDuel': dict(TEAM_ODDS[0]['odds']['FanDuel'], home_moneyline=500)})
+    matchup_id = slate.add_matchup(game)
+    assert len(slate.ranked()) == len(TEAM_ODDS)
+    assert slate.results[matchup_id]['best_lines']['home_moneyline']['value'] == 500
+    assert slate.ranked() == _full(slate)
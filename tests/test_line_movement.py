@@ -0,0 +1,37 @@
+from utils.line_movement import LineMovementStore
+
+DAY = 86400.0
+
+
+def test_ticks_months_apart():
+    store = LineMovementStore()
+    store.record('Home_vs_Away', 'BookA', 'home_spread', -3.5, 0.0)
+    store.record('Home_vs_Away', 'BookA', 'home_spread', -4.5, 60 * DAY)
+    store.record('Home_vs_Away', 'BookB', 'home_spread', -4.0, 60 * DAY + 5)
+    assert store.range('Home_vs_Away', 'home_spread') == [
+        (0.0, 'BookA', -3.5), (60 * DAY, 'BookA', -4.5), (60 * DAY + 5, 'BookB', -4.0)]
+    assert store.as_of('Home_vs_Away', 30 * DAY)['odds'] == {'BookA': {'home_spread': -3.5}}
+    assert store.as_of('Home_vs_Away', 61 * DAY)['odds'] == {'BookA': {'home_spread': -4.5},
+                                                            'BookB': {'home_spread': -4.0}}
+
+
+def test_ring_buffer_with_gaps_matches_raw_ticks():
+    store = LineMovementStore(max_ticks=100)
+    ticks = []
+    timestamp = 0.0
+    for index in range(1000):
+        # Every 97th tick comes after a gap longer than a time delta can hold
+        timestamp += 70 * DAY if index % 97 == 0 else 10
+        value = 220.5 + (index % 7) - 3
+        store.record('Home_vs_Away', f"Book{index % 3}", 'over_under', value, timestamp)
+        ticks.append((timestamp, f"Book{index % 3}", value))
+    series = store.series('Home_vs_Away', 'over_under')
+    assert 100 <= len(series) < 100 + 64
+    assert store.range('Home_vs_Away', 'over_under') == ticks[-len(series):]
+    for at_index in (-len(series), -50, -1):
+        at = ticks[at_index][0]
+        expected = {}
+        for tick_time, book, value in ticks:
+            if tick_time <= at:
+                expected[book] = value
+        assert {book: lines['over_under'] for book, lines in store.as_of('Home_vs_Away', at)['odds'].items()} == expected
@@ -0,0 +1,72 @@
+import pytest
+
+from utils.lineup import LINEUP_WEIGHTS, LineupEngine
+
+
+def _team(players, injuries=()):
+    return {
+        'team_stats': {'Ortg': 115.0, 'Drtg': 110.0},
+        'players': [{'name': name, 'MPG': mpg, 'Ortg': ortg, 'Drtg': drtg} for name, mpg, ortg, drtg in players],
+        'injuries': list(injuries)
+    }
+
+
+ROSTER = [('Star', 36, 120, 108), ('Bench', 24, 110, 112)]
+# Minutes share x (replacement 105/115 - player rating)
+STAR = (0.15 * (105 - 120), 0.15 * (115 - 108))
+BENCH = (0.1 * (105 - 110), 0.1 * (115 - 112))
+
+
+def _engine():
+    return LineupEngine({'Pacers': _team(ROSTER, ['Star']), 'Thunder': _team(ROSTER)})
+
+
+def test_impacts_and_initial_injuries():
+    engine = _engine()
+    assert engine.impacts['Pacers']['Star'] == pytest.approx(STAR)
+    assert engine.impacts['Pacers']['Bench'] == pytest.approx(BENCH)
+    assert engine.adjustments('Pacers') == pytest.approx(STAR)
+    assert engine.adjustments('Thunder') == (0.0, 0.0)
+    assert engine.ratings_for('Pacers') == pytest.approx((115 + STAR[0], 110 + STAR[1]))
+
+
+def test_set_injuries_adds_returns_and_reports_unknown_names():
+    engine = _engine()
+    assert engine.set_injuries('Pacers', ['Star', {'name': 'Bench'}])
+    assert engine.adjustments('Pacers') == pytest.approx((STAR[0] + BENCH[0], STAR[1] + BENCH[1]))
+
+    # An unknown name changes nothing but is reported
+    assert not engine.set_injuries('Pacers', ['Star', 'Bench', 'Ghost'])
+    assert engine.unknown_injuries('Pacers') == ['Ghost']
+
+    # The star returns
+    assert engine.set_injuries('Pacers', ['Bench'])
+    assert engine.adjustments('Pacers') == pytest.approx(BENCH)
+    assert engine.adjustments('Pacers') == pytest.approx(engine.recompute('Pacers'))
+    assert engine.unknown_injuries('Pacers') == []
+
+    assert engine.set_injuries('Pacers', [])
+    assert engine.adjustments('Pacers') == (0.0, 0.0)
+    assert not engine.set_injuries('Knicks', ['Star'])
+
+
+def test_update_team_only_touches_that_team():
+    engine = _engine()
+    engine.update_team('Pacers', _team([('Rookie', 12, 100, 118)], ['Rookie']))
+    assert set(engine.impacts['Pacers']) == {'Rookie'}
+    assert engine.adjustments('Pacers') == pytest.approx((0.05 * 5, 0.05 * -3))
+    assert engine.impacts['Thunder']['Star'] == pytest.approx(STAR)
+
+
+def test_penalty_is_capped_and_never_negative():
+    engine = _engine()
+    assert engine.penalty('Pacers') == pytest.approx((STAR[1] - STAR[0]) * LINEUP_WEIGHTS['net_rating'])
+    assert engine.penalty('Thunder') == 0.0
+
+    # Losing a below-replacement player is no penalty
+    engine.update_team('Pacers', _team([('Rookie', 12, 100, 118)], ['Rookie']))
+    assert engine.penalty('Pacers') == 0.0
+
+    # A superstar's absence would be worth more than the cap
+    engine.update_team('Pacers', _team([('MVP', 48, 140, 95)], ['MVP']))
+    assert engine.penalty('Pacers') == LINEUP_WEIGHTS['max']
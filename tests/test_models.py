@@ -0,0 +1,49 @@
+import json
+
+from utils.helpers import find_best_lines
+from utils.models import NameTable, analyze_matchup, best_quotes, matchups_from_dicts, results_from_dicts
+
+with open('nba_betting_odds.json') as f:
+    ODDS = json.load(f)
+
+
+def _games():
+    games = json.loads(json.dumps(ODDS))
+    # One book quotes only the moneylines
+    games[0]['odds']['Partial'] = {'home_moneyline': 500, 'away_moneyline': -700}
+    return games
+
+
+def test_matchups_round_trip():
+    games = _games()
+    matchups, teams, books = matchups_from_dicts(games)
+    assert [matchup.to_dict(teams, books) for matchup in matchups] == [
+        {'home_team': game['home_team'], 'away_team': game['away_team'], 'odds': game['odds']} for game in games]
+    partial = matchups[0].quotes[-1]
+    assert books.name(partial.book_id) == 'Partial'
+    assert partial.home_spread is None and partial.over_under is None
+
+
+def test_best_quotes_skip_missing_lines_like_find_best_lines():
+    games = _games()
+    matchups, teams, books = matchups_from_dicts(games)
+    for game, matchup in zip(games, matchups):
+        best_books, best_values = best_quotes(matchup.quotes)
+        got = {line_type: {'book': books.name(book_id), 'value': value}
+               for line_type, book_id, value in zip(find_best_lines(game), best_books, best_values)}
+        assert got == find_best_lines(game)
+    assert find_best_lines(games[0])['home_moneyline']['book'] == 'Partial'
+
+
+def test_best_quotes_with_no_quote_for_a_line():
+    matchups, _, _ = matchups_from_dicts([{'home_team': 'A', 'away_team': 'B',
+                                           'odds': {'Book': {'home_moneyline': -120, 'away_moneyline': 100}}}])
+    assert best_quotes(matchups[0].quotes) == ((0, 0, None, None, None), (-120, 100, None, None, None))
+    assert best_quotes(()) == ((None,) * 5, (None,) * 5)
+
+
+def test_results_round_trip():
+    matchups, teams, books = matchups_from_dicts(_games())
+    results = [analyze_matchup(matchup, 0.6, 0.5).to_dict(teams, books) for matchup in matchups]
+    converted, result_teams, result_books = results_from_dicts(results, NameTable(), NameTable())
+    assert [result.to_dict(result_teams, result_books) for result in converted] == results
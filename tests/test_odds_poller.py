@@ -0,0 +1,25 @@
+from utils.helpers import find_best_lines
+from utils.odds_poller import OddsPoller, merge_book_payloads, parse_book_payload
+from utils.odds_stub_server import StubOddsServer
+
+
+def test_missing_line_types_are_left_out():
+    [(home, away, lines)] = parse_book_payload({'home_team': 'A', 'away_team': 'B', 'over_under': 220.5})
+    assert (home, away, lines) == ('A', 'B', {'over_under': 220.5})
+
+    games = merge_book_payloads([
+        ('BookA', [{'home_team': 'A', 'away_team': 'B', 'home_moneyline': -150, 'over_under': 221.5}]),
+        ('BookB', [{'home_team': 'A', 'away_team': 'B', 'home_moneyline': -140}])])
+    best = find_best_lines(games[0])
+    assert best['home_moneyline'] == {'book': 'BookB', 'value': -140}
+    assert best['over_under'] == {'book': 'BookA', 'value': 221.5}
+
+
+def test_malformed_json_falls_back_to_the_cached_payload():
+    with StubOddsServer(['BookA', 'BookB'], [('A', 'B')]) as stub:
+        with OddsPoller(stub.endpoints(), workers=2) as poller:
+            first = poller.poll_once()
+            stub.move_line('BookA', 0, 'over_under', 230.5)
+            stub._payloads['BookA'].body = b'{"home_team": "A", '
+            second = poller.poll_once()
+    assert second == first
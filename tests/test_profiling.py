@@ -0,0 +1,65 @@
+import json
+import os
+import pstats
+
+from main import main
+from utils.profiling import NULL_PROFILER, StageProfiler, run_with_cprofile
+from utils.sports import get_sport
+
+FILES = {'stats': 'nba_team_stats.json', 'schedule': 'nba_schedule_data.json', 'odds': 'nba_betting_odds.json'}
+STAGES = ['load', 'merge', 'penalties', 'scoring', 'best_lines', 'analyze', 'sort', 'output']
+
+
+def test_profiled_run_gives_the_same_results():
+    nba = get_sport('NBA')
+    profiler = StageProfiler(track_memory=True, labels={'sport': 'NBA'})
+    profiled = nba.run(FILES, '2025-06-24', profiler=profiler, writers=[])
+    profiler.stop()
+    assert profiled == nba.run(FILES, '2025-06-24', profiler=NULL_PROFILER, writers=[])
+    assert list(profiler.stages) == STAGES
+    assert profiler.stages['analyze']['items'] == len(profiled)
+    assert all(stats['calls'] == 1 and stats['wall_seconds'] >= 0 for stats in profiler.stages.values())
+    assert profiler.stages['load']['peak_memory_bytes'] > 0
+
+
+def test_stages_accumulate_across_runs():
+    profiler = StageProfiler()
+    for items in (2, 3):
+        with profiler.stage('merge') as stage:
+            stage.add(items)
+    assert profiler.stages['merge']['calls'] == 2 and profiler.stages['merge']['items'] == 5
+    assert profiler.stages['merge']['peak_memory_bytes'] == 0
+
+
+def test_exports(tmp_path):
+    profiler = StageProfiler(labels={'sport': 'N"BA'})
+    with profiler.stage('load') as stage:
+        stage.add(4)
+    path = str(tmp_path / 'stages.json')
+    profiler.write_json(path)
+    with open(path, 'r') as file:
+        assert json.load(file) == profiler.to_dict()
+
+    text = profiler.prometheus_text()
+    assert '# TYPE sports_analyzer_stage_calls_total counter' in text
+    assert 'sports_analyzer_stage_items_total{sport="N\\"BA",stage="load"} 4' in text
+    assert text.endswith('\n')
+    assert profiler.summary().splitlines()[1].startswith('load')
+
+
+def test_cprofile_writes_loadable_stats(tmp_path):
+    path = str(tmp_path / 'nested' / 'run.prof')
+    result, report = run_with_cprofile(lambda: sum(range(1000)), path)
+    assert result == 499500
+    assert os.path.exists(path) and pstats.Stats(path).total_calls > 0
+    assert 'cumulative' in report
+
+
+def test_cli_writes_profiles(tmp_path, capsys):
+    json_path, prom_path = str(tmp_path / 'stages.json'), str(tmp_path / 'stages.prom')
+    main(['--sport', 'NBA', '--stats', FILES['stats'], '--schedule', FILES['schedule'], '--odds', FILES['odds'],
+          '--as-of', '2025-06-24', '--quiet', '--profile', '--profile-json', json_path, '--profile-prom', prom_path])
+    with open(json_path, 'r') as file:
+        assert list(json.load(file)['stages']) == STAGES
+    assert os.path.getsize(prom_path) > 0
+    assert 'stage' in capsys.readouterr().err
@@ -0,0 +1,69 @@
+import math
+
+import pytest
+
+from utils.ratings import HOME_ADVANTAGE, INITIAL_RATING, K_FACTOR, EloRatings, games_from_results
+
+RESULTS = [
+    {'game_date': '2025-01-01', 'home_team': 'Pacers', 'away_team': 'Thunder', 'winner': 'Pacers'},
+    {'game_date': '2025-01-03', 'home_team': 'Thunder', 'away_team': 'Pacers', 'home_score': 101, 'away_score': 99},
+]
+
+
+def _expected(home, away):
+    return 1 / (1 + 10 ** (-(home - away + HOME_ADVANTAGE) / 400))
+
+
+def _by_hand():
+    first = K_FACTOR * (1 - _expected(INITIAL_RATING, INITIAL_RATING))
+    pacers, thunder = INITIAL_RATING + first, INITIAL_RATING - first
+    # Second game: a 2-point home win, scaled by the margin-of-victory multiplier
+    winner_diff = thunder - pacers + HOME_ADVANTAGE
+    second = K_FACTOR * (1 - _expected(thunder, pacers))
+    second *= math.log(3) * 2.2 / (winner_diff * 0.001 + 2.2)
+    return (pacers, thunder), (pacers - second, thunder + second)
+
+
+def _ratings():
+    ratings = EloRatings()
+    ratings.process(games_from_results(RESULTS))
+    return ratings
+
+
+def test_two_game_update_matches_the_elo_formula():
+    after_first, after_second = _by_hand()
+    ratings = _ratings()
+    assert ratings.games == 2
+    assert (ratings.rating('Pacers'), ratings.rating('Thunder')) == pytest.approx(after_second)
+    # Zero-sum: every point one team gains the other loses
+    assert sum(ratings.ratings.values()) == pytest.approx(2 * INITIAL_RATING)
+
+
+def test_as_of_lookups_only_use_earlier_games():
+    after_first, after_second = _by_hand()
+    ratings = _ratings()
+    assert ratings.rating('Pacers', '2025-01-01') == INITIAL_RATING
+    assert ratings.rating('Pacers', '2025-01-02') == pytest.approx(after_first[0])
+    assert ratings.rating('Thunder', '2025-01-03') == pytest.approx(after_first[1])
+    assert ratings.rating('Thunder', '2025-01-04') == pytest.approx(after_second[1])
+    assert ratings.rating('Knicks', '2025-01-04') == INITIAL_RATING
+    assert ratings.win_probability('Pacers', 'Thunder', '2025-01-01') == round(_expected(1500, 1500), 4)
+
+
+def test_standings_come_from_the_snapshot_before_the_date():
+    after_first, after_second = _by_hand()
+    ratings = _ratings()
+    # Next snapshot is due a week after the first one, taken before that day's games
+    ratings.update('2025-01-10', 'Knicks', 'Pacers', True)
+    assert ratings.table('2024-12-31') == {}
+    assert ratings.table('2025-01-09') == {}
+    standings = ratings.standings('2025-01-10')
+    assert [team for team, _ in standings] == ['Thunder', 'Pacers']
+    assert [rating for _, rating in standings] == pytest.approx([after_second[1], after_second[0]])
+    assert len(ratings.standings()) == 3
+
+
+def test_games_must_arrive_in_date_order():
+    ratings = _ratings()
+    with pytest.raises(ValueError):
+        ratings.update('2025-01-02', 'Pacers', 'Thunder', True)
@@ -0,0 +1,86 @@
+import copy
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from nba_analyzer import FATIGUE_WEIGHTS, INJURY_WEIGHTS, calculate_penalties
+from utils.schedule_index import ScheduleIndex
+
+
+# The fatigue score as calculate_penalties computed it before ScheduleIndex: a linear scan of the
+# sorted schedule from the first game on or after today
+def _scan_fatigue(schedule, today, weights):
+    games = sorted(({'date': date.fromisoformat(game['date']), 'home_or_away': game['home_or_away']}
+                    for game in schedule), key=lambda game: game['date'])
+    next_index = next((index for index, game in enumerate(games) if game['date'] >= today), None)
+    if next_index is None:
+        return None
+    current = games[next_index]
+    fatigue = 0
+    if next_index > 0 and current['date'] - games[next_index - 1]['date'] == timedelta(days=1):
+        fatigue += weights['back_to_back']
+    games_in_4 = 1 + sum(1 for index, game in enumerate(games)
+                         if index != next_index and abs((game['date'] - current['date']).days) <= 3)
+    if games_in_4 >= 3:
+        fatigue += weights['3_games_4_nights']
+    if current['home_or_away'] == 'away':
+        streak = 1
+        index = next_index - 1
+        while index >= 0 and games[index]['home_or_away'] == 'away':
+            streak += 1
+            index -= 1
+        index = next_index + 1
+        while index < len(games) and games[index]['home_or_away'] == 'away':
+            streak += 1
+            index += 1
+        if streak >= 3:
+            fatigue += weights['long_road_trip']
+    return fatigue
+
+
+def _schedule(rng, start, games=40):
+    day = start
+    schedule = []
+    for _ in range(games):
+        day += timedelta(days=rng.choice([1, 1, 2, 2, 3, 4]))
+        schedule.append({'date': day.isoformat(), 'opponent': 'Other',
+                         'home_or_away': rng.choice(['home', 'away'])})
+    # Files aren't necessarily in date order
+    rng.shuffle(schedule)
+    return schedule
+
+
+def test_index_matches_the_schedule_scan():
+    rng = random.Random(2)
+    start = date(2024, 10, 20)
+    for _ in range(20):
+        schedule = _schedule(rng, start)
+        original = copy.deepcopy(schedule)
+        index = ScheduleIndex(schedule)
+        for offset in range(0, 150, 3):
+            as_of = start + timedelta(days=offset)
+            expected = _scan_fatigue(schedule, as_of, FATIGUE_WEIGHTS)
+            assert index.fatigue_score(FATIGUE_WEIGHTS, as_of) == pytest.approx(expected)
+            penalties = calculate_penalties(schedule, ['A'], FATIGUE_WEIGHTS, INJURY_WEIGHTS, as_of, index)
+            if expected is None:
+                assert penalties == {'fatigue': 0, 'injuries': 0, 'total': 0}
+            else:
+                assert penalties['total'] == pytest.approx(expected + INJURY_WEIGHTS['1_out'])
+        # The caller's schedule is only read
+        assert schedule == original
+
+
+def test_lookups():
+    index = ScheduleIndex([
+        {'date': '2025-01-01', 'home_or_away': 'home'},
+        {'date': '2025-01-03', 'home_or_away': 'away'},
+        {'date': '2025-01-04', 'home_or_away': 'away'},
+        {'date': '2025-01-05', 'home_or_away': 'away'},
+    ])
+    assert len(index) == 4
+    assert index.next_game_index('2025-01-02') == 1
+    assert index.next_game_index('2025-01-06') is None
+    assert index.fatigue_flags('2025-01-05') == (True, True, True)
+    assert index.fatigue_flags('2025-01-01') == (False, True, False)
+    assert index.fatigue_flags('2025-01-06') is None
@@ -0,0 +1,39 @@
+import json
+
+from nba_analyzer import analyze_nba_slate
+from utils.scoring import nba_missing_stats, nba_team_scores
+
+with open('nba_team_stats.json') as f:
+    TEAM_STATS = json.load(f)
+with open('nba_schedule_data.json') as f:
+    SCHEDULE = json.load(f)
+with open('nba_betting_odds.json') as f:
+    ODDS = json.load(f)
+
+
+def _without_pace(team):
+    team_stats = json.loads(json.dumps(TEAM_STATS))
+    del team_stats[team]['team_stats']['Pace']
+    return team_stats
+
+
+def test_team_missing_a_stat_does_not_stop_the_others():
+    teams, scores = nba_team_scores(TEAM_STATS)
+    team_stats = _without_pace(teams[0])
+
+    kept, kept_scores = nba_team_scores(team_stats)
+    assert kept == teams[1:]
+    assert kept_scores.tolist() == scores[1:].tolist()
+    assert nba_missing_stats(team_stats) == {teams[0]: ['Pace']}
+
+
+def test_slate_skips_only_matchups_with_an_unscored_team():
+    expected = {result['home_team']: result for result in analyze_nba_slate(TEAM_STATS, SCHEDULE, ODDS, '2025-06-24')}
+    for lineup in (None, True):
+        skipped = {}
+        results = analyze_nba_slate(_without_pace('Thunder'), SCHEDULE, ODDS, '2025-06-24', lineup=lineup,
+                                    skipped=skipped)
+        assert skipped == {'Pacers_vs_Thunder': ['Thunder']}
+        assert [result['home_team'] for result in results] == ['Knicks']
+        if lineup is None:
+            assert results[0] == expected['Knicks']
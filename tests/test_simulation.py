@@ -0,0 +1,58 @@
+from statistics import NormalDist
+
+import pytest
+
+from nba_analyzer import analyze_nba_slate, file_opener
+from utils.simulation import SPORT_SPREADS, expected_margin, simulate_games, simulate_slate
+
+GAMES = [
+    {'home_win_prob': 0.62, 'expected_total': 226.0, 'home_spread': -4.5, 'away_spread': 4.5, 'over_under': 221.5},
+    {'home_win_prob': 0.35, 'expected_total': 214.0, 'home_spread': 3.0, 'away_spread': -3.0, 'over_under': 219.0},
+]
+
+
+def _result(home_chance, over_under):
+    return {
+        'home_team': 'Pacers', 'away_team': 'Thunder', 'home_chance': home_chance,
+        'best_lines': {
+            'home_spread': {'book': 'BetMGM', 'value': -2.5},
+            'away_spread': {'book': 'BetMGM', 'value': 2.5},
+            'over_under': {'book': 'BetMGM' if over_under is not None else None, 'value': over_under}
+        }
+    }
+
+
+def test_chances_match_the_normal_approximation():
+    margin_sd, total_sd = SPORT_SPREADS['NBA']['margin_sd'], SPORT_SPREADS['NBA']['total_sd']
+    probs = simulate_games(GAMES, 1_000_000, batch_size=250_000, seed=3)
+    for index, game in enumerate(GAMES):
+        margin = NormalDist(expected_margin(game['home_win_prob'], margin_sd), margin_sd)
+        total = NormalDist(game['expected_total'], total_sd)
+        assert probs['home_cover'][index] == pytest.approx(1 - margin.cdf(-game['home_spread']), abs=0.003)
+        assert probs['away_cover'][index] == pytest.approx(margin.cdf(game['away_spread']), abs=0.003)
+        assert probs['over'][index] == pytest.approx(1 - total.cdf(game['over_under']), abs=0.003)
+        assert probs['over'][index] + probs['under'][index] == pytest.approx(1)
+
+
+def test_missing_total_has_no_total_chances():
+    simulated = simulate_slate([_result(55.0, None)], n_samples=10_000)[0]
+    assert simulated['over_chance'] is None and simulated['under_chance'] is None
+    assert simulated['over_edge'] is None and simulated['under_edge'] is None
+    assert simulated['home_cover_chance'] is not None
+
+
+def test_unrounded_win_probability_is_used_when_given():
+    results = [_result(55.0, 220.5)]
+    rounded = simulate_slate(results, n_samples=200_000)[0]
+    raw = simulate_slate(results, n_samples=200_000, win_probs=[0.5504])[0]
+    assert raw['home_cover_chance'] > rounded['home_cover_chance']
+
+
+def test_slate_results_carry_their_simulation():
+    results = analyze_nba_slate(file_opener('nba_team_stats.json'), file_opener('nba_schedule_data.json'),
+                                file_opener('nba_betting_odds.json'), '2025-06-24', simulate=True)
+    assert results
+    for result in results:
+        assert (result['simulation']['home_team'], result['simulation']['away_team']) == \
+            (result['home_team'], result['away_team'])
+        assert 0 < result['simulation']['home_cover_chance'] < 1
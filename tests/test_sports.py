@@ -0,0 +1,53 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from utils.sports import SportPlugin, get_sport, shared_value, sport_names
+
+FILES = {'stats': 'nba_team_stats.json', 'schedule': 'nba_schedule_data.json', 'odds': 'nba_betting_odds.json'}
+
+
+def test_analyzer_is_imported_on_first_use():
+    code = ("import sys; from utils.sports import get_sport; "
+            "assert 'nba_analyzer' not in sys.modules and 'numpy' not in sys.modules; "
+            "get_sport('nba').module; assert 'nba_analyzer' in sys.modules and 'nfl_analyzer' not in sys.modules")
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_unknown_sport():
+    assert get_sport('MLB') is None
+    assert get_sport(' nfl ').name == 'NFL'
+    assert sport_names() == ['NFL', 'NBA']
+
+
+def test_unsupported_options_are_rejected():
+    nba, nfl = get_sport('NBA'), get_sport('NFL')
+    slate = nfl.load({'stats': 'nfl_stats.json', 'odds': 'nfl_odds.json'})
+    with pytest.raises(ValueError, match='lineup'):
+        nfl.analyze(slate, lineup=True)
+    with pytest.raises(ValueError, match='colour'):
+        nba.analyze(nba.load(FILES), colour=True)
+    assert nba.analyze(nba.load(FILES), '2025-06-24', lineup=True)
+
+
+def test_missing_inputs_fall_back_to_the_defaults():
+    plugin = SportPlugin('TEST', 'nfl_analyzer', inputs=[('odds', 'nfl_odds.json', None), ('stats', None, 'prompt')])
+    assert plugin.resolve_inputs({'stats': 'mine.json'}) == {'odds': 'nfl_odds.json', 'stats': 'mine.json'}
+
+
+def test_shared_loads_match_a_plain_load():
+    nba = get_sport('NBA')
+    shared = {}
+    first = nba.load(FILES, shared=shared)
+    second = nba.load(FILES, shared=shared)
+    assert second['team_stats'] is first['team_stats'] and second['team_scores'] is first['team_scores']
+    plain = nba.analyze(nba.load(FILES), '2025-06-24')
+    assert json.dumps(nba.analyze(second, '2025-06-24')) == json.dumps(plain)
+
+
+def test_shared_value_needs_the_file():
+    with pytest.raises(FileNotFoundError):
+        shared_value({}, 'stats', 'missing.json', dict)
+    assert shared_value(None, 'stats', 'missing.json', dict) == {}
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from nba_analyzer import analyze_nba_slate, file_opener, stream_nba_analysis
+from utils.streaming import iter_json_array, iter_json_lines, iter_records, write_json_lines
+
+ODDS_FILE = 'nba_betting_odds.json'
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64, 1 << 16])
+def test_array_parse_matches_json_load_at_any_chunk_size(chunk_size):
+    with open(ODDS_FILE, 'r') as file:
+        expected = json.load(file)
+    assert list(iter_json_array(ODDS_FILE, chunk_size)) == expected
+
+
+def test_numbers_split_across_chunks(tmp_path):
+    path = tmp_path / 'numbers.json'
+    values = [12345678, -0.5, 1e10, 'text', None, True, {'a': [1, 2]}]
+    path.write_text('\n' * 10 + '[ ' + ' , '.join(json.dumps(value) for value in values) + ' ] ')
+    for chunk_size in range(1, 9):
+        assert list(iter_json_array(str(path), chunk_size)) == values
+
+
+def test_oversized_or_unterminated_elements_fail_early(tmp_path):
+    path = tmp_path / 'unterminated.json'
+    path.write_text('[{"a": 1}, "' + 'x' * 10000)
+    records = iter_json_array(str(path), 64, max_element_size=1000)
+    assert next(records) == {'a': 1}
+    with pytest.raises(ValueError, match='over 1000 characters'):
+        next(records)
+    path.write_text(json.dumps([{'a': 'x' * 900}, 'y' * 2000]))
+    records = iter_json_array(str(path), 64, max_element_size=1000)
+    assert next(records) == {'a': 'x' * 900}
+    with pytest.raises(ValueError):
+        next(records)
+
+
+def test_bad_arrays_are_rejected(tmp_path):
+    for name, text in (('object', '{"a": 1}'), ('truncated', '[1, 2'), ('invalid', '[1, nope]')):
+        path = tmp_path / f'{name}.json'
+        path.write_text(text)
+        with pytest.raises(ValueError):
+            list(iter_json_array(str(path), 4))
+
+
+def test_json_lines_round_trip_and_reader_choice(tmp_path):
+    with open(ODDS_FILE, 'r') as file:
+        records = json.load(file)
+    path = str(tmp_path / 'odds.jsonl')
+    assert write_json_lines(records, path) == len(records)
+    assert list(iter_json_lines(path)) == records
+    assert list(iter_records(path)) == records
+    assert list(iter_records(ODDS_FILE)) == records
+
+    bad = tmp_path / 'bad.jsonl'
+    bad.write_text('{"a": 1}\n\n{oops\n')
+    with pytest.raises(ValueError, match=':3:'):
+        list(iter_json_lines(str(bad)))
+
+
+def test_streamed_analysis_matches_the_in_memory_slate():
+    team_stats = file_opener('nba_team_stats.json')
+    team_schedule = file_opener('nba_schedule_data.json')
+    streamed = list(stream_nba_analysis(team_stats, team_schedule, ODDS_FILE, '2025-06-24'))
+    loaded = analyze_nba_slate(team_stats, team_schedule, file_opener(ODDS_FILE), '2025-06-24')
+    key = lambda result: (result['home_team'], result['away_team'])
+    assert sorted(streamed, key=key) == sorted(loaded, key=key)
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+import numpy as np
+
+from tuning import FATIGUE_KEYS, INJURY_KEYS, MAX_PENALTY, TuningProblem, WeightSearch
+
+with open('nba_team_stats.json', 'r') as file:
+    TEAM_STATS = json.load(file)
+
+
+def _season(injuries=None):
+    home, away = 'Pacers', 'Thunder'
+    season = {
+        'sport': 'NBA',
+        # Every team lists three injuries today
+        'stats': {team: dict(data, injuries=['A', 'B', 'C']) for team, data in TEAM_STATS.items()},
+        'schedule': {
+            home: [{'date': '2025-01-10', 'opponent': away, 'home_or_away': 'home', 'result': 'W'}],
+            away: [{'date': '2025-01-10', 'opponent': home, 'home_or_away': 'away', 'result': 'L'}]
+        },
+        'results': [{'game_date': '2025-01-10', 'home_team': home, 'away_team': away, 'winner': home}]
+    }
+    if injuries is not None:
+        season['injuries'] = injuries
+    return season
+
+
+def _injury_flags(problem):
+    columns = [problem.penalty_keys.index(key) for key in INJURY_KEYS]
+    return problem.home_penalty_flags[0, columns].tolist(), problem.away_penalty_flags[0, columns].tolist()
+
+
+def test_injury_flags_come_from_dated_reports():
+    assert _injury_flags(TuningProblem(_season())) == ([0.0, 0.0, 0.0], [0.0, 0.0, 0.0])
+    problem = TuningProblem(_season({'Pacers': [{'date': '2025-01-01', 'injuries': ['A']},
+                                                {'date': '2025-02-01', 'injuries': ['A', 'B', 'C']}]}))
+    assert _injury_flags(problem) == ([1.0, 0.0, 0.0], [0.0, 0.0, 0.0])
+
+
+def test_oversized_grid_needs_an_explicit_opt_in():
+    with WeightSearch(_season()) as search:
+        grid = {name: [0.0, 0.25, 0.5, 0.75, 1.0] for name in search.problem.param_names}
+        assert search.grid_size(grid) == 5 ** 12
+        with pytest.raises(ValueError):
+            search.grid_search(grid)
+        small = {name: [0.0, 0.5, 1.0] for name in search.problem.score_keys}
+        assert search.grid_search(small)['evaluated'] == 3 ** 6
+
+
+def _worn_out_season():
+    season = _season({'Thunder': [{'date': '2025-01-01', 'injuries': ['A', 'B', 'C']}]})
+    # Third road game in three nights: every fatigue flag plus the 3+ injuries bucket applies
+    season['schedule']['Thunder'] = [
+        {'date': day, 'opponent': 'Pacers', 'home_or_away': 'away', 'result': 'L'}
+        for day in ('2025-01-08', '2025-01-09', '2025-01-10')
+    ]
+    return season
+
+
+def test_searched_penalties_keep_probabilities_inside_zero_one():
+    season = _worn_out_season()
+    problem = TuningProblem(season)
+    assert problem.away_penalty_flags[0].tolist() == [1.0, 1.0, 1.0, 0.0, 0.0, 1.0]
+    # The analyzer defaults push the Thunder's penalty past 1, so their adjusted score goes negative
+    assert problem.win_probabilities(problem.defaults())[0, 0] > 1
+
+    worst = np.ones(len(problem.param_names))
+    capped = problem.cap_penalties(worst)[0]
+    penalties = dict(zip(problem.param_names, capped))
+    assert sum(penalties[key] for key in FATIGUE_KEYS) + max(penalties[key] for key in INJURY_KEYS) \
+        == pytest.approx(MAX_PENALTY)
+
+    with WeightSearch(season, batch_size=500) as search:
+        for result in (search.random_search(2000), search.coordinate_search(rounds=2)):
+            weights = {key: value for group in result['weights'].values() for key, value in group.items()}
+            probs = problem.win_probabilities(np.array([weights[name] for name in problem.param_names]))
+            assert np.all((probs > 0) & (probs < 1))
@@ -0,0 +1,42 @@
+import asyncio
+
+from web_service import ResultService
+
+RESULT = {'home_team': 'Boston Celtics', 'away_team': 'New York Knicks', 'home_win_probability': 0.6}
+
+
+# Function to send one raw request and return the status line and the service's slate keys
+async def _request(raw, publish=True, **options):
+    service = await ResultService(port=0, **options).start()
+    if publish:
+        service.publish('NBA', 'main', [RESULT])
+    reader, writer = await asyncio.open_connection('127.0.0.1', service.port)
+    writer.write(raw)
+    status = (await reader.readline()).decode().strip()
+    writer.close()
+    await service.close()
+    return status, set(service.slates)
+
+
+def test_events_for_an_unknown_slate_is_not_found_and_not_created():
+    status, slates = asyncio.run(_request(b"GET /events/XYZ/anything HTTP/1.1\r\nHost: localhost\r\n\r\n"))
+    assert status.startswith('HTTP/1.1 404')
+    assert slates == {('NBA', 'main')}
+
+
+def test_events_for_a_published_slate_streams():
+    status, _ = asyncio.run(_request(b"GET /events/nba/main HTTP/1.1\r\nHost: localhost\r\n\r\n"))
+    assert status.startswith('HTTP/1.1 200')
+
+
+def test_non_numeric_content_length_is_a_bad_request():
+    status, _ = asyncio.run(_request(b"GET /health HTTP/1.1\r\nHost: localhost\r\nContent-Length: abc\r\n\r\n"))
+    assert status.startswith('HTTP/1.1 400')
+
+
+def test_oversized_body_is_refused():
+    raw = b"GET /health HTTP/1.1\r\nHost: localhost\r\nContent-Length: 2000\r\n\r\n"
+    status, _ = asyncio.run(_request(raw, max_body_bytes=1000))
+    assert status.startswith('HTTP/1.1 413')
+    status, _ = asyncio.run(_request(raw + b"x" * 2000, max_body_bytes=2000))
+    assert status.startswith('HTTP/1.1 200')
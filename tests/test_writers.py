@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+import random
+
+import pytest
+
+from utils.sports import get_sport
+from utils.writers import (
+    CHUNK_SIZE,
+    CSV_FIELDS,
+    HTMLWriter,
+    JSONLinesWriter,
+    JSONWriter,
+    TerminalWriter,
+    open_writer,
+    select_results,
+    write_results
+)
+
+FILES = {'stats': 'nba_team_stats.json', 'schedule': 'nba_schedule_data.json', 'odds': 'nba_betting_odds.json'}
+RESULTS = get_sport('NBA').run(FILES, '2025-06-24', writers=[])
+
+
+def _many(count, seed=0):
+    rng = random.Random(seed)
+    template = RESULTS[0]
+    # Edges on a coarse grid so plenty of results tie
+    return [dict(template, home_team=f"Team{index}", home_edge=rng.randint(-20, 20) / 100,
+                 away_edge=rng.randint(-20, 20) / 100) for index in range(count)]
+
+
+def _write(writer_class, results):
+    buffer = io.StringIO()
+    write_results(results, [writer_class(buffer)])
+    return buffer.getvalue()
+
+
+# The per-matchup print loop the terminal view replaced
+def _printed(results):
+    buffer = io.StringIO()
+    for result in results:
+        print(f"{result['away_team']} @ {result['home_team']}:", file=buffer)
+        print(f"    Market assigned {result['home_team']} win probability: {result['home_market_chance']*100:.1f}%", file=buffer)
+        print(f"    Market assigned {result['away_team']} win probability: {result['away_market_chance']*100:.1f}%", file=buffer)
+        print(f"    Model est. {result['home_team']} win probability: {result['home_chance']}%", file=buffer)
+        print(f"    Model est. {result['away_team']} win probability: {result['away_chance']}%", file=buffer)
+        print(f"    {result['home_team']} edge: {result['home_edge']*100:.1f}%", file=buffer)
+        print(f"    {result['away_team']} edge: {result['away_edge']*100:.1f}%", file=buffer)
+        print(f"    Best Lines:", file=buffer)
+        for label, line_type in (('Home ML', 'home_moneyline'), ('Away ML', 'away_moneyline'),
+                                 ('Home Spread', 'home_spread'), ('Away Spread', 'away_spread'),
+                                 ('Over/Under', 'over_under')):
+            line = result['best_lines'][line_type]
+            print(f"        {label}: {line['value']} ({line['book']})", file=buffer)
+        print(f"-------------------------------------------------", file=buffer)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('count', [0, 1, CHUNK_SIZE + 3])
+def test_text_formats_match_the_reference_output(count):
+    results = (RESULTS + _many(count))[:count]
+    assert _write(TerminalWriter, results) == _printed(results)
+    assert _write(JSONWriter, results) == json.dumps(results, indent=4)
+    assert _write(JSONLinesWriter, results) == ''.join(json.dumps(result) + '\n' for result in results)
+
+
+def test_csv_and_html(tmp_path):
+    path = str(tmp_path / 'results.csv')
+    assert write_results(RESULTS, [open_writer('csv', path)]) == len(RESULTS)
+    with open(path, 'r', newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert list(rows[0]) == CSV_FIELDS
+    assert [row['home_team'] for row in rows] == [result['home_team'] for result in RESULTS]
+    assert rows[0]['over_under_book'] == RESULTS[0]['best_lines']['over_under']['book']
+
+    page = _write(HTMLWriter, [dict(RESULTS[0], home_team='<Pacers>')])
+    assert '&lt;Pacers&gt;' in page and '<Pacers>' not in page
+    assert page.endswith("<p>1 matchups</p>\n</body>\n</html>\n")
+
+    with pytest.raises(ValueError):
+        open_writer('xml')
+
+
+def test_select_results_matches_a_full_sort():
+    results = _many(2000, seed=4)
+    key = lambda result: max(result['home_edge'], result['away_edge'])
+    reference = sorted(results, key=key, reverse=True)
+    assert select_results(results) == reference
+    for top in (1, 10, 500, 5000):
+        assert select_results(results, top) == reference[:top]
+    above = [result for result in reference if key(result) >= 0.1]
+    assert select_results(results, min_edge=0.1) == above
+    assert select_results(iter(results), 25, 0.1) == above[:25]
@@ -0,0 +1,362 @@
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backtest import SEASON_FILES, build_injury_index, injuries_as_of, load_season, result_home_won
+from nba_analyzer import FATIGUE_WEIGHTS, INJURY_WEIGHTS
+from utils.schedule_index import build_schedule_indexes, date_ordinal
+from utils.sports import get_sport
+
+FATIGUE_KEYS = ['back_to_back', '3_games_4_nights', 'long_road_trip']
+INJURY_KEYS = ['1_out', '2_out', '3_max']
+PROB_EPSILON = 1e-6
+# Cap on the largest penalty a searched candidate can give a team (every fatigue flag plus the biggest
+# injury bucket), so 1 - penalty stays positive and adjusted scores never hit zero or flip sign
+MAX_PENALTY = 0.9
+# Grids bigger than this need --full-grid (every parameter at 5 points is 5 ** 12, about 244M candidates)
+MAX_GRID_CANDIDATES = 1000000
+
+
+# Everything a candidate weight vector is scored against, built once per search:
+# normalized team features, per-game team indexes, per-game penalty indicators and outcomes
+class TuningProblem:
+    def __init__(self, season):
+        season = load_season(season)
+        self.sport = season['sport']
+        plugin = get_sport(self.sport)
+        team_stats = season['stats']
+
+        teams, self.features = plugin.feature_matrix(team_stats)
+        self.score_weights = plugin.score_weights()
+        self.score_keys = list(self.score_weights)
+        self.clip_scores = plugin.clip_scores
+        self.penalty_keys = FATIGUE_KEYS + INJURY_KEYS if plugin.penalties else []
+        self.param_names = self.score_keys + self.penalty_keys
+
+        team_ids = {team: index for index, team in enumerate(teams)}
+        results = [result for result in season.get('results', [])
+                   if result['home_team'] in team_ids and result['away_team'] in team_ids]
+        self.home_idx = np.array([team_ids[result['home_team']] for result in results], dtype=np.intp)
+        self.away_idx = np.array([team_ids[result['away_team']] for result in results], dtype=np.intp)
+        self.home_won = np.array([result_home_won(result) for result in results], dtype=float)
+
+        # Penalty indicators: 1 where a fatigue flag or injury bucket applies, so penalty = indicators @ weights
+        self.home_penalty_flags = np.zeros((len(results), len(self.penalty_keys)))
+        self.away_penalty_flags = np.zeros((len(results), len(self.penalty_keys)))
+        if self.penalty_keys:
+            indexes = build_schedule_indexes(season.get('schedule', {}))
+            # Injuries from the dated reports as of each game, like the backtest (the stats file's are today's)
+            injury_index = build_injury_index(season.get('injuries'))
+            flag_cache = {}
+            for row, result in enumerate(results):
+                game_day = date_ordinal(str(result['game_date']))
+                for flags, team in ((self.home_penalty_flags, result['home_team']),
+                                    (self.away_penalty_flags, result['away_team'])):
+                    key = (team, game_day)
+                    if key not in flag_cache:
+                        injuries = injuries_as_of(injury_index, team, game_day)
+                        flag_cache[key] = _penalty_flags(indexes.get(team), injuries, game_day)
+                    flags[row] = flag_cache[key]
+
+    def defaults(self):
+        weights = dict(self.score_weights, **FATIGUE_WEIGHTS, **INJURY_WEIGHTS)
+        return np.array([weights[name] for name in self.param_names], dtype=float)
+
+    # Function to scale down each candidate's penalty weights whose worst case is over MAX_PENALTY
+    def cap_penalties(self, candidates):
+        candidates = np.array(np.atleast_2d(candidates), dtype=float)
+        if not self.penalty_keys:
+            return candidates
+        score_count = len(self.score_keys)
+        fatigue_end = score_count + len(FATIGUE_KEYS)
+        worst = candidates[:, score_count:fatigue_end].sum(axis=1) + candidates[:, fatigue_end:].max(axis=1)
+        scale = np.where(worst > MAX_PENALTY, MAX_PENALTY / np.where(worst > 0, worst, 1), 1.0)
+        candidates[:, score_count:] *= scale[:, None]
+        return candidates
+
+    # Function to turn a parameter vector back into the weight dicts the analyzers take
+    def to_weights(self, params):
+        values = dict(zip(self.param_names, (float(value) for value in params)))
+        return {
+            'team_weights': {key: values[key] for key in self.score_keys},
+            'fatigue_weights': {key: values[key] for key in FATIGUE_KEYS if key in values},
+            'injury_weights': {key: values[key] for key in INJURY_KEYS if key in values}
+        }
+
+    # Function to get home win probabilities for a batch of candidates, shape (games, candidates)
+    def win_probabilities(self, candidates):
+        candidates = np.atleast_2d(candidates)
+        score_count = len(self.score_keys)
+        team_scores = self.features @ candidates[:, :score_count].T
+        if self.clip_scores:
+            team_scores = np.clip(team_scores, 0, 1)
+        home = team_scores[self.home_idx]
+        away = team_scores[self.away_idx]
+        if self.penalty_keys:
+            penalty_weights = candidates[:, score_count:].T
+            home = home * (1 - self.home_penalty_flags @ penalty_weights)
+            away = away * (1 - self.away_penalty_flags @ penalty_weights)
+        total = home + away
+        return np.where(total > 0, home / np.where(total > 0, total, 1), 0.5)
+
+    # Function to score a batch of candidates, lower is better
+    def evaluate(self, candidates, objective='log_loss'):
+        probs = np.clip(self.win_probabilities(candidates), PROB_EPSILON, 1 - PROB_EPSILON)
+        outcomes = self.home_won[:, None]
+        if objective == 'brier':
+            return np.mean((probs - outcomes) ** 2, axis=0)
+        return -np.mean(outcomes * np.log(probs) + (1 - outcomes) * np.log(1 - probs), axis=0)
+
+
+def _penalty_flags(schedule_index, injuries, game_day):
+    flags = [0.0] * 6
+    fatigue = schedule_index.fatigue_flags(game_day) if schedule_index is not None else None
+    # calculate_penalties gives no penalty at all when the team has no game left
+    if fatigue is None:
+        return flags
+    flags[:3] = [float(flag) for flag in fatigue]
+    injured = len(injuries)
+    if injured >= 3:
+        flags[5] = 1.0
+    elif injured == 2:
+        flags[4] = 1.0
+    elif injured == 1:
+        flags[3] = 1.0
+    return flags
+
+
+# Worker-process state: each worker builds the problem once and then only receives candidate batches
+_worker_problem = None
+
+
+def _init_worker(season):
+    global _worker_problem
+    _worker_problem = TuningProblem(season)
+
+
+def _evaluate_in_worker(candidates, objective):
+    return _worker_problem.evaluate(candidates, objective)
+
+
+# Runs candidate batches locally or across a process pool, tracking the best vector and checkpointing
+class WeightSearch:
+    def __init__(self, season, objective='log_loss', workers=1, batch_size=2000, checkpoint=None):
+        self.problem = TuningProblem(season)
+        self.season = season
+        self.objective = objective
+        self.workers = workers
+        self.batch_size = batch_size
+        self.checkpoint = checkpoint
+        self.evaluated = 0
+        # The analyzer defaults can reach a total penalty of 1 or more, so the search starts from them capped
+        self.default_loss = float(self.problem.evaluate(self.problem.defaults(), objective)[0])
+        self.best_params = self.problem.cap_penalties(self.problem.defaults())[0]
+        self.best_loss = float(self.problem.evaluate(self.best_params, objective)[0])
+        self.state = {}
+        self._pool = None
+
+    def __enter__(self):
+        if self.workers and self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self.season,))
+        return self
+
+    def __exit__(self, *exc):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    # Function to evaluate one batch, split across the pool when there is one
+    def evaluate(self, candidates):
+        candidates = self.problem.cap_penalties(candidates)
+        if self._pool is None or len(candidates) < 2 * self.workers:
+            losses = self.problem.evaluate(candidates, self.objective)
+        else:
+            chunks = np.array_split(candidates, self.workers)
+            losses = np.concatenate(list(self._pool.map(_evaluate_in_worker, chunks,
+                                                        [self.objective] * len(chunks))))
+        best = int(np.argmin(losses))
+        if losses[best] < self.best_loss:
+            self.best_loss = float(losses[best])
+            self.best_params = candidates[best].copy()
+        self.evaluated += len(candidates)
+        return losses
+
+    def save_checkpoint(self, method):
+        if not self.checkpoint:
+            return
+        data = {
+            'method': method,
+            'objective': self.objective,
+            'param_names': self.problem.param_names,
+            'evaluated': self.evaluated,
+            'best_loss': self.best_loss,
+            'best_params': [float(value) for value in self.best_params],
+            'state': self.state
+        }
+        # Write then rename so an interrupted save never leaves a broken checkpoint
+        temp_file = f"{self.checkpoint}.tmp"
+        with open(temp_file, 'w') as file:
+            json.dump(data, file, indent=4)
+        os.replace(temp_file, self.checkpoint)
+
+    def load_checkpoint(self, method):
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return False
+        with open(self.checkpoint, 'r') as file:
+            data = json.load(file)
+        if data['method'] != method or data['objective'] != self.objective or \
+                data['param_names'] != self.problem.param_names:
+            raise ValueError(f"{self.checkpoint} is from a different search ({data['method']}, {data['objective']})")
+        self.evaluated = data['evaluated']
+        self.best_loss = data['best_loss']
+        self.best_params = np.array(data['best_params'], dtype=float)
+        self.state = data['state']
+        return True
+
+    def _run_batches(self, method, candidate_iter, skip):
+        batch = []
+        for candidate in itertools.islice(candidate_iter, skip, None):
+            batch.append(candidate)
+            if len(batch) == self.batch_size:
+                self.evaluate(batch)
+                self.save_checkpoint(method)
+                batch = []
+        if batch:
+            self.evaluate(batch)
+            self.save_checkpoint(method)
+
+    # Function to count the candidates a grid expands to
+    def grid_size(self, grid):
+        return math.prod(len(grid.get(name, [None])) for name in self.problem.param_names)
+
+    # Function to try every combination of per-parameter values; parameters not in grid keep their default.
+    # Grids over max_candidates raise ValueError unless max_candidates is None.
+    def grid_search(self, grid, max_candidates=MAX_GRID_CANDIDATES):
+        size = self.grid_size(grid)
+        if max_candidates is not None and size > max_candidates:
+            raise ValueError(f"Grid has {size:,} candidates (limit {max_candidates:,}), "
+                             f"sweep fewer parameters or use random search")
+        self.load_checkpoint('grid')
+        defaults = self.problem.defaults()
+        names = self.problem.param_names
+        axes = [grid.get(name, [defaults[i]]) for i, name in enumerate(names)]
+        self._run_batches('grid', itertools.product(*axes), self.evaluated)
+        return self.result()
+
+    # Function to sample candidates uniformly within bounds (team weights rescaled to sum to 1,
+    # penalty weights capped by evaluate)
+    # The sampler is seeded, so a resumed search skips exactly the candidates already evaluated
+    def random_search(self, samples, bounds=None, seed=0):
+        self.load_checkpoint('random')
+        bounds = bounds or {}
+        names = self.problem.param_names
+        score_count = len(self.problem.score_keys)
+        low = np.array([bounds.get(name, (0.0, 1.0))[0] for name in names])
+        high = np.array([bounds.get(name, (0.0, 1.0))[1] for name in names])
+
+        def candidates():
+            rng = np.random.default_rng(seed)
+            remaining = samples
+            while remaining > 0:
+                size = min(self.batch_size, remaining)
+                batch = rng.uniform(low, high, size=(size, len(names)))
+                totals = batch[:, :score_count].sum(axis=1, keepdims=True)
+                batch[:, :score_count] /= np.where(totals > 0, totals, 1)
+                yield from batch
+                remaining -= size
+
+        self._run_batches('random', candidates(), self.evaluated)
+        return self.result()
+
+    # Function to improve one parameter at a time: each step evaluates a whole line of values
+    # for that parameter in one batch, keeps the best, and halves the step after a full pass with no gain
+    def coordinate_search(self, rounds=10, step=0.1, points=21, bounds=None):
+        resumed = self.load_checkpoint('coordinate')
+        bounds = bounds or {}
+        names = self.problem.param_names
+        if not resumed:
+            self.state = {'round': 0, 'step': step}
+
+        while self.state['round'] < rounds:
+            improved = False
+            for index, name in enumerate(names):
+                low, high = bounds.get(name, (0.0, 1.0))
+                center = self.best_params[index]
+                values = np.clip(center + np.linspace(-1, 1, points) * self.state['step'] * (points // 2),
+                                 low, high)
+                candidates = np.repeat(self.best_params[None, :], points, axis=0)
+                candidates[:, index] = values
+                before = self.best_loss
+                self.evaluate(candidates)
+                improved = improved or self.best_loss < before
+            self.state['round'] += 1
+            if not improved:
+                self.state['step'] /= 2
+            self.save_checkpoint('coordinate')
+        return self.result()
+
+    def result(self):
+        return {
+            'objective': self.objective,
+            'loss': self.best_loss,
+            'evaluated': self.evaluated,
+            'weights': self.problem.to_weights(self.best_params)
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tune scoring and penalty weights against historical results.")
+    parser.add_argument('season', help="Season JSON: {sport, stats, schedule, results, injuries} (paths or data)")
+    parser.add_argument('--method', choices=['grid', 'random', 'coordinate'], default='random')
+    parser.add_argument('--objective', choices=['log_loss', 'brier'], default='log_loss')
+    parser.add_argument('--samples', type=int, default=100000, help="Candidates for random search")
+    parser.add_argument('--grid-points', type=int, default=5, help="Values per parameter for grid search")
+    parser.add_argument('--grid-params', nargs='+',
+                        help="Parameters the grid sweeps, the rest keep their default (default: team-score weights)")
+    parser.add_argument('--full-grid', action='store_true',
+                        help="Sweep every parameter, with no limit on the grid size")
+    parser.add_argument('--rounds', type=int, default=10, help="Passes for coordinate search")
+    parser.add_argument('--batch-size', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--checkpoint', help="Checkpoint file, resumed if it exists")
+    args = parser.parse_args()
+
+    with open(args.season, 'r') as file:
+        season = json.load(file)
+    base_dir = os.path.dirname(os.path.abspath(args.season))
+    for key in SEASON_FILES:
+        if isinstance(season.get(key), str):
+            season[key] = os.path.join(base_dir, season[key])
+
+    start = time.perf_counter()
+    with WeightSearch(season, args.objective, args.workers, args.batch_size, args.checkpoint) as search:
+        print(f"Default weights {args.objective}: {search.default_loss:.5f}")
+        if args.method == 'grid':
+            names = search.problem.param_names if args.full_grid else args.grid_params or search.problem.score_keys
+            unknown = [name for name in names if name not in search.problem.param_names]
+            if unknown:
+                parser.error(f"unknown parameters: {', '.join(unknown)} "
+                             f"(choose from {', '.join(search.problem.param_names)})")
+            grid = {name: list(np.linspace(0, 1, args.grid_points)) for name in names}
+            print(f"Grid search over {', '.join(names)}: {search.grid_size(grid):,} candidates")
+            try:
+                result = search.grid_search(grid, None if args.full_grid else MAX_GRID_CANDIDATES)
+            except ValueError as error:
+                parser.error(f"{error} (--full-grid runs it anyway)")
+        elif args.method == 'random':
+            result = search.random_search(args.samples)
+        else:
+            result = search.coordinate_search(args.rounds)
+    elapsed = time.perf_counter() - start
+
+    print(f"Best {result['objective']}: {result['loss']:.5f} after {result['evaluated']} candidates "
+          f"({result['evaluated'] / elapsed:.0f} candidates/sec)")
+    print(json.dumps(result['weights'], indent=4))
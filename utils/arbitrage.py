@@ -0,0 +1,236 @@
+import argparse
+import json
+import math
+
+from utils.helpers import implied_probability, moneyline_to_decimal
+
+# Spread and total lines carry no price in the odds files, so they are assumed to be at standard juice
+STANDARD_JUICE = -110
+
+# (side, line key, higher is better), best for the bettor: more points on either spread
+# (find_best_lines ranks away_spread lowest-first, which would never leave a middle window);
+# 'under' is the highest total, the other end of a totals middle.
+SIDES = (
+    ('home_moneyline', 'home_moneyline', True),
+    ('away_moneyline', 'away_moneyline', True),
+    ('home_spread', 'home_spread', True),
+    ('away_spread', 'away_spread', True),
+    ('over', 'over_under', False),
+    ('under', 'over_under', True),
+)
+
+
+# Function to count the whole-number scores/margins strictly between low and high (both bets win);
+# a half-point gap such as 220.5 to 221 has none, the 221 result is only a push
+def _middle_outcomes(low, high):
+    return max(0, math.ceil(high) - math.floor(low) - 1)
+
+
+# Function to split total_stake across legs so every leg pays out the same amount
+def stake_split(decimals, total_stake):
+    inverse = [1 / decimal for decimal in decimals]
+    total_inverse = sum(inverse)
+    stakes = [round(total_stake * value / total_inverse, 2) for value in inverse]
+    payout = total_stake / total_inverse
+    return stakes, payout
+
+
+# Scans games for cross-book arbitrage (best home + away moneylines with summed implied
+# probability below 1) and spread/total middles (best lines on both sides leave a window where
+# both bets win). Every game keeps the best and second-best (value, book) per side, so a single
+# book update touches only that game: O(1) when the update doesn't worsen a top-two quote,
+# otherwise one O(books) rescan of that side.
+class ArbitrageScanner:
+    def __init__(self, games=(), total_stake=100.0, juice=STANDARD_JUICE, min_margin=0.0):
+        self.total_stake = total_stake
+        self.juice_decimal = moneyline_to_decimal(juice)
+        # Both middle legs are at the same juice, so their stakes and payout never change
+        self.middle_stakes, self.middle_payout = stake_split([self.juice_decimal] * 2, total_stake)
+        self.min_margin = min_margin
+        self.games = {}
+        self.books = {}
+        self.index = {}
+        self.found = {}
+        self.updates = 0
+        self.rescans = 0
+        for game in games:
+            self.add_game(game)
+
+    # Function to add (or replace) a game from an odds entry ({'home_team', 'away_team', 'odds'})
+    def add_game(self, game):
+        game_id = f"{game.get('home_team')}_vs_{game.get('away_team')}"
+        self.games[game_id] = (game.get('home_team'), game.get('away_team'))
+        self.books[game_id] = {book: dict(lines) for book, lines in (game.get('odds') or {}).items()}
+        self.index[game_id] = {side: self._scan_side(game_id, key, higher) for side, key, higher in SIDES}
+        self.found[game_id] = self.check(game_id)
+        return game_id
+
+    def remove_game(self, game_id):
+        for table in (self.games, self.books, self.index, self.found):
+            table.pop(game_id, None)
+
+    # Function to replace one book's lines for a game and re-check only that game
+    def update_book(self, game_id, book, lines):
+        self.updates += 1
+        books = self.books[game_id]
+        old = books.get(book, {})
+        books[book] = dict(lines)
+        index = self.index[game_id]
+        for side, key, higher in SIDES:
+            old_value = old.get(key)
+            value = lines.get(key)
+            if value != old_value:
+                index[side] = self._update_side(game_id, index[side], book, value, old_value, key, higher)
+        self.found[game_id] = self.check(game_id)
+        return self.found[game_id]
+
+    def remove_book(self, game_id, book):
+        self.updates += 1
+        old = self.books[game_id].pop(book, None)
+        if old is None:
+            return self.found[game_id]
+        index = self.index[game_id]
+        for side, key, higher in SIDES:
+            if any(entry_book == book for _, entry_book in index[side]):
+                self.rescans += 1
+                index[side] = self._scan_side(game_id, key, higher)
+        self.found[game_id] = self.check(game_id)
+        return self.found[game_id]
+
+    # Function to find the best and second-best (value, book) for one side (first book wins ties,
+    # same as find_best_lines). Lower-is-better sides are compared negated.
+    def _scan_side(self, game_id, key, higher):
+        sign = 1 if higher else -1
+        best = second = None
+        best_score = second_score = 0
+        for book, lines in self.books[game_id].items():
+            value = lines.get(key)
+            if value is None:
+                continue
+            score = value * sign
+            if best is None or score > best_score:
+                best, second, best_score, second_score = (value, book), best, score, best_score
+            elif second is None or score > second_score:
+                second, second_score = (value, book), score
+        if second is None:
+            return [best] if best is not None else []
+        return [best, second]
+
+    def _update_side(self, game_id, entries, book, value, old_value, key, higher):
+        sign = 1 if higher else -1
+        for position, (_, entry_book) in enumerate(entries):
+            if entry_book == book:
+                # A top-two quote got worse (or disappeared): another book may now be in the top two
+                if value is None or value * sign < old_value * sign:
+                    self.rescans += 1
+                    return self._scan_side(game_id, key, higher)
+                entries[position] = (value, book)
+                if position == 1 and value * sign > entries[0][0] * sign:
+                    entries.reverse()
+                return entries
+        if value is None:
+            return entries
+        if not entries or value * sign > entries[0][0] * sign:
+            return [(value, book)] + entries[:1]
+        if len(entries) < 2 or value * sign > entries[1][0] * sign:
+            return [entries[0], (value, book)]
+        return entries
+
+    # Function to list the arbitrage and middle opportunities of one game from its index
+    def check(self, game_id):
+        index = self.index[game_id]
+        home_team, away_team = self.games[game_id]
+        found = []
+
+        if index['home_moneyline'] and index['away_moneyline']:
+            (home_ml, home_book), (away_ml, away_book) = index['home_moneyline'][0], index['away_moneyline'][0]
+            home_decimal = moneyline_to_decimal(home_ml)
+            away_decimal = moneyline_to_decimal(away_ml)
+            implied_total = implied_probability(home_decimal) + implied_probability(away_decimal)
+            if implied_total < 1:
+                (home_stake, away_stake), payout = stake_split([home_decimal, away_decimal], self.total_stake)
+                margin = payout / self.total_stake - 1
+                if margin >= self.min_margin:
+                    found.append({
+                        'game_id': game_id, 'home_team': home_team, 'away_team': away_team,
+                        'type': 'arbitrage', 'market': 'moneyline',
+                        'implied_total': round(implied_total, 4),
+                        'margin': round(margin, 4),
+                        'guaranteed_profit': round(payout - self.total_stake, 2),
+                        'legs': [
+                            {'side': 'home', 'book': home_book, 'line': home_ml, 'decimal': home_decimal, 'stake': home_stake},
+                            {'side': 'away', 'book': away_book, 'line': away_ml, 'decimal': away_decimal, 'stake': away_stake}
+                        ]
+                    })
+
+        # Spread middle: home +h and away a both cover when the away team wins by more than -a and less than h
+        if index['home_spread'] and index['away_spread']:
+            (home_line, home_book), (away_line, away_book) = index['home_spread'][0], index['away_spread'][0]
+            if _middle_outcomes(-away_line, home_line):
+                found.append(self._middle(game_id, 'spread', -away_line, home_line,
+                                          ('home', home_book, home_line), ('away', away_book, away_line)))
+
+        # Total middle: over the lowest total and under the highest both win for totals in between
+        if index['over'] and index['under']:
+            (low, over_book), (high, under_book) = index['over'][0], index['under'][0]
+            if _middle_outcomes(low, high):
+                found.append(self._middle(game_id, 'total', low, high,
+                                          ('over', over_book, low), ('under', under_book, high)))
+        return found
+
+    def _middle(self, game_id, market, low, high, first, second):
+        home_team, away_team = self.games[game_id]
+        decimal = self.juice_decimal
+        payout = self.middle_payout
+        return {
+            'game_id': game_id, 'home_team': home_team, 'away_team': away_team,
+            'type': 'middle', 'market': market,
+            'width': round(high - low, 2),
+            'middle_outcomes': _middle_outcomes(low, high),
+            # Both legs win inside the window; outside it one wins and one loses
+            'middle_profit': round(2 * payout - self.total_stake, 2),
+            'miss_loss': round(payout - self.total_stake, 2),
+            'legs': [
+                {'side': side, 'book': book, 'line': line, 'decimal': decimal, 'stake': stake}
+                for (side, book, line), stake in zip((first, second), self.middle_stakes)
+            ]
+        }
+
+    # Function to get the best and second-best quotes for a game and side
+    def top_quotes(self, game_id, side):
+        return list(self.index[game_id][side])
+
+    # Function to list current opportunities: arbitrage by margin, then middles by width
+    def opportunities(self, kind=None):
+        found = [item for items in self.found.values() for item in items
+                 if kind is None or item['type'] == kind]
+        return sorted(found, key=lambda item: (item['type'] != 'arbitrage', -item.get('margin', item.get('width', 0))))
+
+
+# Function to scan a whole odds list once, returns the opportunities
+def scan_slate(team_odds, total_stake=100.0, juice=STANDARD_JUICE, min_margin=0.0, kind=None):
+    scanner = ArbitrageScanner(team_odds, total_stake, juice, min_margin)
+    return scanner.opportunities(kind)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan an odds file for arbitrage and middles.")
+    parser.add_argument('odds', help="Odds file (JSON list of games with per-book lines)")
+    parser.add_argument('--stake', type=float, default=100.0, help="Total stake to split across legs")
+    parser.add_argument('--kind', choices=['arbitrage', 'middle'], help="Only show one kind")
+    args = parser.parse_args()
+
+    with open(args.odds, 'r') as file:
+        team_odds = json.load(file)
+    for item in scan_slate(team_odds, args.stake, kind=args.kind):
+        legs = ", ".join(f"{leg['side']} {leg['line']} @ {leg['book']} (stake {leg['stake']})" for leg in item['legs'])
+        if item['type'] == 'arbitrage':
+            print(f"{item['away_team']} @ {item['home_team']}: moneyline arbitrage, margin {item['margin'] * 100:.2f}% "
+                  f"(+{item['guaranteed_profit']}): {legs}")
+        else:
+            print(f"{item['away_team']} @ {item['home_team']}: {item['market']} middle, width {item['width']} "
+                  f"(+{item['middle_profit']} / {item['miss_loss']}): {legs}")
+
+
+if __name__ == "__main__":
+    main()
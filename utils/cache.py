@@ -0,0 +1,91 @@
+import json
+from collections import OrderedDict
+from datetime import date
+
+from utils.schedule_index import date_ordinal
+
+
+# Function to hash one or more weight dicts so different weightings get different cache entries
+def weights_hash(*weight_dicts):
+    return hash(tuple(tuple(sorted((weights or {}).items())) for weights in weight_dicts))
+
+
+# Function to fingerprint the other inputs a cached value depends on (e.g. a team's injury list)
+def inputs_key(inputs):
+    return None if inputs is None else json.dumps(inputs, sort_keys=True, default=str)
+
+
+# LRU cache for per-team results (team scores, penalties) keyed by
+# (kind, team, stats version, schedule version, as-of date, weights hash, inputs fingerprint).
+# Bumping a team's stats or schedule version drops only that team's affected entries; values that
+# depend on data callers may change in place (injuries) pass it as inputs so a change is a new key.
+class TeamCache:
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._team_keys = {}
+        self.stats_versions = {}
+        self.schedule_versions = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _key(self, kind, team, as_of, weights_key, uses_schedule, inputs):
+        schedule_version = self.schedule_versions.get(team, 0) if uses_schedule else None
+        as_of = date_ordinal(as_of or date.today()) if uses_schedule else None
+        return (kind, team, self.stats_versions.get(team, 0), schedule_version, as_of, weights_key, inputs_key(inputs))
+
+    # Function to return a cached value or compute, store and return it
+    # uses_schedule=False for values (like team scores) that don't depend on the schedule or date
+    def get_or_compute(self, kind, team, compute, as_of=None, weights_key=None, uses_schedule=True, inputs=None):
+        key = self._key(kind, team, as_of, weights_key, uses_schedule, inputs)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        value = compute()
+        self._entries[key] = value
+        self._team_keys.setdefault(team, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            old_key, _ = self._entries.popitem(last=False)
+            self._team_keys.get(old_key[1], set()).discard(old_key)
+            self.evictions += 1
+        return value
+
+    def _invalidate(self, team, uses_schedule_only):
+        for key in list(self._team_keys.get(team, ())):
+            # key[3] is the schedule version, None for entries that don't depend on the schedule
+            if uses_schedule_only and key[3] is None:
+                continue
+            self._entries.pop(key, None)
+            self._team_keys[team].discard(key)
+
+    # Function to record new stats (or injuries) for a team, drops only that team's entries
+    def update_stats(self, team):
+        self.stats_versions[team] = self.stats_versions.get(team, 0) + 1
+        self._invalidate(team, uses_schedule_only=False)
+
+    # Function to record a new schedule for a team, drops only that team's schedule-dependent entries
+    def update_schedule(self, team):
+        self.schedule_versions[team] = self.schedule_versions.get(team, 0) + 1
+        self._invalidate(team, uses_schedule_only=True)
+
+    def clear(self):
+        self._entries.clear()
+        self._team_keys.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,407 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# Bumped whenever the on-disk layout changes so older cache entries are rebuilt
+FORMAT_VERSION = 2
+
+SCALARS = (bool, int, float, str)
+ABSENT = object()
+
+# Per-value state codes, only stored for columns where some value is not a plain present value
+PRESENT, NULL, MISSING, INT_AS_FLOAT = 0, 1, 2, 3
+
+
+# Function to build the column path of a record field. '.' and '/' separate fields and child tables,
+# so they are backslash-escaped in keys (as are '\\' and a leading '_', which would clash with __key__):
+# {'a.b': 1} and {'a': {'b': 2}} get different columns, while plain keys like 'TS%' keep their name.
+def _field_path(prefix, key):
+    key = key.replace('\\', '\\\\').replace('.', '\\.').replace('/', '\\/')
+    if key.startswith('_'):
+        key = '\\' + key
+    return f"{prefix}.{key}" if prefix else key
+
+
+# Function to describe the shape of every value found at one path, so it can be stored column-wise:
+#   ['scalar'] / ['json']     one column (json for lists and mixed values, e.g. injuries)
+#   ['record', {key: shape}]  a dict with fixed keys, flattened into dotted columns (team_stats.Ortg)
+#   ['rows', record]          a list of dicts, stored as a child table (players, schedule games)
+#   ['mapping', shape]        a dict keyed by name with dict/list values, child table with a __key__
+#                             column (teams in the stats file, books in an odds dict)
+def _infer_shape(values):
+    if all(value is None or isinstance(value, SCALARS) for value in values):
+        return ['scalar']
+
+    if all(isinstance(value, dict) for value in values) and any(values):
+        inner = [item for value in values for item in value.values()]
+        if all(isinstance(item, dict) for item in inner) or all(_is_rows(item) for item in inner):
+            return ['mapping', _infer_shape(inner)]
+        return _record_shape(values)
+
+    if all(_is_rows(value) for value in values) and any(values):
+        return ['rows', _record_shape([item for value in values for item in value])]
+
+    return ['json']
+
+
+def _is_rows(value):
+    return isinstance(value, list) and all(isinstance(item, dict) for item in value)
+
+
+def _record_shape(dicts):
+    keys = {}
+    for value in dicts:
+        for key in value:
+            keys.setdefault(key, None)
+    return ['record', {key: _infer_shape([value[key] for value in dicts if key in value]) for key in keys}]
+
+
+class _TableBuilder:
+    def __init__(self, name, rows):
+        self.name = name
+        self.rows = rows
+        self.columns = {}
+
+
+# Encodes whole columns at a time: each call handles the values at one path for every row of a table
+class _Encoder:
+    def __init__(self):
+        self.tables = {}
+        self.strings = {}
+
+    def table(self, name, rows):
+        self.tables[name] = _TableBuilder(name, rows)
+        return self.tables[name]
+
+    # Function to store values (one per row of table, ABSENT where missing) under the column prefix
+    def encode(self, table, prefix, shape, values):
+        kind = shape[0]
+        if kind == 'scalar':
+            table.columns[prefix] = {'kind': 'scalar', 'values': values}
+        elif kind == 'json':
+            table.columns[prefix] = {'kind': 'json', 'values': [
+                value if value is ABSENT else json.dumps(value) for value in values
+            ]}
+        elif kind == 'record':
+            # A presence column tells an absent record apart from one with every field absent
+            # (rows of a child table are always present, so they have none)
+            if prefix:
+                table.columns[prefix] = {'kind': 'present', 'values': values}
+            for key, field_shape in shape[1].items():
+                fields = [ABSENT if value is ABSENT else value.get(key, ABSENT) for value in values]
+                self.encode(table, _field_path(prefix, key), field_shape, fields)
+        else:
+            table.columns[prefix] = {'kind': kind, 'values': [
+                value if value is ABSENT else len(value) for value in values
+            ]}
+            present = [value for value in values if value is not ABSENT]
+            if kind == 'mapping':
+                items = [item for value in present for item in value.values()]
+                child = self.table(f"{table.name}/{prefix}", len(items))
+                child.columns['__key__'] = {'kind': 'scalar', 'values': [key for value in present for key in value]}
+            else:
+                items = [item for value in present for item in value]
+                child = self.table(f"{table.name}/{prefix}", len(items))
+            self.encode(child, '', shape[1], items)
+
+    def intern(self, text):
+        string_id = self.strings.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings[text] = string_id
+        return string_id
+
+    # Function to turn one column of Python values into (kind, values array, state array or None)
+    def finish_column(self, kind, values):
+        codes = [MISSING if value is ABSENT else NULL if value is None else PRESENT for value in values]
+        state = np.array(codes, dtype=np.int8)
+        present = [value for value, code in zip(values, codes) if code == PRESENT] if state.any() else values
+
+        if kind in ('rows', 'mapping'):
+            array = np.array([value if isinstance(value, int) else 0 for value in values], dtype=np.int64)
+        elif kind == 'present':
+            array = None
+        elif kind == 'scalar' and all(type(value) is bool for value in present):
+            kind = 'bool'
+            array = np.array([value is True for value in values], dtype=np.uint8)
+        elif kind == 'scalar' and all(type(value) is int and -2**63 <= value < 2**63 for value in present):
+            kind = 'int'
+            array = np.array([value if type(value) is int else 0 for value in values], dtype=np.int64)
+        elif kind == 'scalar' and all(type(value) in (int, float) for value in present):
+            kind = 'float'
+            array = np.array([value if type(value) in (int, float) else np.nan for value in values], dtype=np.float64)
+            # Keep 52.0 vs 52 apart so the rebuilt data matches the JSON exactly
+            state[[index for index, value in enumerate(values) if type(value) is int]] = INT_AS_FLOAT
+        else:
+            if kind == 'scalar' and not all(type(value) is str for value in present):
+                kind = 'json'
+                values = [value if value is ABSENT or value is None else json.dumps(value) for value in values]
+            kind = 'str' if kind == 'scalar' else kind
+            array = np.array([self.intern(value) if isinstance(value, str) else -1 for value in values],
+                             dtype=np.int32)
+
+        return kind, array, (state if state.any() else None)
+
+
+# A memory-mapped cache entry: column arrays, the string table and the shape needed to rebuild the JSON
+class ColumnarFile:
+    def __init__(self, directory, meta):
+        self.directory = directory
+        self.meta = meta
+        self._strings = None
+
+    def _load(self, filename, rows):
+        path = os.path.join(self.directory, filename)
+        # Empty arrays cannot be memory-mapped
+        return np.load(path, mmap_mode='r' if rows else None)
+
+    def tables(self):
+        return list(self.meta['tables'])
+
+    def columns(self, table):
+        return list(self.meta['tables'][table]['columns'])
+
+    def rows(self, table):
+        return self.meta['tables'][table]['rows']
+
+    # Function to get the raw column array (string columns hold ids into strings())
+    def column(self, table, name):
+        info = self.meta['tables'][table]['columns'][name]
+        return self._load(info['file'], self.rows(table)) if info.get('file') else None
+
+    def state(self, table, name):
+        info = self.meta['tables'][table]['columns'][name]
+        return self._load(info['state'], self.rows(table)) if info.get('state') else None
+
+    # Function to get the string table, decoded once from a single UTF-8 blob
+    def strings(self):
+        if self._strings is None:
+            count = self.meta['strings']
+            if not count:
+                self._strings = []
+            else:
+                text = bytes(self._load('strings.npy', count)).decode('utf-8')
+                offsets = self._load('string_offsets.npy', count + 1).tolist()
+                self._strings = [text[offsets[i]:offsets[i + 1]] for i in range(count)]
+        return self._strings
+
+    # Function to stack float/int columns into a (rows, columns) matrix, e.g. for batch scoring
+    def matrix(self, table, names):
+        return np.column_stack([np.asarray(self.column(table, name), dtype=float) for name in names])
+
+    # Function to rebuild the original JSON value (same structure and int/float types; record keys
+    # come back in first-seen order, which matches the source when its rows share a key order)
+    def to_python(self):
+        root = self._decode(self.meta['root_table'], 'data', self.meta['shape'], self.rows(self.meta['root_table']))
+        return root[0]
+
+    def _decode_column(self, table, name, rows):
+        info = self.meta['tables'][table]['columns'][name]
+        kind = info['kind']
+        state = self.state(table, name)
+        if kind == 'present':
+            values = [True] * rows
+        else:
+            values = self.column(table, name).tolist()
+            if kind == 'bool':
+                values = [value == 1 for value in values]
+            elif kind in ('str', 'json'):
+                strings = self.strings()
+                values = [strings[value] if value >= 0 else None for value in values]
+                if kind == 'json':
+                    values = [json.loads(value) if value is not None else None for value in values]
+
+        if state is not None:
+            for index, code in enumerate(state.tolist()):
+                if code == NULL:
+                    values[index] = None
+                elif code == MISSING:
+                    values[index] = ABSENT
+                elif code == INT_AS_FLOAT:
+                    values[index] = int(values[index])
+        return values
+
+    # Function to decode the value stored at prefix for every row of table (ABSENT where missing)
+    def _decode(self, table, prefix, shape, rows):
+        kind = shape[0]
+        if kind in ('scalar', 'json'):
+            return self._decode_column(table, prefix, rows)
+
+        if kind == 'record':
+            present = self._decode_column(table, prefix, rows) if prefix else [True] * rows
+            fields = [
+                (key, self._decode(table, _field_path(prefix, key), field_shape, rows))
+                for key, field_shape in shape[1].items()
+            ]
+            records = []
+            for index in range(rows):
+                if present[index] is ABSENT:
+                    records.append(ABSENT)
+                    continue
+                record = {}
+                for key, values in fields:
+                    value = values[index]
+                    if value is not ABSENT:
+                        record[key] = value
+                records.append(record)
+            return records
+
+        # rows / mapping: split the child table by the per-row counts
+        counts = self._decode_column(table, prefix, rows)
+        child = f"{table}/{prefix}"
+        child_rows = self.rows(child) if child in self.meta['tables'] else 0
+        items = self._decode(child, '', shape[1], child_rows) if child_rows else []
+        keys = self._decode_column(child, '__key__', child_rows) if kind == 'mapping' and child_rows else []
+
+        values = []
+        start = 0
+        for count in counts:
+            if count is ABSENT or count is None:
+                values.append(count)
+                continue
+            end = start + count
+            if kind == 'mapping':
+                values.append(dict(zip(keys[start:end], items[start:end])))
+            else:
+                values.append(items[start:end])
+            start = end
+        return values
+
+
+# Cache of JSON input files converted to columnar .npy arrays plus a string table.
+# Entries are reused (memory-mapped) while the source file's size and mtime are unchanged.
+# When only the mtime changed (file touched or copied) the content hash decides; verify_hash
+# always checks the hash.
+class ColumnarCache:
+    def __init__(self, cache_dir='.columnar_cache', verify_hash=False):
+        self.cache_dir = cache_dir
+        self.verify_hash = verify_hash
+        self.hits = 0
+        self.misses = 0
+        self.rehashes = 0
+
+    def entry_dir(self, path):
+        key = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, key)
+
+    def _read_meta(self, directory):
+        try:
+            with open(os.path.join(directory, 'meta.json'), 'r') as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_meta(self, directory, meta):
+        temp_file = os.path.join(directory, 'meta.json.tmp')
+        with open(temp_file, 'w') as file:
+            json.dump(meta, file)
+        os.replace(temp_file, os.path.join(directory, 'meta.json'))
+
+    # Function to check a cache entry against the source file, returns its meta or None if stale
+    def _fresh_meta(self, path, directory):
+        meta = self._read_meta(directory)
+        if meta is None or meta.get('version') != FORMAT_VERSION:
+            return None
+        source = os.stat(path)
+        if source.st_size != meta['size']:
+            return None
+        if source.st_mtime_ns == meta['mtime_ns'] and not self.verify_hash:
+            return meta
+
+        self.rehashes += 1
+        with open(path, 'rb') as file:
+            digest = hashlib.sha256(file.read()).hexdigest()
+        if digest != meta['sha256']:
+            return None
+        if source.st_mtime_ns != meta['mtime_ns']:
+            meta['mtime_ns'] = source.st_mtime_ns
+            self._write_meta(directory, meta)
+        return meta
+
+    # Function to open a file's cache entry, converting the JSON first if it is missing or stale
+    def open(self, path):
+        directory = self.entry_dir(path)
+        meta = self._fresh_meta(path, directory)
+        if meta is not None:
+            self.hits += 1
+            return ColumnarFile(directory, meta)
+        self.misses += 1
+        return self.build(path)
+
+    # Function to get the file's contents as Python data, the same value json.load would return
+    def load(self, path):
+        return self.open(path).to_python()
+
+    # Function to convert a JSON file into a new cache entry
+    def build(self, path):
+        source = os.stat(path)
+        with open(path, 'rb') as file:
+            raw = file.read()
+        data = json.loads(raw)
+
+        encoder = _Encoder()
+        shape = _infer_shape([data])
+        encoder.encode(encoder.table('root', 1), 'data', shape, [data])
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_dir = tempfile.mkdtemp(prefix='.build-', dir=self.cache_dir)
+        tables = {}
+        file_index = 0
+        for name, table in encoder.tables.items():
+            columns = {}
+            for column_name, column in table.columns.items():
+                kind, array, state = encoder.finish_column(column['kind'], column['values'])
+                info = {'kind': kind, 'file': None, 'state': None}
+                if array is not None:
+                    info['file'] = f"col_{file_index}.npy"
+                    np.save(os.path.join(temp_dir, info['file']), array)
+                if state is not None:
+                    info['state'] = f"col_{file_index}_state.npy"
+                    np.save(os.path.join(temp_dir, info['state']), state)
+                file_index += 1
+                columns[column_name] = info
+            tables[name] = {'rows': table.rows, 'columns': columns}
+
+        # String table: one UTF-8 blob and character offsets into it
+        strings = list(encoder.strings)
+        offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(text) for text in strings], dtype=np.int64)
+        np.save(os.path.join(temp_dir, 'strings.npy'),
+                np.frombuffer(''.join(strings).encode('utf-8'), dtype=np.uint8))
+        np.save(os.path.join(temp_dir, 'string_offsets.npy'), offsets)
+
+        meta = {
+            'version': FORMAT_VERSION,
+            'source': os.path.abspath(path),
+            'size': source.st_size,
+            'mtime_ns': source.st_mtime_ns,
+            'sha256': hashlib.sha256(raw).hexdigest(),
+            'shape': shape,
+            'root_table': 'root',
+            'strings': len(strings),
+            'tables': tables
+        }
+        self._write_meta(temp_dir, meta)
+
+        # Swap the finished entry into place; if another process got there first, keep theirs
+        directory = self.entry_dir(path)
+        shutil.rmtree(directory, ignore_errors=True)
+        try:
+            os.replace(temp_dir, directory)
+        except OSError:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            existing = self._read_meta(directory)
+            if existing is not None:
+                return ColumnarFile(directory, existing)
+            raise
+        return ColumnarFile(directory, meta)
+
+    def clear(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'rehashes': self.rehashes}
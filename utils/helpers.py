@@ -1,3 +1,26 @@
+import json
+
+
+# Function to load a JSON input file, returns [] (and says so) when it is missing
+# input_cache (a ColumnarCache) loads the file from its binary cache instead of re-parsing the JSON
+def file_opener(filename, input_cache=None):
+    try:
+        if input_cache is not None:
+            return input_cache.load(filename)
+        with open(filename, 'r') as file:
+            data = json.load(file)
+            return data
+    except FileNotFoundError:
+        print(f"{filename} NOT FOUND")
+        return []
+
+def list_to_dict(list_of_dicts, key_name):
+    team_dict = {}
+    for dictionary in list_of_dicts:
+        key = dictionary[key_name]
+        team_dict[key] = dictionary
+    return team_dict
+
 def normalize(value, min_val, max_val):
     #normalize value
     return(value - min_val) / (max_val - min_val) if max_val > min_val else 0
@@ -18,6 +41,9 @@ def find_best_lines(game):
 
         for book, lines in game['odds'].items():
             value = lines.get(line_type)
+            if value is None:
+                # Book doesn't quote this line
+                continue
 
             #define comp logic based on type
             if 'moneyline' in line_type:
@@ -53,4 +79,31 @@ def moneyline_to_decimal(ml):
 
 def normalize_team_score(value, max_value):
     adjusted = (max_value + 1 - value)
-    return adjusted / max_value
\ No newline at end of file
+    return adjusted / max_value
+
+def parse_record(record_str):
+    try:
+        wins, losses = map(int, record_str.split('-'))
+        return wins / (wins + losses) if (wins + losses) > 0 else 0
+    except:
+        return 0
+
+# Function to turn both teams' model win probabilities and the best lines into a matchup result
+def game_result(game, best_lines, home_win_prob, away_win_prob):
+    home_decimal = moneyline_to_decimal(best_lines['home_moneyline']['value'])
+    away_decimal = moneyline_to_decimal(best_lines['away_moneyline']['value'])
+
+    home_market_prob = implied_probability(home_decimal)
+    away_market_prob = implied_probability(away_decimal)
+
+    return {
+        'home_team': game['home_team'],
+        'away_team': game['away_team'],
+        'home_chance': round(home_win_prob * 100, 1),
+        'away_chance': round(away_win_prob * 100, 1),
+        'home_edge': calculate_edge(home_win_prob, home_market_prob),
+        'away_edge': calculate_edge(away_win_prob, away_market_prob),
+        'best_lines': best_lines,
+        'home_market_chance': home_market_prob,
+        'away_market_chance': away_market_prob
+    }
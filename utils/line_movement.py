@@ -0,0 +1,403 @@
+import argparse
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import datetime, timezone
+
+from utils.helpers import moneyline_to_decimal
+from utils.streaming import iter_records
+
+LINE_TYPES = ('home_moneyline', 'away_moneyline', 'home_spread', 'away_spread', 'over_under')
+
+# Values are stored as integer hundredths and timestamps as integer milliseconds
+VALUE_SCALE = 100
+TIME_SCALE = 1000
+# Ticks per block: each block starts with an absolute (time, value) and the book quotes before it,
+# the rest of the block is deltas. Queries bisect the block starts and decode one block forward.
+BLOCK = 64
+# Largest deltas the columns hold (uint32 milliseconds, about 49 days; int32 hundredths). A tick
+# further from the previous one starts a new block instead.
+MAX_TIME_DELTA = 2 ** 32 - 1
+MAX_VALUE_DELTA = 2 ** 31 - 1
+# Ticks kept per game and line type before the oldest blocks are dropped
+MAX_TICKS = 10000
+
+# Steam: at least STEAM_BOOKS books move the same line the same way within STEAM_WINDOW seconds
+STEAM_WINDOW = 60.0
+STEAM_BOOKS = 3
+# Reverse line movement: the public backs one side (share of bets >= PUBLIC_THRESHOLD) while the
+# consensus line has moved at least this far toward the other side since open
+PUBLIC_THRESHOLD = 0.6
+RLM_MOVE = {
+    'moneyline': 0.01,
+    'spread': 0.5
+}
+
+
+# Function to convert a timestamp (epoch seconds, datetime or ISO string, naive = UTC) to epoch milliseconds
+def to_millis(timestamp):
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        timestamp = timestamp.timestamp()
+    return round(timestamp * TIME_SCALE)
+
+
+# Function to score how strongly a line favors its side: implied probability for moneylines,
+# points given for spreads, the total for over_under (higher = toward the over)
+def line_score(line_type, value):
+    if 'moneyline' in line_type:
+        return 1 / moneyline_to_decimal(value)
+    if 'spread' in line_type:
+        return -value
+    return value
+
+
+# Function to name the side a line moved toward (+1 = the series' own side, or the over)
+def _toward(line_type, direction):
+    if line_type == 'over_under':
+        return 'over' if direction > 0 else 'under'
+    side = line_type.split('_')[0]
+    return side if direction > 0 else ('away' if side == 'home' else 'home')
+
+
+# Append-only quote history for one game and line type, every book's ticks interleaved in time order.
+# Columns are typed arrays: time and value deltas plus a book id, about 10 bytes per tick.
+# Every BLOCK ticks (or sooner, after a gap too long for a delta) a block starts with the absolute
+# time/value and the book quotes so far, so
+# as_of and range only decode the blocks they touch. Past max_ticks whole blocks are dropped
+# from the front (at most max_ticks + BLOCK - 1 ticks are kept); the block states still carry
+# the last quote of every book.
+class LineSeries:
+    def __init__(self, line_type, max_ticks=MAX_TICKS):
+        self.line_type = line_type
+        self.side = None if line_type == 'over_under' else line_type.split('_')[0]
+        self.max_ticks = max_ticks
+        self.times = array('I')
+        self.values = array('i')
+        self.books = array('H')
+        self.block_starts = array('q')
+        self.block_times = array('q')
+        self.block_values = array('q')
+        self.block_states = []
+        self.state = {}
+        self.last_time = None
+        self.last_value = None
+        self.trimmed = 0
+
+        # Detector state, updated as ticks arrive
+        self.scores = {}
+        self.score_sum = 0.0
+        self.open_sum = 0.0
+        self.moves = deque()
+        self.steam_until = {}
+        self.rlm = None
+
+    def __len__(self):
+        return len(self.books)
+
+    def append(self, time, book, value):
+        if self.last_time is not None and time < self.last_time:
+            raise ValueError("ticks must be appended in time order")
+        count = len(self.books)
+        if (self.block_starts and count - self.block_starts[-1] < BLOCK and time - self.last_time <= MAX_TIME_DELTA
+                and abs(value - self.last_value) <= MAX_VALUE_DELTA):
+            self.times.append(time - self.last_time)
+            self.values.append(value - self.last_value)
+        else:
+            while len(self.block_starts) > 1 and count - self.block_starts[1] >= self.max_ticks:
+                self._trim()
+                count = len(self.books)
+            self.block_starts.append(len(self.books))
+            state = array('i')
+            for state_book, state_value in self.state.items():
+                state.append(state_book)
+                state.append(state_value)
+            self.block_times.append(time)
+            self.block_values.append(value)
+            self.block_states.append(state)
+            self.times.append(0)
+            self.values.append(0)
+        self.books.append(book)
+        self.state[book] = value
+        self.last_time = time
+        self.last_value = value
+
+    def _trim(self):
+        size = self.block_starts[1]
+        del self.times[:size]
+        del self.values[:size]
+        del self.books[:size]
+        del self.block_starts[:1]
+        for index in range(len(self.block_starts)):
+            self.block_starts[index] -= size
+        del self.block_times[:1]
+        del self.block_values[:1]
+        del self.block_states[:1]
+        self.trimmed += size
+
+    # Function to decode one block: yields (time, book, value) from its first tick
+    def _block(self, block):
+        start = self.block_starts[block]
+        end = self.block_starts[block + 1] if block + 1 < len(self.block_starts) else len(self.books)
+        times, values, books = self.times, self.values, self.books
+        time = self.block_times[block]
+        value = self.block_values[block]
+        yield time, books[start], value
+        for position in range(start + 1, end):
+            time += times[position]
+            value += values[position]
+            yield time, books[position], value
+
+    # Function to yield the stored (time, book, value) ticks with start <= time <= end (None = open)
+    def range(self, start=None, end=None):
+        if not self.books:
+            return
+        block = max(0, bisect_left(self.block_times, start) - 1) if start is not None else 0
+        for index in range(block, len(self.block_times)):
+            for time, book, value in self._block(index):
+                if end is not None and time > end:
+                    return
+                if start is None or time >= start:
+                    yield time, book, value
+
+    # Function to get {book: value} after every tick at or before time
+    def state_as_of(self, time):
+        block = bisect_right(self.block_times, time) - 1
+        if block < 0:
+            # Before the first stored tick: only the quotes from dropped blocks are known
+            state = self.block_states[0] if self.block_states else ()
+            return dict(zip(state[::2], state[1::2]))
+        state = self.block_states[block]
+        quotes = dict(zip(state[::2], state[1::2]))
+        for tick_time, book, value in self._block(block):
+            if tick_time > time:
+                break
+            quotes[book] = value
+        return quotes
+
+    def consensus(self):
+        return self.score_sum / len(self.scores) if self.scores else None
+
+    def nbytes(self):
+        columns = (self.times, self.values, self.books, self.block_starts, self.block_times, self.block_values)
+        return (sum(column.itemsize * len(column) for column in columns)
+                + sum(state.itemsize * len(state) for state in self.block_states))
+
+
+# Store of per-book quote ticks for every game and line type, with movement detectors run as
+# ticks arrive. Only changed quotes are stored (a re-polled unchanged line is not a tick).
+# record() returns the signals a tick raised:
+#   steam                   steam_books+ books moved the line the same way within steam_window seconds
+#   reverse_line_movement   the consensus moved against the side most public bets are on (needs record_public)
+# closing_line_value() compares a bet's line with the current consensus (the close once the game starts),
+# in probability for moneylines and points for spreads and totals; positive = beat the close.
+class LineMovementStore:
+    def __init__(self, max_ticks=MAX_TICKS, steam_window=STEAM_WINDOW, steam_books=STEAM_BOOKS,
+                 public_threshold=PUBLIC_THRESHOLD, rlm_move=None):
+        self.max_ticks = max_ticks
+        self.steam_window = round(steam_window * TIME_SCALE)
+        self.steam_books = steam_books
+        self.public_threshold = public_threshold
+        self.rlm_move = rlm_move or RLM_MOVE
+        self.games = {}
+        self.book_ids = {}
+        self.book_names = []
+        self.public = {}
+        self.bets = []
+        self.ticks = 0
+        self.signal_counts = {}
+
+    def _book_id(self, book):
+        book_id = self.book_ids.get(book)
+        if book_id is None:
+            book_id = self.book_ids[book] = len(self.book_names)
+            self.book_names.append(book)
+        return book_id
+
+    def series(self, game_id, line_type):
+        return self.games.get(game_id, {}).get(line_type)
+
+    # Function to store one book's quote for a game and line type, returns the signals it raised
+    def record(self, game_id, book, line_type, value, timestamp):
+        if value is None:
+            return []
+        game = self.games.get(game_id)
+        if game is None:
+            game = self.games[game_id] = {}
+        series = game.get(line_type)
+        if series is None:
+            series = game[line_type] = LineSeries(line_type, self.max_ticks)
+        book_id = self.book_ids.get(book)
+        if book_id is None:
+            book_id = self._book_id(book)
+        scaled = round(value * VALUE_SCALE)
+        if series.state.get(book_id) == scaled:
+            return []
+        time = round(timestamp * TIME_SCALE) if isinstance(timestamp, (int, float)) else to_millis(timestamp)
+        series.append(time, book_id, scaled)
+        self.ticks += 1
+        return self._detect(game_id, series, book_id, value, time)
+
+    # Function to store every quote of an odds entry ({'home_team', 'away_team', 'odds': {book: lines}}),
+    # the game id matches the analyzers' and the arbitrage scanner's
+    def record_game(self, game, timestamp):
+        game_id = f"{game.get('home_team')}_vs_{game.get('away_team')}"
+        signals = []
+        for book, lines in (game.get('odds') or {}).items():
+            for line_type in LINE_TYPES:
+                signals += self.record(game_id, book, line_type, lines.get(line_type), timestamp)
+        return signals
+
+    # Function to store a list of odds entries (e.g. one OddsPoller.poll_once), all at timestamp
+    def record_games(self, games, timestamp):
+        signals = []
+        for game in games:
+            signals += self.record_game(game, timestamp)
+        return signals
+
+    # Function to set the share of public bets on the home side (0-1), re-checks the game's sides
+    def record_public(self, game_id, home_share, timestamp=None):
+        self.public[game_id] = home_share
+        time = to_millis(timestamp) if timestamp is not None else None
+        signals = []
+        for line_type, series in self.games.get(game_id, {}).items():
+            signal = self._reverse_movement(game_id, series, time if time is not None else series.last_time)
+            if signal:
+                signals.append(signal)
+        return signals
+
+    def _signal(self, kind, game_id, series, time, **fields):
+        self.signal_counts[kind] = self.signal_counts.get(kind, 0) + 1
+        signal = {'kind': kind, 'game_id': game_id, 'line_type': series.line_type, 'timestamp': time / TIME_SCALE}
+        signal.update(fields)
+        return signal
+
+    def _detect(self, game_id, series, book, value, time):
+        score = line_score(series.line_type, value)
+        old = series.scores.get(book)
+        series.scores[book] = score
+        if old is None:
+            # A book's first quote is its opening line, not a move
+            series.score_sum += score
+            series.open_sum += score
+            return []
+        series.score_sum += score - old
+        if score == old:
+            return []
+        direction = 1 if score > old else -1
+        signals = []
+
+        moves = series.moves
+        moves.append((time, book, direction))
+        while moves[0][0] < time - self.steam_window:
+            moves.popleft()
+        if len(moves) >= self.steam_books and time >= series.steam_until.get(direction, time):
+            books = {move_book for _, move_book, move_direction in moves if move_direction == direction}
+        else:
+            books = ()
+        if len(books) >= self.steam_books:
+            # One signal per direction per window, however many books keep piling on
+            series.steam_until[direction] = time + self.steam_window
+            signals.append(self._signal('steam', game_id, series, time, toward=_toward(series.line_type, direction),
+                                        books=sorted(self.book_names[move_book] for move_book in books),
+                                        consensus=round(series.consensus(), 4)))
+
+        if series.side is not None and game_id in self.public:
+            signal = self._reverse_movement(game_id, series, time)
+            if signal:
+                signals.append(signal)
+        return signals
+
+    def _reverse_movement(self, game_id, series, time):
+        share = self.public.get(game_id)
+        if share is None or series.side is None or not series.scores:
+            return None
+        move = series.consensus() - series.open_sum / len(series.scores)
+        home_move = move if series.side == 'home' else -move
+        threshold = self.rlm_move['moneyline' if 'moneyline' in series.line_type else 'spread']
+        if share >= self.public_threshold and home_move <= -threshold:
+            sharp = 'away'
+        elif share <= 1 - self.public_threshold and home_move >= threshold:
+            sharp = 'home'
+        else:
+            sharp = None
+        if sharp == series.rlm:
+            return None
+        series.rlm = sharp
+        if sharp is None:
+            return None
+        return self._signal('reverse_line_movement', game_id, series, time, public_side='home' if sharp == 'away' else 'away',
+                            sharp_side=sharp, public_home=share, move=round(home_move, 4))
+
+    # Function to measure a bet's line against the current consensus; side='under' for under bets
+    def closing_line_value(self, game_id, line_type, value, side=None):
+        series = self.series(game_id, line_type)
+        if series is None or not series.scores:
+            return None
+        clv = series.consensus() - line_score(line_type, value)
+        return round(-clv if side == 'under' else clv, 4)
+
+    # Function to follow a bet's closing-line value as quotes arrive (see bet_report)
+    def track_bet(self, game_id, line_type, value, side=None):
+        self.bets.append({'game_id': game_id, 'line_type': line_type, 'value': value, 'side': side})
+        return len(self.bets) - 1
+
+    def bet_report(self):
+        return [dict(bet, clv=self.closing_line_value(bet['game_id'], bet['line_type'], bet['value'], bet['side']))
+                for bet in self.bets]
+
+    # Function to list (timestamp, book, value) ticks of a game's line between start and end (inclusive)
+    def range(self, game_id, line_type, start=None, end=None):
+        series = self.series(game_id, line_type)
+        if series is None:
+            return []
+        start = to_millis(start) if start is not None else None
+        end = to_millis(end) if end is not None else None
+        names = self.book_names
+        return [(time / TIME_SCALE, names[book], value / VALUE_SCALE) for time, book, value in series.range(start, end)]
+
+    # Function to rebuild a game's odds as of a timestamp (latest when None), in the find_best_lines input shape
+    def as_of(self, game_id, timestamp=None):
+        time = to_millis(timestamp) if timestamp is not None else None
+        odds = {}
+        for line_type, series in self.games.get(game_id, {}).items():
+            quotes = series.state if time is None else series.state_as_of(time)
+            for book, value in quotes.items():
+                odds.setdefault(self.book_names[book], {})[line_type] = value / VALUE_SCALE
+        home, _, away = game_id.partition('_vs_')
+        return {'home_team': home, 'away_team': away, 'odds': odds}
+
+    def __len__(self):
+        return self.ticks
+
+    def stored_ticks(self):
+        return sum(len(series) for game in self.games.values() for series in game.values())
+
+    def nbytes(self):
+        return sum(series.nbytes() for game in self.games.values() for series in game.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay timestamped odds snapshots and report line-movement signals.")
+    parser.add_argument('snapshots', help="JSON/JSON Lines of {'timestamp', 'home_team', 'away_team', 'odds'} (backtest snapshots)")
+    parser.add_argument('--max-ticks', type=int, default=MAX_TICKS)
+    parser.add_argument('--steam-window', type=float, default=STEAM_WINDOW, help="Seconds")
+    parser.add_argument('--steam-books', type=int, default=STEAM_BOOKS)
+    args = parser.parse_args()
+
+    store = LineMovementStore(args.max_ticks, args.steam_window, args.steam_books)
+    snapshots = sorted(iter_records(args.snapshots), key=lambda snapshot: to_millis(snapshot['timestamp']))
+    for snapshot in snapshots:
+        for signal in store.record_game(snapshot, snapshot['timestamp']):
+            details = ', '.join(f"{key}: {value}" for key, value in signal.items()
+                                if key not in ('kind', 'game_id', 'line_type', 'timestamp'))
+            print(f"{datetime.fromtimestamp(signal['timestamp'], timezone.utc).isoformat()} {signal['kind']} "
+                  f"{signal['game_id']} {signal['line_type']} ({details})")
+    print(f"{store.ticks} ticks in {len(store.games)} games, {store.nbytes()} bytes stored, signals: {store.signal_counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import numpy as np
+
+# Team player-minutes per game (5 on the floor x 48 minutes)
+TEAM_MINUTES = 240.0
+# Ratings of the replacement-level player who absorbs an absent player's minutes
+REPLACEMENT_ORTG = 105.0
+REPLACEMENT_DRTG = 115.0
+
+# Lineup injury penalty: share of team score lost per point of net rating (Ortg - Drtg) lost, capped at max
+LINEUP_WEIGHTS = {
+    'net_rating': 0.03,
+    'max': 0.3
+}
+
+
+def _player_name(entry):
+    return entry.get('name') if isinstance(entry, dict) else entry
+
+
+# Player-level lineup impact for NBA teams.
+# Each player's minutes go to a replacement-level player when they are out, which moves the team's
+# Ortg/Drtg by MPG / TEAM_MINUTES * (replacement - player rating). Those per-player impacts are
+# computed once (one NumPy pass over every player in the league); a team's adjustment is the sum of
+# its absent players' impacts, kept as a running total so an injury report only touches the players
+# whose status changed. Injured names that aren't in the team's player list have no impact and are
+# reported by unknown_injuries.
+class LineupEngine:
+    def __init__(self, team_stats, weights=None, replacement_ortg=REPLACEMENT_ORTG, replacement_drtg=REPLACEMENT_DRTG,
+                 team_minutes=TEAM_MINUTES):
+        self.weights = weights or LINEUP_WEIGHTS
+        self.replacement = (replacement_ortg, replacement_drtg)
+        self.team_minutes = team_minutes
+        self.team_stats = {}
+        self.impacts = {}
+        self.out = {}
+        self.unknown = {}
+        self.deltas = {}
+        self.updates = 0
+
+        teams = list(team_stats)
+        players = [data.get('players', []) for data in (team_stats[team] for team in teams)]
+        for team, impacts in zip(teams, self._impacts([player for roster in players for player in roster], players)):
+            self._add_team(team, team_stats[team], impacts)
+
+    # Function to compute {name: (Ortg change, Drtg change)} for every roster in one matrix pass
+    def _impacts(self, flat, rosters):
+        raw = np.array([(player.get('MPG') or 0, player.get('Ortg') or 0, player.get('Drtg') or 0) for player in flat],
+                       dtype=float).reshape(len(flat), 3)
+        # (players x 2): minutes share times the rating gap to replacement level
+        matrix = (raw[:, :1] / self.team_minutes) * (np.array(self.replacement) - raw[:, 1:])
+        rows = iter(matrix.tolist())
+        return [{player['name']: tuple(next(rows)) for player in roster} for roster in rosters]
+
+    def _add_team(self, team, data, impacts):
+        self.team_stats[team] = data.get('team_stats', {})
+        self.impacts[team] = impacts
+        self.out[team] = set()
+        self.unknown[team] = set()
+        self.deltas[team] = [0.0, 0.0]
+        self.set_injuries(team, data.get('injuries', []))
+
+    # Function to replace one team's stats and players (new roster), recomputing only that team
+    def update_team(self, team, data):
+        self._add_team(team, data, self._impacts(data.get('players', []), [data.get('players', [])])[0])
+
+    # Function to apply a team's new injury list, only players whose status changed are touched.
+    # Returns True when the team's adjustment changed.
+    def set_injuries(self, team, injuries):
+        impacts = self.impacts.get(team)
+        if impacts is None:
+            return False
+        self.updates += 1
+        injured = {_player_name(entry) for entry in injuries}
+        out = self.out[team]
+        delta = self.deltas[team]
+        returning = out - injured
+        ruled_out = {name for name in injured - out if name in impacts}
+        for name in returning:
+            d_ortg, d_drtg = impacts[name]
+            delta[0] -= d_ortg
+            delta[1] -= d_drtg
+        for name in ruled_out:
+            d_ortg, d_drtg = impacts[name]
+            delta[0] += d_ortg
+            delta[1] += d_drtg
+        out -= returning
+        out |= ruled_out
+        self.unknown[team] = injured - out
+        if not out:
+            # Reset the running total so rounding error can't build up over many reports
+            delta[0] = delta[1] = 0.0
+        return bool(returning or ruled_out)
+
+    # Function to recompute one team's adjustment from scratch (checks the running total)
+    def recompute(self, team):
+        impacts = self.impacts[team]
+        return (sum(impacts[name][0] for name in self.out[team]),
+                sum(impacts[name][1] for name in self.out[team]))
+
+    # Function to get (Ortg change, Drtg change) for a team's current lineup
+    def adjustments(self, team):
+        delta = self.deltas.get(team)
+        return (delta[0], delta[1]) if delta is not None else (0.0, 0.0)
+
+    # Function to get a team's Ortg and Drtg with its absent players replaced
+    def ratings_for(self, team):
+        stats = self.team_stats.get(team, {})
+        d_ortg, d_drtg = self.adjustments(team)
+        return stats.get('Ortg', 0) + d_ortg, stats.get('Drtg', 0) + d_drtg
+
+    # Function to copy a team's season stats with lineup-adjusted Ortg/Drtg
+    def adjusted_stats(self, team):
+        ortg, drtg = self.ratings_for(team)
+        return dict(self.team_stats.get(team, {}), Ortg=ortg, Drtg=drtg)
+
+    # Function to turn the net rating a team loses to injuries into a penalty (0 when it loses none)
+    def penalty(self, team, weights=None):
+        weights = weights or self.weights
+        d_ortg, d_drtg = self.adjustments(team)
+        lost = d_drtg - d_ortg
+        return min(weights['max'], max(0.0, lost * weights['net_rating']))
+
+    def unknown_injuries(self, team):
+        return sorted(self.unknown.get(team, ()))
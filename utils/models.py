@@ -0,0 +1,232 @@
+from utils.helpers import (
+    calculate_edge,
+    implied_probability,
+    moneyline_to_decimal,
+    win_probability
+)
+from utils.scoring import NBA_FEATURES
+
+LINE_TYPES = ('home_moneyline', 'away_moneyline', 'home_spread', 'away_spread', 'over_under')
+NBA_STAT_KEYS = tuple(feature[1] for feature in NBA_FEATURES)
+
+
+# Interns strings (team names, book names) to small integer ids so records store ints, not strings
+class NameTable:
+    __slots__ = ('ids', 'names')
+
+    def __init__(self, names=()):
+        self.ids = {}
+        self.names = []
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name):
+        name_id = self.ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self.ids[name] = name_id
+            self.names.append(name)
+        return name_id
+
+    def name(self, name_id):
+        return self.names[name_id] if name_id is not None else None
+
+    def __len__(self):
+        return len(self.names)
+
+
+class Team:
+    __slots__ = ('team_id', 'stats', 'injuries')
+
+    def __init__(self, team_id, stats, injuries=()):
+        self.team_id = team_id
+        # Stat values in NBA_STAT_KEYS order
+        self.stats = stats
+        self.injuries = injuries
+
+
+class OddsQuote:
+    __slots__ = ('book_id',) + LINE_TYPES
+
+    def __init__(self, book_id, home_moneyline, away_moneyline, home_spread, away_spread, over_under):
+        self.book_id = book_id
+        self.home_moneyline = home_moneyline
+        self.away_moneyline = away_moneyline
+        self.home_spread = home_spread
+        self.away_spread = away_spread
+        self.over_under = over_under
+
+    # Function to expand back into one book's {line_type: value} lines, line types without a quote left out
+    def to_lines(self):
+        lines = {}
+        for line_type in LINE_TYPES:
+            value = getattr(self, line_type)
+            if value is not None:
+                lines[line_type] = value
+        return lines
+
+
+class Matchup:
+    __slots__ = ('home_id', 'away_id', 'quotes', 'home_penalty', 'away_penalty')
+
+    def __init__(self, home_id, away_id, quotes, home_penalty=0.0, away_penalty=0.0):
+        self.home_id = home_id
+        self.away_id = away_id
+        self.quotes = quotes
+        self.home_penalty = home_penalty
+        self.away_penalty = away_penalty
+
+    # Function to expand back into the merged matchup shape ({'home_team', 'away_team', 'odds'})
+    def to_dict(self, teams, books):
+        return {
+            'home_team': teams.name(self.home_id),
+            'away_team': teams.name(self.away_id),
+            'odds': {books.name(quote.book_id): quote.to_lines() for quote in self.quotes}
+        }
+
+
+class AnalysisResult:
+    __slots__ = ('home_id', 'away_id', 'home_chance', 'away_chance', 'home_edge', 'away_edge',
+                 'home_market_chance', 'away_market_chance', 'best_books', 'best_values')
+
+    def __init__(self, home_id, away_id, home_chance, away_chance, home_edge, away_edge,
+                 home_market_chance, away_market_chance, best_books, best_values):
+        self.home_id = home_id
+        self.away_id = away_id
+        self.home_chance = home_chance
+        self.away_chance = away_chance
+        self.home_edge = home_edge
+        self.away_edge = away_edge
+        self.home_market_chance = home_market_chance
+        self.away_market_chance = away_market_chance
+        # Book ids and values of the best line per LINE_TYPES entry
+        self.best_books = best_books
+        self.best_values = best_values
+
+    # Function to expand back into the analyze_game dict shape
+    def to_dict(self, teams, books):
+        return {
+            'home_team': teams.name(self.home_id),
+            'away_team': teams.name(self.away_id),
+            'home_chance': self.home_chance,
+            'away_chance': self.away_chance,
+            'home_edge': self.home_edge,
+            'away_edge': self.away_edge,
+            'best_lines': {
+                line_type: {'book': books.name(book_id), 'value': value}
+                for line_type, book_id, value in zip(LINE_TYPES, self.best_books, self.best_values)
+            },
+            'home_market_chance': self.home_market_chance,
+            'away_market_chance': self.away_market_chance
+        }
+
+
+# Function to convert NBA team stats ({team: {'team_stats', 'injuries'}}) in one pass
+def teams_from_stats(team_stats, teams=None):
+    teams = teams if teams is not None else NameTable()
+    converted = {}
+    for name, data in team_stats.items():
+        stats = data.get('team_stats', {})
+        team_id = teams.intern(name)
+        converted[team_id] = Team(team_id, tuple(stats.get(key) for key in NBA_STAT_KEYS),
+                                  tuple(data.get('injuries', ())))
+    return converted, teams
+
+
+# Function to convert one per-book odds dict ({book: {line_type: value}}) into OddsQuote tuples
+def quotes_from_odds(odds, books):
+    return tuple(
+        OddsQuote(books.intern(book), *(lines.get(line_type) for line_type in LINE_TYPES))
+        for book, lines in (odds or {}).items()
+    )
+
+
+# Function to convert merged matchups (merge_data dict or merge_stats_and_odds list) in one pass
+def matchups_from_dicts(matchups, teams=None, books=None):
+    teams = teams if teams is not None else NameTable()
+    books = books if books is not None else NameTable()
+    values = matchups.values() if isinstance(matchups, dict) else matchups
+    converted = [
+        Matchup(
+            teams.intern(matchup['home_team']),
+            teams.intern(matchup['away_team']),
+            quotes_from_odds(matchup.get('odds'), books),
+            matchup.get('home_penalties', {}).get('total', 0.0),
+            matchup.get('away_penalties', {}).get('total', 0.0)
+        )
+        for matchup in values
+    ]
+    return converted, teams, books
+
+
+# Function to convert analyze_game result dicts in one pass
+def results_from_dicts(results, teams=None, books=None):
+    teams = teams if teams is not None else NameTable()
+    books = books if books is not None else NameTable()
+    converted = []
+    for result in results:
+        best_lines = result['best_lines']
+        converted.append(AnalysisResult(
+            teams.intern(result['home_team']),
+            teams.intern(result['away_team']),
+            result['home_chance'],
+            result['away_chance'],
+            result['home_edge'],
+            result['away_edge'],
+            result['home_market_chance'],
+            result['away_market_chance'],
+            tuple(books.intern(best_lines[line_type]['book']) if best_lines[line_type]['book'] is not None
+                  else None for line_type in LINE_TYPES),
+            tuple(best_lines[line_type]['value'] for line_type in LINE_TYPES)
+        ))
+    return converted, teams, books
+
+
+# Function to pick the best quote per line type, same rules as helpers.find_best_lines
+# Returns (book ids, values), each in LINE_TYPES order
+def best_quotes(quotes):
+    books = [None] * 5
+    values = [None] * 5
+    for quote in quotes:
+        line_values = (quote.home_moneyline, quote.away_moneyline, quote.home_spread,
+                       quote.away_spread, quote.over_under)
+        for index, value in enumerate(line_values):
+            if value is None:
+                # Book doesn't quote this line
+                continue
+            best = values[index]
+            # Moneylines and the home spread take the highest value, away spread and total the lowest
+            if best is None or (value > best if index < 3 else value < best):
+                books[index] = quote.book_id
+                values[index] = value
+    return tuple(books), tuple(values)
+
+
+# Function to analyze a compact matchup, same numbers as nba_analyzer.analyze_game
+# (sport='NFL' follows nfl_analyzer.analyze_game: no penalties, away probability scored separately)
+def analyze_matchup(matchup, home_score, away_score, sport='NBA'):
+    best_books, best_values = best_quotes(matchup.quotes)
+    home_market_prob = implied_probability(moneyline_to_decimal(best_values[0]))
+    away_market_prob = implied_probability(moneyline_to_decimal(best_values[1]))
+
+    if sport == 'NFL':
+        home_win_prob = win_probability(home_score, away_score)
+        away_win_prob = win_probability(away_score, home_score)
+    else:
+        home_adj_score = home_score * (1 - matchup.home_penalty)
+        away_adj_score = away_score * (1 - matchup.away_penalty)
+        home_win_prob = win_probability(home_adj_score, away_adj_score)
+        away_win_prob = 1 - home_win_prob
+
+    return AnalysisResult(
+        matchup.home_id,
+        matchup.away_id,
+        round(home_win_prob * 100, 1),
+        round(away_win_prob * 100, 1),
+        calculate_edge(home_win_prob, home_market_prob),
+        calculate_edge(away_win_prob, away_market_prob),
+        home_market_prob,
+        away_market_prob,
+        best_books,
+        best_values
+    )
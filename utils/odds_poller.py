@@ -0,0 +1,180 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+LINE_TYPES = ['home_moneyline', 'away_moneyline', 'home_spread', 'away_spread', 'over_under']
+
+
+# Counters for one poller, safe to update from worker threads
+class PollerMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+        self.errors = 0
+        self.bytes_received = 0
+        self.bytes_saved = 0
+        self.elapsed = 0.0
+
+    def record(self, status, received=0, saved=0):
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += received
+            self.bytes_saved += saved
+            if status == 304:
+                self.not_modified += 1
+            elif status is None or status >= 400:
+                self.errors += 1
+
+    def requests_per_second(self):
+        return self.requests / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        return {
+            'requests': self.requests,
+            'not_modified': self.not_modified,
+            'errors': self.errors,
+            'bytes_received': self.bytes_received,
+            'bytes_saved': self.bytes_saved,
+            'seconds': round(self.elapsed, 4),
+            'requests_per_second': round(self.requests_per_second(), 1)
+        }
+
+
+# Function to turn one book's payload into game entries
+# A payload is a list of games or a single game: {'home_team', 'away_team', <line types>...}
+# A game may also carry its lines under 'lines' instead of at the top level.
+# Line types the book doesn't quote are left out rather than set to None.
+def parse_book_payload(payload):
+    games = payload if isinstance(payload, list) else [payload]
+    parsed = []
+    for game in games:
+        if not isinstance(game, dict):
+            continue
+        lines = game.get('lines', game)
+        parsed.append((game.get('home_team'), game.get('away_team'),
+                       {line_type: lines[line_type] for line_type in LINE_TYPES
+                        if lines.get(line_type) is not None}))
+    return parsed
+
+
+# Function to merge every book's games into the find_best_lines input shape:
+# [{'home_team', 'away_team', 'odds': {book: {line_type: value}}}]
+def merge_book_payloads(book_payloads):
+    games = {}
+    for book, payload in book_payloads:
+        for home, away, lines in parse_book_payload(payload):
+            key = (home, away)
+            if key not in games:
+                games[key] = {'home_team': home, 'away_team': away, 'odds': {}}
+            games[key]['odds'][book] = lines
+    return list(games.values())
+
+
+# Polls many (book, url) endpoints concurrently over pooled keep-alive sessions.
+# Each URL remembers its ETag / Last-Modified so unchanged payloads come back as 304
+# and the previously parsed payload is reused.
+class OddsPoller:
+    def __init__(self, endpoints, workers=16, timeout=5.0, headers=None):
+        self.endpoints = list(endpoints)
+        self.workers = workers
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.metrics = PollerMetrics()
+        # url -> (etag, last_modified, payload, payload size in bytes)
+        self._validators = {}
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+
+    # One session per worker thread, each with a connection pool big enough for every host
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update(self.headers)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def _fetch(self, book, url):
+        cached = self._validators.get(url)
+        headers = {}
+        if cached:
+            etag, last_modified, _, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        try:
+            response = self._session().get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as error:
+            self.metrics.record(None)
+            print(f"Odds request failed for {book}: {error}")
+            # Fall back to the last good payload so one bad book doesn't drop the game
+            return book, cached[2] if cached else []
+
+        if response.status_code == 304 and cached:
+            self.metrics.record(304, saved=cached[3])
+            return book, cached[2]
+
+        body = response.content
+        self.metrics.record(response.status_code, received=len(body))
+        if response.status_code != 200:
+            print(f"Odds request for {book} returned {response.status_code}")
+            return book, cached[2] if cached else []
+
+        try:
+            payload = json.loads(body)
+        except ValueError as error:
+            print(f"Odds response for {book} is not valid JSON: {error}")
+            return book, cached[2] if cached else []
+        self._validators[url] = (
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified'),
+            payload,
+            len(body)
+        )
+        return book, payload
+
+    # Function to poll every endpoint once and return games ready for find_best_lines
+    def poll_once(self):
+        start = time.perf_counter()
+        futures = [self._pool.submit(self._fetch, book, url) for book, url in self.endpoints]
+        book_payloads = [future.result() for future in futures]
+        self.metrics.elapsed += time.perf_counter() - start
+        return merge_book_payloads(book_payloads)
+
+    # Function to poll on an interval and hand each snapshot to callback(games)
+    def run(self, callback, interval=5.0, iterations=None):
+        count = 0
+        while iterations is None or count < iterations:
+            started = time.monotonic()
+            callback(self.poll_once())
+            count += 1
+            if iterations is not None and count >= iterations:
+                break
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
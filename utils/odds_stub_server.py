@@ -0,0 +1,158 @@
+import hashlib
+import json
+import random
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for sportsbook odds APIs, used to test and load-test the poller offline.
+#   GET /odds/<book>          -> every game for that book
+#   GET /odds/<book>/<game>   -> one game (index into the game list)
+# Responses carry ETag and Last-Modified and honour If-None-Match / If-Modified-Since.
+
+
+# Function to make a deterministic set of game lines for one book
+def make_book_games(book_index, games, seed=0):
+    rng = random.Random(seed * 1000003 + book_index)
+    book_games = []
+    for game_index, (home, away) in enumerate(games):
+        spread = round(rng.uniform(-10, 10) * 2) / 2
+        favorite = -rng.randint(110, 300)
+        dog = rng.randint(100, 260)
+        home_ml, away_ml = (favorite, dog) if spread < 0 else (dog, favorite)
+        book_games.append({
+            'home_team': home,
+            'away_team': away,
+            'home_moneyline': home_ml,
+            'away_moneyline': away_ml,
+            'home_spread': spread,
+            'away_spread': -spread,
+            'over_under': round(rng.uniform(200, 240) * 2) / 2
+        })
+    return book_games
+
+
+class _Payload:
+    def __init__(self, data, timestamp):
+        self.body = json.dumps(data).encode()
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+        self.last_modified = formatdate(timestamp, usegmt=True)
+
+
+class StubOddsServer:
+    def __init__(self, books, games, host='127.0.0.1', port=0, seed=0):
+        self.books = list(books)
+        self.games = list(games)
+        self._lock = threading.Lock()
+        self._clock = 1_700_000_000
+        self._book_games = {book: make_book_games(i, self.games, seed) for i, book in enumerate(self.books)}
+        self._payloads = {}
+        for book in self.books:
+            self._refresh(book)
+
+        handler = self._make_handler()
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.host, self.port = self.httpd.server_address[:2]
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    # Function to list (book, url) endpoints for OddsPoller, per book or per book and game
+    def endpoints(self, per_game=False):
+        if not per_game:
+            return [(book, f"{self.base_url}/odds/{book}") for book in self.books]
+        return [(book, f"{self.base_url}/odds/{book}/{index}")
+                for book in self.books for index in range(len(self.games))]
+
+    def _refresh(self, book):
+        self._clock += 1
+        games = self._book_games[book]
+        self._payloads[book] = _Payload(games, self._clock)
+        for index, game in enumerate(games):
+            self._payloads[(book, index)] = _Payload(game, self._clock)
+
+    # Function to change one line so the next poll sees a new payload for that book
+    def move_line(self, book, game_index, line_type, value):
+        with self._lock:
+            self._book_games[book][game_index][line_type] = value
+            self._refresh(book)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parts = self.path.strip('/').split('/')
+                key = None
+                if len(parts) == 2 and parts[0] == 'odds':
+                    key = parts[1]
+                elif len(parts) == 3 and parts[0] == 'odds' and parts[2].isdigit():
+                    key = (parts[1], int(parts[2]))
+                with server._lock:
+                    payload = server._payloads.get(key)
+                if payload is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                if self.headers.get('If-None-Match') == payload.etag or \
+                        (self.headers.get('If-None-Match') is None and
+                         self.headers.get('If-Modified-Since') == payload.last_modified):
+                    self.send_response(304)
+                    self.send_header('ETag', payload.etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload.body)))
+                self.send_header('ETag', payload.etag)
+                self.send_header('Last-Modified', payload.last_modified)
+                self.end_headers()
+                self.wfile.write(payload.body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve stub sportsbook odds locally.")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--books', type=int, default=3)
+    parser.add_argument('--games', type=int, default=15)
+    args = parser.parse_args()
+
+    books = [f"Book{i}" for i in range(args.books)]
+    games = [(f"Team{2 * i}", f"Team{2 * i + 1}") for i in range(args.games)]
+    stub = StubOddsServer(books, games, port=args.port)
+    print(f"Serving stub odds on {stub.base_url}/odds/<book>[/<game>] for books: {', '.join(books)}")
+    try:
+        stub.httpd.serve_forever()
+    except KeyboardInterrupt:
+        stub.httpd.server_close()
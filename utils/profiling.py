@@ -0,0 +1,172 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STAGE_FIELDS = ('calls', 'items', 'wall_seconds', 'cpu_seconds', 'peak_memory_bytes', 'max_rss_bytes')
+
+
+def _max_rss_bytes():
+    if resource is None:
+        return 0
+    # ru_maxrss is kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add(self, items):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+# Stand-in used when profiling is off: stage() hands back one shared no-op context manager
+class NullProfiler:
+    enabled = False
+
+    def stage(self, name):
+        return _NULL_STAGE
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'items', 'wall', 'cpu')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.items = 0
+
+    def __enter__(self):
+        if self.profiler.track_memory:
+            tracemalloc.reset_peak()
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        peak = tracemalloc.get_traced_memory()[1] if self.profiler.track_memory else 0
+        self.profiler.record(self.name, wall, cpu, self.items, peak)
+        return False
+
+    # Function to count items processed by the stage (matchups merged, results printed, ...)
+    def add(self, items):
+        self.items += items
+
+
+# Per-stage wall time, CPU time, call and item counts and memory for one or more runs.
+# track_memory traces Python allocations (tracemalloc) for each stage's peak; it costs time, so it is
+# opt-in. Stages are not meant to be nested when tracking memory (each stage resets the peak).
+class StageProfiler:
+    enabled = True
+
+    def __init__(self, track_memory=False, labels=None):
+        self.track_memory = track_memory
+        self.labels = dict(labels or {})
+        self.stages = {}
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def record(self, name, wall, cpu, items=0, peak_memory=0):
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = dict.fromkeys(STAGE_FIELDS, 0)
+        stats['calls'] += 1
+        stats['items'] += items
+        stats['wall_seconds'] += wall
+        stats['cpu_seconds'] += cpu
+        stats['peak_memory_bytes'] = max(stats['peak_memory_bytes'], peak_memory)
+        stats['max_rss_bytes'] = _max_rss_bytes()
+
+    def stop(self):
+        if self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def to_dict(self):
+        return {'labels': self.labels, 'stages': {name: dict(stats) for name, stats in self.stages.items()}}
+
+    def write_json(self, filename):
+        with open(filename, 'w') as file:
+            json.dump(self.to_dict(), file, indent=4)
+
+    # Function to render the stages in the Prometheus text exposition format
+    def prometheus_text(self, prefix='sports_analyzer'):
+        metrics = [
+            ('stage_wall_seconds_total', 'counter', 'wall_seconds', "Wall-clock seconds spent in the stage."),
+            ('stage_cpu_seconds_total', 'counter', 'cpu_seconds', "CPU seconds spent in the stage."),
+            ('stage_calls_total', 'counter', 'calls', "Times the stage ran."),
+            ('stage_items_total', 'counter', 'items', "Items processed by the stage."),
+            ('stage_peak_memory_bytes', 'gauge', 'peak_memory_bytes', "Peak traced Python memory during the stage."),
+            ('stage_max_rss_bytes', 'gauge', 'max_rss_bytes', "Process peak resident set size after the stage."),
+        ]
+        lines = []
+        for metric, metric_type, field, help_text in metrics:
+            name = f"{prefix}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for stage, stats in self.stages.items():
+                labels = _format_labels({**self.labels, 'stage': stage})
+                lines.append(f"{name}{{{labels}}} {stats[field]}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, filename, prefix='sports_analyzer'):
+        with open(filename, 'w') as file:
+            file.write(self.prometheus_text(prefix))
+
+    # Function to format the stages as a table for the terminal
+    def summary(self):
+        total = sum(stats['wall_seconds'] for stats in self.stages.values()) or 1.0
+        lines = [f"{'stage':<14}{'calls':>7}{'items':>10}{'wall (s)':>11}{'cpu (s)':>10}{'share':>8}{'peak MB':>10}"]
+        for stage, stats in self.stages.items():
+            lines.append(
+                f"{stage:<14}{stats['calls']:>7}{stats['items']:>10}{stats['wall_seconds']:>11.4f}"
+                f"{stats['cpu_seconds']:>10.4f}{stats['wall_seconds'] / total * 100:>7.1f}%"
+                f"{stats['peak_memory_bytes'] / 1e6:>10.2f}"
+            )
+        return "\n".join(lines)
+
+
+def _format_labels(labels):
+    escaped = []
+    for key, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{key}="{value}"')
+    return ",".join(escaped)
+
+
+# Function to run one call under cProfile, write the raw stats to filename (for snakeviz/pstats)
+# and return (result, text report of the top functions by cumulative time)
+def run_with_cprofile(function, filename, top=25):
+    profile = cProfile.Profile()
+    try:
+        result = profile.runcall(function)
+    finally:
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        profile.dump_stats(filename)
+    report = io.StringIO()
+    pstats.Stats(profile, stream=report).sort_stats('cumulative').print_stats(top)
+    return result, report.getvalue()
@@ -0,0 +1,182 @@
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+
+from utils.schedule_index import date_ordinal
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 20.0
+# Rating points added to the home side before computing the expected result
+HOME_ADVANTAGE = 100.0
+# At a new season (a gap of more than SEASON_GAP days) ratings keep this share of their distance from the mean
+CARRYOVER = 0.75
+SEASON_GAP = 60
+SNAPSHOT_INTERVAL = 7
+
+
+# Function to read whether the home team won from a result entry
+# ({'winner': team name or 'home'/'away'} or {'home_score', 'away_score'})
+def result_home_won(result):
+    winner = result.get('winner')
+    if winner is not None:
+        return winner == 'home' or winner == result['home_team']
+    return result['home_score'] > result['away_score']
+
+
+# Function to turn result entries ({'game_date', 'home_team', 'away_team', winner or scores}) into
+# (day, home, away, home_won, margin) tuples in date order
+def games_from_results(results):
+    games = []
+    for result in results:
+        margin = None
+        if result.get('home_score') is not None and result.get('away_score') is not None:
+            margin = result['home_score'] - result['away_score']
+        games.append((date_ordinal(result['game_date']), result['home_team'], result['away_team'],
+                      result_home_won(result), margin))
+    games.sort(key=lambda game: game[0])
+    return games
+
+
+# Function to turn per-team schedules ({team: [{'date', 'opponent', 'home_or_away', 'result'}]}) into
+# (day, home, away, home_won, None) tuples in date order. Every game is listed by both teams,
+# the home team's entry is used; games without a result yet are skipped.
+def games_from_schedule(team_schedule):
+    games = []
+    for team, schedule in team_schedule.items():
+        for game in schedule or []:
+            if game.get('home_or_away') != 'home' or game.get('result') not in ('W', 'L'):
+                continue
+            games.append((date_ordinal(game['date']), team, game['opponent'], game['result'] == 'W', None))
+    games.sort(key=lambda game: game[0])
+    return games
+
+
+# Function to mix the model's win probability with the rating engine's, same rounding as win_probability
+def blend_probability(model_prob, rating_prob, weight=0.5):
+    return round((1 - weight) * model_prob + weight * rating_prob, 4)
+
+
+# Elo ratings updated one game at a time, in date order.
+# An update touches only the two teams (O(1)); each team also keeps (day, rating) arrays so its
+# rating before any date is one bisect, and every SNAPSHOT_INTERVAL days the whole table is
+# snapshotted for standings as of a date. When a margin is given the update is scaled by the
+# margin-of-victory multiplier (bigger wins move ratings more, less so for heavy favorites).
+class EloRatings:
+    def __init__(self, k=K_FACTOR, home_advantage=HOME_ADVANTAGE, initial=INITIAL_RATING, carryover=CARRYOVER,
+                 season_gap=SEASON_GAP, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.k = k
+        self.home_advantage = home_advantage
+        self.initial = initial
+        self.carryover = carryover
+        self.season_gap = season_gap
+        self.snapshot_interval = snapshot_interval
+        self.ratings = {}
+        self.history = {}
+        self.snapshot_days = array('l')
+        self.snapshots = []
+        self.last_day = None
+        self.games = 0
+        self.seasons = 0
+
+    def __len__(self):
+        return len(self.ratings)
+
+    def _history(self, team):
+        history = self.history.get(team)
+        if history is None:
+            history = self.history[team] = (array('l'), array('d'))
+            self.ratings[team] = self.initial
+        return history
+
+    # Function to pull every rating part of the way back to the mean between seasons.
+    # Recorded the day before the new season's first game, so that day's pre-game ratings include it.
+    def regress(self, day):
+        if not self.ratings:
+            return
+        mean = sum(self.ratings.values()) / len(self.ratings)
+        for team, rating in self.ratings.items():
+            rating = mean + self.carryover * (rating - mean)
+            self.ratings[team] = rating
+            days, ratings = self.history[team]
+            days.append(day - 1)
+            ratings.append(rating)
+        self.seasons += 1
+
+    def _advance(self, day):
+        if self.last_day is not None:
+            if day < self.last_day:
+                raise ValueError("games must arrive in date order")
+            if day - self.last_day > self.season_gap:
+                self.regress(day)
+        # The snapshot holds the ratings at the start of the day
+        if not self.snapshot_days or day >= self.snapshot_days[-1] + self.snapshot_interval:
+            self.snapshot_days.append(day)
+            self.snapshots.append(dict(self.ratings))
+        self.last_day = day
+
+    # Function to get the expected home result (win probability) from two ratings
+    def expected(self, home_rating, away_rating, neutral=False):
+        diff = home_rating - away_rating + (0 if neutral else self.home_advantage)
+        return 1 / (1 + 10 ** (-diff / 400))
+
+    # Function to apply one game result, returns the rating points the home team gained (negative if lost)
+    def update(self, day, home, away, home_won, margin=None, neutral=False):
+        day = date_ordinal(day)
+        if day != self.last_day:
+            self._advance(day)
+        home_days, home_ratings = self._history(home)
+        away_days, away_ratings = self._history(away)
+        home_rating = self.ratings[home]
+        away_rating = self.ratings[away]
+
+        expected = self.expected(home_rating, away_rating, neutral)
+        change = self.k * ((1.0 if home_won else 0.0) - expected)
+        if margin:
+            winner_diff = (home_rating - away_rating + (0 if neutral else self.home_advantage)) * (1 if home_won else -1)
+            change *= math.log(abs(margin) + 1) * 2.2 / (winner_diff * 0.001 + 2.2)
+
+        home_rating += change
+        away_rating -= change
+        self.ratings[home] = home_rating
+        self.ratings[away] = away_rating
+        home_days.append(day)
+        home_ratings.append(home_rating)
+        away_days.append(day)
+        away_ratings.append(away_rating)
+        self.games += 1
+        return change
+
+    # Function to stream (day, home, away, home_won[, margin]) games in date order, returns the count
+    def process(self, games):
+        count = 0
+        update = self.update
+        for game in games:
+            update(*game)
+            count += 1
+        return count
+
+    # Function to get a team's rating before any game on as_of (current rating when as_of is None)
+    def rating(self, team, as_of=None):
+        if as_of is None:
+            return self.ratings.get(team, self.initial)
+        history = self.history.get(team)
+        if history is None:
+            return self.initial
+        days, ratings = history
+        index = bisect_left(days, date_ordinal(as_of))
+        return ratings[index - 1] if index else self.initial
+
+    # Function to get the home team's win probability from the ratings before as_of, rounded like win_probability
+    def win_probability(self, home, away, as_of=None, neutral=False):
+        return round(self.expected(self.rating(home, as_of), self.rating(away, as_of), neutral), 4)
+
+    # Function to get the nearest table snapshot taken on or before as_of ({team: rating})
+    def table(self, as_of=None):
+        if as_of is None:
+            return dict(self.ratings)
+        index = bisect_right(self.snapshot_days, date_ordinal(as_of))
+        return dict(self.snapshots[index - 1]) if index else {}
+
+    # Function to list (team, rating) best first
+    def standings(self, as_of=None):
+        return sorted(self.table(as_of).items(), key=lambda item: item[1], reverse=True)
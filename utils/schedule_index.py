@@ -0,0 +1,102 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+
+
+# Function to turn a schedule date (string, date or ordinal) into an ordinal day number
+def date_ordinal(value):
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        # fromisoformat is much faster than strptime for zero-padded YYYY-MM-DD dates
+        try:
+            return date.fromisoformat(value[:10]).toordinal()
+        except ValueError:
+            return datetime.strptime(value, "%Y-%m-%d").date().toordinal()
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    return value.toordinal()
+
+
+# Per-team schedule lookups built once and queried with bisect for any as-of date.
+# The caller's schedule dicts are only read, never modified.
+class ScheduleIndex:
+    def __init__(self, schedule):
+        # Stable sort on the date keeps same-day games in file order, like schedule.sort()
+        ordered = sorted(
+            ((date_ordinal(game['date']), game.get('home_or_away') == 'away') for game in schedule or []),
+            key=lambda item: item[0]
+        )
+        self.dates = array('l', (ordinal for ordinal, _ in ordered))
+        self.away = array('b', (is_away for _, is_away in ordered))
+
+        # Run-lengths of consecutive away games: for every game, where its streak starts and ends
+        count = len(ordered)
+        self.streak_start = array('l', [0]) * count
+        self.streak_end = array('l', [0]) * count
+        index = 0
+        while index < count:
+            end = index
+            while end + 1 < count and self.away[end + 1] == self.away[index]:
+                end += 1
+            for j in range(index, end + 1):
+                self.streak_start[j] = index
+                self.streak_end[j] = end
+            index = end + 1
+
+    def __len__(self):
+        return len(self.dates)
+
+    # Function to find the index of the first game on or after the as-of date (None if season is over)
+    def next_game_index(self, as_of=None):
+        as_of = date_ordinal(as_of or date.today())
+        index = bisect_left(self.dates, as_of)
+        return index if index < len(self.dates) else None
+
+    # Function to check if the game at index is the second night of a back-to-back
+    def is_back_to_back(self, index):
+        return index > 0 and self.dates[index] - self.dates[index - 1] == 1
+
+    # Function to count games within +/- days of the game at index (including that game)
+    def games_in_window(self, index, days=3):
+        current = self.dates[index]
+        return bisect_right(self.dates, current + days) - bisect_left(self.dates, current - days)
+
+    # Function to get the length of the road trip the game at index is part of (0 for home games)
+    def road_streak(self, index):
+        if not self.away[index]:
+            return 0
+        return self.streak_end[index] - self.streak_start[index] + 1
+
+    # Function to get (back_to_back, 3_games_4_nights, long_road_trip) flags for the next game
+    # on or after the as-of date, or None when there is no game left
+    def fatigue_flags(self, as_of=None):
+        index = self.next_game_index(as_of)
+        if index is None:
+            return None
+        return (
+            self.is_back_to_back(index),
+            self.games_in_window(index, 3) >= 3,
+            self.road_streak(index) >= 3
+        )
+
+    # Function to weight fatigue for the next game on or after the as-of date
+    def fatigue_score(self, fatigue_weights, as_of=None):
+        flags = self.fatigue_flags(as_of)
+        if flags is None:
+            return None
+
+        back_to_back, three_in_four, long_road_trip = flags
+        fatigue = 0
+        if back_to_back:
+            fatigue += fatigue_weights['back_to_back']
+        if three_in_four:
+            fatigue += fatigue_weights['3_games_4_nights']
+        if long_road_trip:
+            fatigue += fatigue_weights['long_road_trip']
+        return fatigue
+
+
+# Function to build one ScheduleIndex per team from the schedule file ({team: [games]})
+def build_schedule_indexes(team_schedule):
+    return {team: ScheduleIndex(schedule) for team, schedule in team_schedule.items()}
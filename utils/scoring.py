@@ -0,0 +1,139 @@
+import numpy as np
+from utils.helpers import parse_record
+
+# (weight key, stat key, min, max) in the same order calculate_team_score uses them
+NBA_FEATURES = [
+    ('ortg', 'Ortg', 100, 130),
+    ('drtg', 'Drtg', 100, 130),
+    ('pace', 'Pace', 95, 105),
+    ('ts%', 'TS%', 0.50, 0.65),
+    ('tov%', 'TOV%', 10, 20),
+    ('rebound%', 'Rebound%', 45, 55),
+]
+
+NBA_DEFAULT_WEIGHTS = {
+    'ortg': 0.225,
+    'drtg': 0.2,
+    'pace': 0.175,
+    'ts%': 0.05,
+    'tov%': 0.175,
+    'rebound%': 0.175
+}
+
+NFL_FEATURES = ['turnover_margin', 'margin_of_victory', 'record_in_one_score_games', 'net_score']
+
+NFL_DEFAULT_WEIGHTS = {
+    'turnover_margin': 0.4,
+    'margin_of_victory': 0.25,
+    'record_in_one_score_games': 0.15,
+    'net_score': 0.2,
+}
+
+
+# Function to normalize every column of a raw stat matrix in one pass
+def normalize_columns(raw, mins, maxs):
+    mins = np.asarray(mins, dtype=float)
+    maxs = np.asarray(maxs, dtype=float)
+    spans = maxs - mins
+    # Mirror helpers.normalize: a zero or negative range scales to 0
+    safe_spans = np.where(spans > 0, spans, 1.0)
+    scaled = (raw - mins) / safe_spans
+    return np.where(spans > 0, scaled, 0.0)
+
+
+# Function to turn a weights dict (or list of dicts) into a weight vector/matrix
+def weight_matrix(weights, feature_keys):
+    if isinstance(weights, dict):
+        return np.array([weights[key] for key in feature_keys], dtype=float)
+    return np.array([[w[key] for key in feature_keys] for w in weights], dtype=float)
+
+
+# Function to score every team for one weight vector (1D) or many weight vectors (2D)
+# Returns shape (teams,) for one vector or (teams, variants) for a matrix
+def score_matrix(features, weights):
+    weights = np.asarray(weights, dtype=float)
+    if weights.ndim == 1:
+        return features @ weights
+    return features @ weights.T
+
+
+# Function to list the NBA teams that can't be scored: {team: [missing stat keys]}
+def nba_missing_stats(team_stats):
+    stat_keys = [feature[1] for feature in NBA_FEATURES]
+    missing = {}
+    for team, data in team_stats.items():
+        stats = data.get('team_stats', {})
+        keys = [key for key in stat_keys if stats.get(key) is None]
+        if keys:
+            missing[team] = keys
+    return missing
+
+
+# Function to load NBA team stats into a (teams x features) normalized matrix
+# Accepts the nba_team_stats.json shape: {team: {'team_stats': {...}, ...}}
+# Teams missing a stat (see nba_missing_stats) are left out of teams, so only their own games go unscored
+def nba_feature_matrix(team_stats):
+    teams = list(team_stats.keys())
+    stat_keys = [feature[1] for feature in NBA_FEATURES]
+    rows = [
+        [stats.get(key) for key in stat_keys]
+        for stats in (team_stats[team].get('team_stats', {}) for team in teams)
+    ]
+    raw = np.array(rows, dtype=float).reshape(len(teams), len(NBA_FEATURES))
+    missing = np.isnan(raw).any(axis=1)
+    if missing.any():
+        teams = [team for team, bad in zip(teams, missing) if not bad]
+        raw = raw[~missing]
+    mins = [feature[2] for feature in NBA_FEATURES]
+    maxs = [feature[3] for feature in NBA_FEATURES]
+    return teams, normalize_columns(raw, mins, maxs)
+
+
+# Function to score all NBA teams at once, same result as calculate_team_score per team
+def nba_team_scores(team_stats, weights=None):
+    weights = weights if weights is not None else NBA_DEFAULT_WEIGHTS
+    teams, features = nba_feature_matrix(team_stats)
+    keys = [feature[0] for feature in NBA_FEATURES]
+    scores = score_matrix(features, weight_matrix(weights, keys))
+    return teams, scores
+
+
+# Function to load NFL team stats into a (teams x features) normalized matrix
+# Accepts the team dict built by list_to_dict(nfl_stats, 'team')
+def nfl_feature_matrix(team_dict):
+    teams = list(team_dict.keys())
+    rows = [
+        (
+            stats.get('turnover_margin', 0),
+            stats.get('margin_of_victory', 0),
+            parse_record(stats.get('record_in_one_score_games', "0-0")),
+            stats.get('offense_rank', 32),
+            stats.get('defense_rank', 32)
+        )
+        for stats in (team_dict[team] for team in teams)
+    ]
+    raw = np.array(rows, dtype=float).reshape(len(teams), 5)
+    offense = raw[:, 3]
+    defense = raw[:, 4]
+
+    features = np.empty((len(teams), 4), dtype=float)
+    features[:, :2] = normalize_columns(raw[:, :2], [-20, -30], [20, 30])
+    features[:, 2] = raw[:, 2]
+    # Same rank scaling as helpers.normalize_team_score with max_value 32
+    offense_score = (32 + 1 - offense) / 32
+    defense_score = (32 + 1 - defense) / 32
+    features[:, 3] = (0.6 * offense_score) + (0.4 * defense_score)
+    return teams, features
+
+
+# Function to score all NFL teams at once, same result as compute_team_score per team
+def nfl_team_scores(team_dict, weights=None):
+    weights = weights if weights is not None else NFL_DEFAULT_WEIGHTS
+    teams, features = nfl_feature_matrix(team_dict)
+    scores = score_matrix(features, weight_matrix(weights, NFL_FEATURES))
+    return teams, np.clip(scores, 0, 1)
+
+
+# Function to turn (teams, scores) into a {team: score} lookup for analyze_game
+def scores_by_team(teams, scores):
+    return dict(zip(teams, scores.tolist()))
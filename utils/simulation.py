@@ -0,0 +1,148 @@
+from statistics import NormalDist
+
+import numpy as np
+
+from utils.helpers import calculate_edge, implied_probability, moneyline_to_decimal
+
+# Spread and total bets are assumed to be priced at standard juice unless told otherwise
+STANDARD_JUICE = -110
+
+# Score spread around the model's expectations: standard deviation of the final margin and total
+SPORT_SPREADS = {
+    'NBA': {'margin_sd': 12.0, 'total_sd': 18.0},
+    'NFL': {'margin_sd': 13.5, 'total_sd': 10.0},
+}
+
+
+# Function to turn a home win probability into the expected home margin it implies
+def expected_margin(home_win_prob, margin_sd):
+    prob = min(max(home_win_prob, 1e-6), 1 - 1e-6)
+    return margin_sd * NormalDist().inv_cdf(prob)
+
+
+# Function to estimate an NBA game total from both teams' pace and ratings
+def nba_expected_total(home_stats, away_stats):
+    possessions = (home_stats['Pace'] + away_stats['Pace']) / 2
+    home_points = possessions * (home_stats['Ortg'] + away_stats['Drtg']) / 200
+    away_points = possessions * (away_stats['Ortg'] + home_stats['Drtg']) / 200
+    return home_points + away_points
+
+
+# Function to build simulator inputs from analyze_game results
+# The expected total comes from team stats when given (NBA), otherwise from the market total (no total edge).
+# win_probs, when given, holds each result's unrounded home win probability (home_chance is rounded).
+# Lines no book quotes are None.
+def games_from_results(results, team_stats=None, win_probs=None):
+    games = []
+    for index, result in enumerate(results):
+        best_lines = result['best_lines']
+        total_line = best_lines.get('over_under', {}).get('value')
+        home_stats = (team_stats or {}).get(result['home_team'], {}).get('team_stats')
+        away_stats = (team_stats or {}).get(result['away_team'], {}).get('team_stats')
+        if home_stats and away_stats:
+            expected_total = nba_expected_total(home_stats, away_stats)
+        else:
+            expected_total = total_line
+        games.append({
+            'home_team': result['home_team'],
+            'away_team': result['away_team'],
+            'home_win_prob': win_probs[index] if win_probs is not None else result['home_chance'] / 100,
+            'expected_total': expected_total,
+            'home_spread': best_lines.get('home_spread', {}).get('value'),
+            'away_spread': best_lines.get('away_spread', {}).get('value'),
+            'over_under': total_line
+        })
+    return games
+
+
+# Function to estimate cover and over probabilities by drawing n_samples score outcomes per game.
+# Samples are drawn batch_size at a time as (batch, games) float32 arrays, so memory stays at
+# batch_size * games floats however many samples are requested. Margins and totals use their
+# own seeded streams, so the estimates are the same for any batch_size.
+# A game missing a line (None) gets NaN for the chances that need it.
+def simulate_games(games, n_samples=1_000_000, batch_size=100_000, seed=0, sport='NBA',
+                   margin_sd=None, total_sd=None):
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    spreads = SPORT_SPREADS.get(sport, SPORT_SPREADS['NBA'])
+    margin_sd = margin_sd or spreads['margin_sd']
+    total_sd = total_sd or spreads['total_sd']
+
+    margin_mean = np.array([expected_margin(game['home_win_prob'], margin_sd) for game in games])
+    total_mean = np.array([game['expected_total'] for game in games], dtype=float)
+    home_spread = np.array([game['home_spread'] for game in games], dtype=float)
+    away_spread = np.array([game['away_spread'] for game in games], dtype=float)
+    over_under = np.array([game['over_under'] for game in games], dtype=float)
+
+    # Compare standard normal draws against per-game cut-offs instead of scaling every draw:
+    # home covers when margin + home line > 0, away covers when margin < away line, over when total > line
+    home_cutoff = ((-home_spread - margin_mean) / margin_sd).astype(np.float32)
+    away_cutoff = ((away_spread - margin_mean) / margin_sd).astype(np.float32)
+    over_cutoff = ((over_under - total_mean) / total_sd).astype(np.float32)
+
+    margin_rng, total_rng = [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(2)]
+    home_covers = np.zeros(len(games), dtype=np.int64)
+    away_covers = np.zeros(len(games), dtype=np.int64)
+    overs = np.zeros(len(games), dtype=np.int64)
+
+    drawn = 0
+    while drawn < n_samples:
+        size = min(batch_size, n_samples - drawn)
+        margins = margin_rng.standard_normal((size, len(games)), dtype=np.float32)
+        home_covers += np.count_nonzero(margins > home_cutoff, axis=0)
+        away_covers += np.count_nonzero(margins < away_cutoff, axis=0)
+
+        totals = total_rng.standard_normal((size, len(games)), dtype=np.float32)
+        overs += np.count_nonzero(totals > over_cutoff, axis=0)
+        drawn += size
+
+    # Comparisons against a NaN cut-off are all False, which would read as a 0% (or 100% under) chance
+    over = np.where(np.isnan(over_cutoff), np.nan, overs / n_samples)
+    return {
+        'home_cover': np.where(np.isnan(home_cutoff), np.nan, home_covers / n_samples),
+        'away_cover': np.where(np.isnan(away_cutoff), np.nan, away_covers / n_samples),
+        'over': over,
+        'under': 1 - over
+    }
+
+
+# Function to round a simulated chance, None when the line was missing
+def _chance(value):
+    value = float(value)
+    return None if np.isnan(value) else round(value, 4)
+
+
+def _edge(chance, market_prob):
+    return calculate_edge(chance, market_prob) if chance is not None else None
+
+
+# Function to simulate a slate of analyze_game results and attach spread/total edges against the best lines
+# Chances and edges are None for lines no book quotes
+def simulate_slate(results, team_stats=None, n_samples=1_000_000, batch_size=100_000, seed=0,
+                   sport='NBA', juice=STANDARD_JUICE, win_probs=None):
+    games = games_from_results(results, team_stats, win_probs)
+    if not games:
+        return []
+    probs = simulate_games(games, n_samples, batch_size, seed, sport)
+    market_prob = implied_probability(moneyline_to_decimal(juice))
+
+    simulated = []
+    for index, game in enumerate(games):
+        home_cover = _chance(probs['home_cover'][index])
+        away_cover = _chance(probs['away_cover'][index])
+        over = _chance(probs['over'][index])
+        under = _chance(probs['under'][index])
+        simulated.append({
+            'home_team': game['home_team'],
+            'away_team': game['away_team'],
+            'expected_total': round(game['expected_total'], 1) if game['expected_total'] is not None else None,
+            'home_cover_chance': home_cover,
+            'away_cover_chance': away_cover,
+            'over_chance': over,
+            'under_chance': under,
+            'home_spread_edge': _edge(home_cover, market_prob),
+            'away_spread_edge': _edge(away_cover, market_prob),
+            'over_edge': _edge(over, market_prob),
+            'under_edge': _edge(under, market_prob)
+        })
+    return simulated
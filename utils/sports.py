@@ -0,0 +1,131 @@
+import importlib
+import os
+
+from utils.profiling import NULL_PROFILER
+from utils.writers import TerminalWriter, write_results
+
+
+# One sport's pipeline, declared by name so nothing is imported until the sport is picked.
+# The plugin module provides the hooks:
+#   load_slate(files, input_cache, shared)            -> slate dict with at least 'odds'
+#   analyze_slate(slate, as_of, profiler, top, min_edge, **options) -> results, best edge first
+# and runs its own merge/penalty stages inside analyze_slate. shared is None or a dict kept across
+# slates (see shared_value), so team-level work is done once per input file.
+# The offline tools (backtest.py, tuning.py) use the season hooks:
+#   team_data(stats)                                  -> {team: stats} from the stats file contents
+#   score_teams(team_data)                            -> {team: score} (batch scoring, NumPy)
+#   feature_matrix(team_data)                         -> (teams, normalized features) for tuning
+#   score_weights()                                   -> default weight per feature, in feature order
+# inputs is a list of (name, default filename, prompt): a missing file falls back to the default,
+# then to the prompt. options names the extra keyword options analyze_slate accepts (e.g. 'lineup').
+# penalties: games use the schedule/injury penalties (nba_analyzer.calculate_penalties) and the away
+# probability is 1 - home; clip_scores: team scores are clipped to [0, 1].
+class SportPlugin:
+    def __init__(self, name, module, inputs, options=(), penalties=False, clip_scores=False):
+        self.name = name
+        self.module_name = module
+        self.inputs = inputs
+        self.options = options
+        self.penalties = penalties
+        self.clip_scores = clip_scores
+        self._module = None
+
+    @property
+    def module(self):
+        if self._module is None:
+            self._module = importlib.import_module(self.module_name)
+        return self._module
+
+    # Function to fill in every input filename from files, the defaults or a prompt
+    def resolve_inputs(self, files=None):
+        files = dict(files or {})
+        for name, default, prompt in self.inputs:
+            if not files.get(name):
+                files[name] = default or input(prompt)
+        return files
+
+    def load(self, files, input_cache=None, shared=None):
+        return self.module.load_slate(files, input_cache, shared)
+
+    def team_data(self, stats):
+        return self.module.team_data(stats)
+
+    def score_teams(self, team_data):
+        return self.module.score_teams(team_data)
+
+    def feature_matrix(self, team_data):
+        return self.module.feature_matrix(team_data)
+
+    def score_weights(self):
+        return self.module.score_weights()
+
+    def analyze(self, slate, as_of=None, profiler=NULL_PROFILER, top=None, min_edge=None, **options):
+        unknown = set(options) - set(self.options)
+        if unknown:
+            raise ValueError(f"{self.name} does not support: {', '.join(sorted(unknown))}")
+        return self.module.analyze_slate(slate, as_of, profiler, top, min_edge, **options)
+
+    # Function to run load -> analyze -> output for one slate, returns the results
+    # writers (utils.writers) default to the terminal view; shared is passed to load (see shared_value)
+    def run(self, files=None, as_of=None, input_cache=None, profiler=NULL_PROFILER, writers=None, top=None,
+            min_edge=None, shared=None, **options):
+        files = self.resolve_inputs(files)
+
+        with profiler.stage('load') as stage:
+            slate = self.load(files, input_cache, shared)
+            stage.add(len(slate['odds']))
+
+        results = self.analyze(slate, as_of, profiler, top, min_edge, **options)
+
+        with profiler.stage('output') as stage:
+            stage.add(write_results(results, writers if writers is not None else [TerminalWriter()]))
+        return results
+
+
+# Function to compute team-level data derived from an input file once per (kind, path, mtime) in shared.
+# With shared None it is computed every time. A missing file raises FileNotFoundError.
+def shared_value(shared, kind, path, compute):
+    if shared is None:
+        return compute()
+    key = (kind, path, os.path.getmtime(path))
+    if key not in shared:
+        shared[key] = compute()
+    return shared[key]
+
+
+SPORTS = {}
+
+
+def register_sport(plugin):
+    SPORTS[plugin.name.upper()] = plugin
+    return plugin
+
+
+# Function to look up a registered sport by name (case-insensitive), None when unsupported
+def get_sport(name):
+    return SPORTS.get(name.strip().upper())
+
+
+def sport_names():
+    return list(SPORTS)
+
+
+register_sport(SportPlugin(
+    'NFL', 'nfl_analyzer',
+    inputs=[
+        ('odds', 'nfl_odds.json', None),
+        ('stats', 'nfl_stats.json', None)
+    ],
+    clip_scores=True
+))
+
+register_sport(SportPlugin(
+    'NBA', 'nba_analyzer',
+    inputs=[
+        ('stats', None, "Enter Team Stats Filename(JSON format): "),
+        ('schedule', None, "Enter team schedule FIlename(Json Format): "),
+        ('odds', None, "Enter matchup odds Filename(Json Format): ")
+    ],
+    options=('lineup', 'simulate'),
+    penalties=True
+))
@@ -0,0 +1,108 @@
+import json
+import re
+
+CHUNK_SIZE = 1 << 16
+# Largest array element (in characters) iter_json_array will buffer before giving up on the file
+MAX_ELEMENT_SIZE = 64 << 20
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+NUMBER_START = set('-0123456789')
+
+
+# Function to yield one record per line from a JSON Lines file (blank lines skipped)
+def iter_json_lines(filename):
+    with open(filename, 'r') as file:
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as error:
+                raise ValueError(f"{filename}:{line_number}: bad JSON line ({error.msg})") from None
+
+
+# Function to yield the elements of a top-level JSON array without loading the whole file
+# Reads fixed-size chunks and decodes one element at a time, so memory stays bounded by the largest element.
+# An element still undecoded after max_element_size characters (too big, or malformed like an
+# unterminated string) raises ValueError instead of buffering the rest of the file.
+def iter_json_array(filename, chunk_size=CHUNK_SIZE, max_element_size=MAX_ELEMENT_SIZE):
+    decoder = json.JSONDecoder()
+    with open(filename, 'r') as file:
+        buffer = file.read(chunk_size)
+        pos = WHITESPACE.match(buffer).end()
+        # Leading whitespace can fill whole chunks
+        while pos == len(buffer):
+            buffer = file.read(chunk_size)
+            if not buffer:
+                break
+            pos = WHITESPACE.match(buffer).end()
+        if buffer[pos:pos + 1] != '[':
+            raise ValueError(f"{filename}: expected a JSON array")
+        pos += 1
+        eof = False
+        need_more = False
+
+        while True:
+            if need_more:
+                if len(buffer) - pos > max_element_size:
+                    raise ValueError(f"{filename}: array element over {max_element_size} characters")
+                # Keep only the unread tail and pull in the next chunk
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                need_more = False
+
+            pos = WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                if eof:
+                    raise ValueError(f"{filename}: truncated JSON array")
+                need_more = True
+                continue
+
+            char = buffer[pos]
+            if char == ']':
+                return
+            if char == ',':
+                pos += 1
+                continue
+
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError(f"{filename}: invalid JSON array element") from None
+                # Element spans the chunk boundary
+                need_more = True
+                continue
+            # A number cut by the chunk boundary decodes as its prefix ('1' of '1e5', '-0' of '-0.5'),
+            # so it only counts once a delimiter follows it
+            if not eof and char in NUMBER_START and (end == len(buffer) or buffer[end] not in ' \t\n\r,]'):
+                need_more = True
+                continue
+            yield item
+            pos = end
+
+
+# Function to pick the right reader: '[' at the start means a JSON array, anything else is JSON Lines
+def iter_records(filename):
+    with open(filename, 'r') as file:
+        first = ''
+        while True:
+            char = file.read(1)
+            if not char or not char.isspace():
+                first = char
+                break
+    if first == '[':
+        return iter_json_array(filename)
+    return iter_json_lines(filename)
+
+
+# Function to write records to a JSON Lines file as they are produced, returns the number written
+def write_json_lines(records, filename):
+    count = 0
+    with open(filename, 'w') as file:
+        for record in records:
+            file.write(json.dumps(record))
+            file.write('\n')
+            count += 1
+    return count
@@ -0,0 +1,213 @@
+import csv
+import heapq
+import html
+import json
+import sys
+
+LINE_TYPES = ['home_moneyline', 'away_moneyline', 'home_spread', 'away_spread', 'over_under']
+CSV_FIELDS = ['home_team', 'away_team', 'home_chance', 'away_chance', 'home_edge', 'away_edge',
+              'home_market_chance', 'away_market_chance'] + [
+    f"{line_type}_{part}" for line_type in LINE_TYPES for part in ('value', 'book')]
+
+# Writers hand the file this many results at a time
+CHUNK_SIZE = 512
+
+
+def best_edge(result):
+    return max(result['home_edge'], result['away_edge'])
+
+
+# Function to pick the results to report, best edge first.
+# min_edge drops results whose best edge is below it; top keeps the K best using a bounded heap
+# (heapq.nlargest), so a 100k-matchup run never fully sorts just to show a handful. Ties keep
+# their input order, same as sorted(..., reverse=True).
+def select_results(results, top=None, min_edge=None):
+    if min_edge is not None:
+        results = (result for result in results if best_edge(result) >= min_edge)
+    if top is not None:
+        return heapq.nlargest(top, results, key=best_edge)
+    return sorted(results, key=best_edge, reverse=True)
+
+
+class ResultWriter:
+    def __init__(self, target=None):
+        # target is a filename or an open text file (the writer only closes files it opened)
+        if target is None or hasattr(target, 'write'):
+            self.file = target if target is not None else sys.stdout
+            self.owns_file = False
+        else:
+            self.file = open(target, 'w', newline='', buffering=1 << 20)
+            self.owns_file = True
+        self.count = 0
+        self.started = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def write_all(self, results):
+        if not self.started:
+            self.start()
+            self.started = True
+        chunk = []
+        for result in results:
+            chunk.append(result)
+            if len(chunk) == CHUNK_SIZE:
+                self.write_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.write_chunk(chunk)
+
+    def write_chunk(self, results):
+        self.file.write(''.join(self.format(result) for result in results))
+        self.count += len(results)
+
+    def start(self):
+        pass
+
+    def finish(self):
+        pass
+
+    def format(self, result):
+        raise NotImplementedError
+
+    def close(self):
+        if not self.started:
+            self.start()
+            self.started = True
+        self.finish()
+        if self.owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+
+# Same text as the original per-matchup print loop, built as one string per matchup
+class TerminalWriter(ResultWriter):
+    def format(self, result):
+        lines = result['best_lines']
+        return (
+            f"{result['away_team']} @ {result['home_team']}:\n"
+            f"    Market assigned {result['home_team']} win probability: {result['home_market_chance']*100:.1f}%\n"
+            f"    Market assigned {result['away_team']} win probability: {result['away_market_chance']*100:.1f}%\n"
+            f"    Model est. {result['home_team']} win probability: {result['home_chance']}%\n"
+            f"    Model est. {result['away_team']} win probability: {result['away_chance']}%\n"
+            f"    {result['home_team']} edge: {result['home_edge']*100:.1f}%\n"
+            f"    {result['away_team']} edge: {result['away_edge']*100:.1f}%\n"
+            f"    Best Lines:\n"
+            f"        Home ML: {lines['home_moneyline']['value']} ({lines['home_moneyline']['book']})\n"
+            f"        Away ML: {lines['away_moneyline']['value']} ({lines['away_moneyline']['book']})\n"
+            f"        Home Spread: {lines['home_spread']['value']} ({lines['home_spread']['book']})\n"
+            f"        Away Spread: {lines['away_spread']['value']} ({lines['away_spread']['book']})\n"
+            f"        Over/Under: {lines['over_under']['value']} ({lines['over_under']['book']})\n"
+            f"-------------------------------------------------\n"
+        )
+
+
+class JSONLinesWriter(ResultWriter):
+    def format(self, result):
+        return json.dumps(result) + '\n'
+
+
+# One JSON array, same text as json.dump(results, file, indent=4)
+class JSONWriter(ResultWriter):
+    def format(self, result):
+        separator = ',\n    ' if self.count else '[\n    '
+        # Strings are escaped in JSON, so every newline is an indentation break
+        return separator + json.dumps(result, indent=4).replace('\n', '\n    ')
+
+    def write_chunk(self, results):
+        for result in results:
+            self.file.write(self.format(result))
+            self.count += 1
+
+    def finish(self):
+        self.file.write('\n]' if self.count else '[]')
+
+
+# One row per matchup, best lines flattened into <line_type>_value / <line_type>_book columns
+class CSVWriter(ResultWriter):
+    def start(self):
+        self.csv = csv.writer(self.file)
+        self.csv.writerow(CSV_FIELDS)
+
+    def write_chunk(self, results):
+        self.csv.writerows(self.row(result) for result in results)
+        self.count += len(results)
+
+    def row(self, result):
+        row = [result[field] for field in CSV_FIELDS[:8]]
+        for line_type in LINE_TYPES:
+            line = result['best_lines'][line_type]
+            row.append(line['value'])
+            row.append(line['book'])
+        return row
+
+
+# Self-contained HTML page with one table row per matchup
+class HTMLWriter(ResultWriter):
+    def __init__(self, target=None, title="Sports Outcome Analyzer"):
+        super().__init__(target)
+        self.title = title
+
+    def start(self):
+        headers = ['Matchup', 'Home model', 'Away model', 'Home market', 'Away market', 'Home edge', 'Away edge',
+                   'Home ML', 'Away ML', 'Home spread', 'Away spread', 'Over/Under']
+        self.file.write(
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{html.escape(self.title)}</title>\n"
+            "<style>body{font-family:sans-serif}table{border-collapse:collapse}"
+            "th,td{border:1px solid #ccc;padding:4px 8px;text-align:right}td:first-child{text-align:left}"
+            ".pos{color:#070}.neg{color:#a00}</style>\n</head>\n<body>\n"
+            f"<h1>{html.escape(self.title)}</h1>\n<table>\n<tr>"
+            + ''.join(f"<th>{header}</th>" for header in headers) + "</tr>\n"
+        )
+
+    def format(self, result):
+        cells = [
+            f"<td>{html.escape(str(result['away_team']))} @ {html.escape(str(result['home_team']))}</td>",
+            f"<td>{result['home_chance']}%</td>",
+            f"<td>{result['away_chance']}%</td>",
+            f"<td>{result['home_market_chance']*100:.1f}%</td>",
+            f"<td>{result['away_market_chance']*100:.1f}%</td>",
+            self.edge_cell(result['home_edge']),
+            self.edge_cell(result['away_edge']),
+        ]
+        for line_type in LINE_TYPES:
+            line = result['best_lines'][line_type]
+            cells.append(f"<td>{line['value']} ({html.escape(str(line['book']))})</td>")
+        return "<tr>" + ''.join(cells) + "</tr>\n"
+
+    def edge_cell(self, edge):
+        return f"<td class=\"{'pos' if edge > 0 else 'neg'}\">{edge*100:.1f}%</td>"
+
+    def finish(self):
+        self.file.write(f"</table>\n<p>{self.count} matchups</p>\n</body>\n</html>\n")
+
+
+WRITERS = {
+    'terminal': TerminalWriter,
+    'json': JSONWriter,
+    'jsonl': JSONLinesWriter,
+    'csv': CSVWriter,
+    'html': HTMLWriter,
+}
+
+
+# Function to open a writer by format name ('terminal', 'json', 'jsonl', 'csv', 'html')
+def open_writer(fmt, target=None):
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown output format {fmt!r}, expected one of {', '.join(WRITERS)}")
+    return WRITERS[fmt](target)
+
+
+# Function to write the same results to every writer and close them, returns the number written
+def write_results(results, writers):
+    results = results if isinstance(results, list) else list(results)
+    for writer in writers:
+        with writer:
+            writer.write_all(results)
+    return len(results)
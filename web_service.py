@@ -0,0 +1,430 @@
+import argparse
+import asyncio
+import gzip
+import io
+import json
+import os
+import time
+from urllib.parse import unquote, urlsplit
+
+from utils.sports import get_sport
+from utils.writers import HTMLWriter
+
+# asyncio HTTP service for the latest results of each (sport, slate), standard library only.
+#   GET /slates                               -> every slate with its version and matchup count
+#   GET /results/<sport>/<slate>              -> results as JSON, best edge first
+#   GET /results/<sport>/<slate>/<matchup_id> -> one matchup ("<home>_vs_<away>")
+#   GET /report/<sport>/<slate>               -> the same results as an HTML table (utils.writers)
+#   GET /events/<sport>/<slate>               -> Server-Sent Events: a snapshot, then changed matchups
+#   GET /health                               -> service counters
+# Results are published once (from a watched manifest or by calling publish) and every
+# response body is rendered once per slate version, so readers never trigger a re-run.
+# JSON responses carry an ETag and answer If-None-Match with 304, and are gzipped (also once per
+# version) for clients that accept it.
+
+# Events queued for one SSE client before it is treated as too slow and sent a fresh snapshot instead
+SSE_QUEUE_SIZE = 256
+HEARTBEAT_SECONDS = 15.0
+MAX_HEADER_BYTES = 64 * 1024
+# Request bodies are read and thrown away; bigger ones are refused with 413 instead of read
+MAX_BODY_BYTES = 64 * 1024
+# Smaller bodies are sent as they are
+GZIP_MIN_BYTES = 1024
+
+_RESYNC = object()
+
+STATUS_TEXT = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Payload Too Large'}
+
+
+def matchup_id(result):
+    return f"{result['home_team']}_vs_{result['away_team']}"
+
+
+def _json_bytes(data):
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+# Function to frame one Server-Sent Event; data is always a single line of JSON
+def sse_event(event, data, event_id=None):
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: ".encode() + _json_bytes(data) + b"\n\n"
+
+
+class _Payload:
+    __slots__ = ('body', 'etag', 'content_type', '_gzipped')
+
+    def __init__(self, body, etag, content_type):
+        self.body = body
+        self.etag = etag
+        self.content_type = content_type
+        self._gzipped = None
+
+    @property
+    def gzipped(self):
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, 5)
+        return self._gzipped
+
+
+class _Subscriber:
+    __slots__ = ('queue',)
+
+    def __init__(self, queue_size):
+        self.queue = asyncio.Queue(queue_size)
+
+    # Function to queue an event, or replace the backlog with a resync marker when the client can't keep up
+    def send(self, event):
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_RESYNC)
+            return False
+
+
+# The latest results of one slate. version goes up on every publish that changes something;
+# each matchup remembers the version it last changed in, so its own ETag survives unrelated updates.
+class SlateResults:
+    def __init__(self, sport, name, epoch):
+        self.sport = sport
+        self.name = name
+        self.epoch = epoch
+        self.results = {}
+        self.matchup_versions = {}
+        self.version = 0
+        self.updated = None
+        self.subscribers = set()
+        self._payloads = {}
+
+    # Function to replace the results, returns (changed results, removed matchup ids)
+    def update(self, results):
+        new = {matchup_id(result): result for result in results}
+        changed = [result for key, result in new.items() if self.results.get(key) != result]
+        removed = [key for key in self.results if key not in new]
+        if not changed and not removed and list(new) == list(self.results):
+            return [], []
+        self.version += 1
+        self.updated = time.time()
+        for result in changed:
+            self.matchup_versions[matchup_id(result)] = self.version
+        for key in removed:
+            self.matchup_versions.pop(key, None)
+        self.results = new
+        self._payloads.clear()
+        return changed, removed
+
+    def etag(self, version=None):
+        return f'"{self.epoch}-{self.version if version is None else version}"'
+
+    # Function to render a response body once per version and reuse it for every reader
+    def payload(self, key, render, content_type='application/json', version=None):
+        payload = self._payloads.get(key)
+        if payload is None:
+            payload = self._payloads[key] = _Payload(render(), self.etag(version), content_type)
+        return payload
+
+    def summary(self):
+        return {'sport': self.sport, 'slate': self.name, 'version': self.version,
+                'matchups': len(self.results), 'updated': self.updated, 'subscribers': len(self.subscribers)}
+
+    def snapshot_event(self):
+        return sse_event('snapshot', list(self.results.values()), self.version)
+
+
+class ResultService:
+    def __init__(self, host='127.0.0.1', port=8080, heartbeat=HEARTBEAT_SECONDS, queue_size=SSE_QUEUE_SIZE,
+                 max_body_bytes=MAX_BODY_BYTES):
+        self.host = host
+        self.port = port
+        self.heartbeat = heartbeat
+        self.queue_size = queue_size
+        self.max_body_bytes = max_body_bytes
+        # Part of every ETag, so a restarted service never matches a version from a previous run
+        self.epoch = format(int(time.time() * 1000), 'x')
+        self.slates = {}
+        self.server = None
+        self.loop = None
+        self.metrics = dict.fromkeys(
+            ('connections', 'requests', 'not_modified', 'publishes', 'events_sent', 'resyncs'), 0)
+
+    def slate(self, sport, name, create=False):
+        key = (sport.upper(), name)
+        if create and key not in self.slates:
+            self.slates[key] = SlateResults(key[0], name, self.epoch)
+        return self.slates.get(key)
+
+    # Function to store a slate's latest results and push the changed matchups to its SSE clients.
+    # Runs on the event loop thread; use publish_threadsafe from other threads.
+    def publish(self, sport, name, results):
+        slate = self.slate(sport, name, create=True)
+        version = slate.version
+        changed, removed = slate.update(results)
+        if slate.version == version:
+            return changed, removed
+        self.metrics['publishes'] += 1
+        if slate.subscribers and (changed or removed):
+            # Encoded once, the same bytes go to every client
+            event = b''.join(
+                [sse_event('matchup', result, slate.version) for result in changed] +
+                [sse_event('removed', {'matchup_id': key}, slate.version) for key in removed])
+            for subscriber in slate.subscribers:
+                if not subscriber.send(event):
+                    self.metrics['resyncs'] += 1
+        return changed, removed
+
+    def publish_threadsafe(self, sport, name, results):
+        return asyncio.run_coroutine_threadsafe(self._publish(sport, name, results), self.loop)
+
+    async def _publish(self, sport, name, results):
+        return self.publish(sport, name, results)
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_HEADER_BYTES,
+                                                 backlog=4096)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.metrics['connections'] += 1
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request = _parse_request(head)
+                if request is None:
+                    writer.write(_response(400, b'', 'text/plain', keep_alive=False))
+                    break
+                method, path, version, headers = request
+                # Request bodies are not used, but must be read off a keep-alive connection
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    writer.write(_response(400, b'', 'text/plain', keep_alive=False))
+                    break
+                if length > self.max_body_bytes:
+                    writer.write(_response(413, b'', 'text/plain', keep_alive=False))
+                    break
+                if length:
+                    await reader.readexactly(length)
+                self.metrics['requests'] += 1
+                keep_alive = (headers.get('connection', '').lower() != 'close' if version == 'HTTP/1.1'
+                              else headers.get('connection', '').lower() == 'keep-alive')
+
+                parts = [unquote(part) for part in urlsplit(path).path.strip('/').split('/') if part]
+                if method == 'GET' and len(parts) == 3 and parts[0] == 'events':
+                    # Only slates that were published (or registered from the manifest) can be followed,
+                    # so arbitrary paths never add slates
+                    slate = self.slate(parts[1], parts[2])
+                    if slate is not None:
+                        await self._stream(writer, slate, headers.get('last-event-id'))
+                        break
+
+                writer.write(self._route(method, parts, headers, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _route(self, method, parts, headers, keep_alive):
+        if method not in ('GET', 'HEAD'):
+            return _response(405, b'', 'text/plain', keep_alive=keep_alive, extra={'Allow': 'GET, HEAD'})
+
+        payload = None
+        if parts == ['health']:
+            payload = _Payload(_json_bytes({'status': 'ok', 'slates': len(self.slates), **self.metrics}), None,
+                               'application/json')
+        elif parts == ['slates'] or not parts:
+            payload = _Payload(_json_bytes([slate.summary() for slate in self.slates.values()]), None,
+                               'application/json')
+        elif len(parts) in (3, 4) and parts[0] in ('results', 'report'):
+            slate = self.slate(parts[1], parts[2])
+            if slate is not None:
+                payload = self._slate_payload(slate, parts[0], parts[3] if len(parts) == 4 else None)
+
+        if payload is None:
+            return _response(404, _json_bytes({'error': 'not found'}), 'application/json', keep_alive=keep_alive)
+        if_none_match = _etags(headers.get('if-none-match'))
+        if payload.etag is not None and (payload.etag in if_none_match or '*' in if_none_match):
+            self.metrics['not_modified'] += 1
+            return _response(304, b'', None, etag=payload.etag, keep_alive=keep_alive)
+        body, extra = payload.body, None
+        if len(body) >= GZIP_MIN_BYTES and 'gzip' in headers.get('accept-encoding', ''):
+            # Same ETag, marked weak since the bytes differ from the identity body
+            body, extra = payload.gzipped, {'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding'}
+        etag = payload.etag if extra is None or payload.etag is None else 'W/' + payload.etag
+        return _response(200, body if method == 'GET' else b'', payload.content_type, etag=etag,
+                         keep_alive=keep_alive, length=len(body), extra=extra)
+
+    def _slate_payload(self, slate, kind, key):
+        if kind == 'report':
+            if key is not None:
+                return None
+            return slate.payload('report', lambda: _html_report(slate), 'text/html; charset=utf-8')
+        if key is None:
+            return slate.payload('results', lambda: _json_bytes(list(slate.results.values())))
+        if key not in slate.results:
+            return None
+        return slate.payload(('matchup', key), lambda: _json_bytes(slate.results[key]),
+                             version=slate.matchup_versions[key])
+
+    # Function to hold an SSE connection open: a snapshot (skipped when Last-Event-ID is already current),
+    # then queued matchup events, with comment heartbeats so proxies keep the connection alive
+    async def _stream(self, writer, slate, last_event_id):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+            b"Connection: keep-alive\r\nAccess-Control-Allow-Origin: *\r\n\r\n")
+        subscriber = _Subscriber(self.queue_size)
+        slate.subscribers.add(subscriber)
+        try:
+            if last_event_id != str(slate.version):
+                writer.write(slate.snapshot_event())
+            await writer.drain()
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    writer.write(b": heartbeat\n\n")
+                    await writer.drain()
+                    continue
+                if event is _RESYNC:
+                    event = slate.snapshot_event()
+                writer.write(event)
+                await writer.drain()
+                self.metrics['events_sent'] += 1
+        except ConnectionError:
+            pass
+        finally:
+            slate.subscribers.discard(subscriber)
+
+
+def _parse_request(head):
+    try:
+        lines = head.decode('latin-1').split('\r\n')
+        method, path, version = lines[0].split(' ')
+    except ValueError:
+        return None
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(':')
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return method, path, version, headers
+
+
+def _etags(header):
+    if not header:
+        return ()
+    return [tag.strip().removeprefix('W/') for tag in header.split(',')]
+
+
+def _response(status, body, content_type, etag=None, keep_alive=True, length=None, extra=None):
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}"]
+    if content_type:
+        lines.append(f"Content-Type: {content_type}")
+    lines.append(f"Content-Length: {len(body) if length is None else length}")
+    if etag:
+        lines.append(f"ETag: {etag}")
+        lines.append("Cache-Control: no-cache")
+    lines.append("Access-Control-Allow-Origin: *")
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    for name, value in (extra or {}).items():
+        lines.append(f"{name}: {value}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+
+def _html_report(slate):
+    buffer = io.StringIO()
+    with HTMLWriter(buffer, title=f"{slate.sport} {slate.name}") as writer:
+        writer.write_all(slate.results.values())
+    return buffer.getvalue().encode()
+
+
+# Function to run one slate's analysis from its files (no output), used off the event loop
+def analyze_files(sport, files, as_of=None, **options):
+    plugin = get_sport(sport)
+    return plugin.analyze(plugin.load(files), as_of, **options)
+
+
+# Function to get a manifest slate's name, the odds file name when not given
+def slate_name(slate):
+    return slate.get('name') or os.path.splitext(os.path.basename(slate['odds']))[0]
+
+
+# Function to keep every manifest slate published: re-analyzed in a worker thread when one of its
+# files changes (size/mtime), so the analysis runs once per input change no matter how many readers
+async def watch_manifest(service, slates, interval=2.0):
+    loop = asyncio.get_running_loop()
+    seen = {}
+    while True:
+        for slate in slates:
+            name = slate_name(slate)
+            files = {key: slate[key] for key, _, _ in get_sport(slate['sport']).inputs if slate.get(key)}
+            try:
+                stamp = tuple((os.path.getmtime(path), os.path.getsize(path)) for path in files.values())
+            except OSError as error:
+                print(f"{slate['sport']} {name}: {error}")
+                continue
+            if seen.get((slate['sport'], name)) == stamp:
+                continue
+            try:
+                from batch_runner import SLATE_OPTIONS
+                options = {option: True for option in SLATE_OPTIONS if slate.get(option)}
+                results = await loop.run_in_executor(
+                    None, lambda: analyze_files(slate['sport'], files, slate.get('as_of'), **options))
+            except Exception as error:
+                # Keep serving the previous results, try again on the next change
+                print(f"{slate['sport']} {name}: analysis failed: {type(error).__name__}: {error}")
+                continue
+            seen[(slate['sport'], name)] = stamp
+            changed, removed = service.publish(slate['sport'], name, results)
+            print(f"{slate['sport']} {name}: {len(results)} matchups, {len(changed)} changed, {len(removed)} removed")
+        await asyncio.sleep(interval)
+
+
+async def serve(manifest_file, host='127.0.0.1', port=8080, interval=2.0, max_body_bytes=MAX_BODY_BYTES):
+    from batch_runner import load_manifest
+    slates = load_manifest(manifest_file)
+    for slate in slates:
+        if get_sport(slate['sport']) is None:
+            raise ValueError(f"{slate['sport']} not yet supported.")
+    service = await ResultService(host, port, max_body_bytes=max_body_bytes).start()
+    # Registered up front, so SSE clients can subscribe before the first analysis finishes
+    for slate in slates:
+        service.slate(slate['sport'], slate_name(slate), create=True)
+    print(f"Serving {len(slates)} slates on http://{host}:{service.port}/slates")
+    async with service.server:
+        await asyncio.gather(service.server.serve_forever(), watch_manifest(service, slates, interval))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the latest analysis results over HTTP with SSE updates.")
+    parser.add_argument('manifest', help="JSON list of slates, same format as main.py --batch (optional \"name\")")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--interval', type=float, default=2.0, help="Seconds between input file checks")
+    parser.add_argument('--max-body-bytes', type=int, default=MAX_BODY_BYTES,
+                        help="Larger request bodies are refused with 413")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.manifest, args.host, args.port, args.interval, args.max_body_bytes))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()